@@ -0,0 +1,46 @@
+# Varredura de parâmetros do treino do neurônio: N conjuntos de (lr, output_desire,
+# input_weight) executados um a um pelo Interpreter e de uma vez pelo batch_3000,
+# conferindo que as saídas são idênticas.
+#
+#   python -m benchmarks.batch --runs 100 1000 5000
+import argparse
+import random
+import time
+
+from minipar.batch_3000 import run_batch, run_individually
+from minipar.pipeline_3000 import Pipeline
+
+PROGRAMS = {
+    "neuron": "exemplos/ex_neuron1_corrigido.minipar",
+    "neuron_sem_print": "benchmarks/workloads/neuron.minipar",
+}
+
+def sweep(runs, seed):
+    rng = random.Random(seed)
+    return [{"lr": rng.choice([0.01, 0.02, 0.05]), "output_desire": rng.choice([0, 1]),
+             "input_weight": rng.uniform(-1.0, 1.0)} for _ in range(runs)]
+
+def main():
+    parser = argparse.ArgumentParser(prog="benchmarks.batch")
+    parser.add_argument("--runs", nargs="*", type=int, default=[100, 1000, 5000])
+    parser.add_argument("--program", choices=list(PROGRAMS), default="neuron")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    with open(PROGRAMS[args.program], encoding="utf-8") as f:
+        compiled = Pipeline().run(f.read(), stop_after="semantic")
+    print(f"{'execuções':>10}{'individual (s)':>16}{'lote (s)':>10}{'ganho':>9}  modo")
+    for runs in args.runs:
+        inputs = sweep(runs, args.seed)
+        start = time.perf_counter()
+        individual = run_individually(compiled.ast, inputs)
+        individual_time = time.perf_counter() - start
+        start = time.perf_counter()
+        batched = run_batch(compiled.ast, inputs)
+        batch_time = time.perf_counter() - start
+        if batched.outputs != individual.outputs:
+            raise SystemExit(f"saídas diferentes com {runs} execuções")
+        mode = batched.mode + (f" ({batched.reason})" if batched.reason else "")
+        print(f"{runs:>10}{individual_time:>16.3f}{batch_time:>10.3f}{individual_time / batch_time:>8.1f}x  {mode}")
+
+if __name__ == "__main__":
+    main()
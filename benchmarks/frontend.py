@@ -0,0 +1,101 @@
+# Vazão do front-end (Lexer.tokenize, Parser.parse_program, SemanticAnalyzer.analyze)
+# em programas sintéticos de tamanho crescente. Para cada tamanho: tempo, tokens/s,
+# nós/s e pico de memória de cada fase, e o expoente de crescimento do tempo em relação
+# ao tamanho anterior (1.0 = linear; acima de ~1.2 indica comportamento superlinear).
+#
+#   python -m benchmarks.frontend
+#   python -m benchmarks.frontend --shape comments --sizes 1K 10K 100K 1M 10M 100M
+import argparse
+import gc
+import json
+import math
+import sys
+import time
+import tracemalloc
+
+from benchmarks.generator import SHAPES, generate_program, parse_size
+from minipar.arena_3000 import object_tree_bytes
+from minipar.lexer_251018_215612 import Lexer
+from minipar.parser_251018_215706 import Parser
+from minipar.semantic_3000 import SemanticAnalyzer
+
+PHASES = ("lexer", "parser", "semantic")
+DEFAULT_SIZES = ("1K", "10K", "100K", "1M", "10M")
+
+def run_phases(code, trace_memory=False):
+    # (tempos, picos de memória, tokens, nós); com trace_memory o tempo fica distorcido
+    # pelo tracemalloc, então tempo e memória vêm de execuções separadas
+    timings, peaks = {}, {}
+    state = {}
+    steps = (
+        ("lexer", lambda: state.update(tokens=Lexer(code).tokenize())),
+        ("parser", lambda: state.update(ast=Parser(state["tokens"]).parse_program())),
+        ("semantic", lambda: SemanticAnalyzer().analyze(state["ast"])),
+    )
+    for phase, step in steps:
+        gc.collect()
+        if trace_memory:
+            tracemalloc.start()
+        start = time.perf_counter()
+        try:
+            step()
+        finally:
+            timings[phase] = time.perf_counter() - start
+            if trace_memory:
+                peaks[phase] = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+    return timings, peaks, len(state["tokens"]), object_tree_bytes(state["ast"])[0]
+
+def measure(size, shape, seed, repeat):
+    code = generate_program(size, seed=seed, shape=shape)
+    runs = [run_phases(code) for _ in range(repeat)]
+    _, peaks, tokens, nodes = run_phases(code, trace_memory=True)
+    best = {phase: min(run[0][phase] for run in runs) for phase in PHASES}
+    return {
+        "bytes": len(code.encode("utf-8")),
+        "tokens": tokens,
+        "nodes": nodes,
+        "seconds": best,
+        "peak_bytes": peaks,
+        "tokens_per_sec": tokens / best["lexer"],
+        "nodes_per_sec": {phase: nodes / best[phase] for phase in ("parser", "semantic")},
+    }
+
+def growth(previous, current, phase):
+    size_ratio = current["bytes"] / previous["bytes"]
+    time_ratio = current["seconds"][phase] / previous["seconds"][phase]
+    if size_ratio <= 1 or time_ratio <= 0:
+        return None
+    return math.log(time_ratio) / math.log(size_ratio)
+
+def main():
+    parser = argparse.ArgumentParser(prog="benchmarks.frontend", description="Vazão do front-end em programas sintéticos.")
+    parser.add_argument("--sizes", nargs="*", default=list(DEFAULT_SIZES), help="tamanhos (ex.: 1K 1M 100M)")
+    parser.add_argument("--shape", choices=list(SHAPES), default="mixed")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--json", default=None, metavar="ARQUIVO", help="grava os resultados em JSON")
+    args = parser.parse_args()
+    # a análise semântica e o parser são recursivos por nível de aninhamento
+    sys.setrecursionlimit(max(sys.getrecursionlimit(), 10000))
+
+    results = []
+    print(f"{'tamanho':>10}{'tokens':>10}{'nós':>10}  {'fase':<9}{'tempo (s)':>11}{'itens/s':>13}{'pico (MiB)':>12}{'expoente':>10}")
+    for text in args.sizes:
+        result = measure(parse_size(text), args.shape, args.seed, args.repeat)
+        result["size"] = text
+        previous = results[-1] if results else None
+        results.append(result)
+        for i, phase in enumerate(PHASES):
+            rate = result["tokens_per_sec"] if phase == "lexer" else result["nodes_per_sec"][phase]
+            exponent = growth(previous, result, phase) if previous else None
+            head = f"{text:>10}{result['tokens']:>10}{result['nodes']:>10}" if i == 0 else " " * 30
+            print(f"{head}  {phase:<9}{result['seconds'][phase]:>11.4f}{rate:>13.0f}"
+                  f"{result['peak_bytes'][phase] / 1024 ** 2:>12.1f}{'' if exponent is None else f'{exponent:.2f}':>10}")
+        sys.stdout.flush()
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"shape": args.shape, "seed": args.seed, "results": results}, f, indent=2)
+
+if __name__ == "__main__":
+    main()
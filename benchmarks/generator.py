@@ -0,0 +1,132 @@
+# Gerador de programas minipar válidos (passam pela análise semântica) para medir o
+# front-end. A mesma semente e os mesmos parâmetros geram sempre o mesmo programa.
+#
+#   python -m benchmarks.generator --size 1M --shape nesting --seed 7 > /tmp/prog.minipar
+import argparse
+import random
+import sys
+
+# peso de cada tipo de trecho de nível superior em cada formato de programa
+SHAPES = {
+    "mixed": {"function": 3, "nesting": 2, "expression": 2, "literal": 1, "comment": 1},
+    "functions": {"function": 1},
+    "nesting": {"nesting": 1},
+    "expressions": {"expression": 1},
+    "literals": {"literal": 1},
+    "comments": {"comment": 3, "function": 1},
+}
+
+WORDS = ("peso", "erro", "entrada", "saida", "canal", "valor", "total", "indice", "taxa", "limite")
+
+def parse_size(text):
+    # '1K', '10M', '4096' -> bytes
+    units = {"K": 1024, "M": 1024 ** 2, "G": 1024 ** 3}
+    text = text.strip().upper().rstrip("B")
+    if text and text[-1] in units:
+        return int(float(text[:-1]) * units[text[-1]])
+    return int(text)
+
+class ProgramGenerator:
+    def __init__(self, seed=0, shape="mixed", max_depth=6, expression_terms=30, literal_pairs=40, comment_lines=8):
+        if shape not in SHAPES:
+            raise ValueError(f"Formato desconhecido: {shape}")
+        self.random = random.Random(seed)
+        self.kinds = list(SHAPES[shape])
+        self.weights = [SHAPES[shape][kind] for kind in self.kinds]
+        self.max_depth = max_depth
+        self.expression_terms = expression_terms
+        self.literal_pairs = literal_pairs
+        self.comment_lines = comment_lines
+        self.counter = 0
+        self.functions = []      # nomes das funções já geradas, para chamadas
+
+    def name(self, prefix):
+        self.counter += 1
+        return f"{prefix}{self.counter}"
+
+    def generate(self, target_bytes):
+        parts = []
+        size = 0
+        while size < target_bytes:
+            kind = self.random.choices(self.kinds, self.weights)[0]
+            part = getattr(self, f"gen_{kind}")()
+            parts.append(part)
+            size += len(part.encode("utf-8"))
+        return "".join(parts)
+
+    def expression(self, names, terms):
+        # expressão numérica longa e sem recursão de parênteses profunda
+        ops = ("+", "-", "*")
+        items = []
+        for i in range(terms):
+            operand = self.random.choice(names) if names and self.random.random() < 0.5 else str(self.random.randint(0, 999))
+            if self.random.random() < 0.2:
+                operand = f"({operand} + {self.random.randint(1, 9)})"
+            items.append(operand if i == 0 else f"{self.random.choice(ops)} {operand}")
+        return " ".join(items)
+
+    def gen_function(self):
+        name = self.name("f")
+        body = [
+            f"  t: number = {self.expression(['a', 'b'], 6)}",
+            f"  if (t > {self.random.randint(0, 500)}) {{ return t - b }}",
+            "  return t + a",
+        ]
+        self.functions.append(name)
+        call = f"{self.name('r')}: number = {name}({self.random.randint(0, 99)}, {self.random.randint(0, 99)})\n"
+        return f"func {name}(a: number, b: number) -> number\n{{\n" + "\n".join(body) + "\n}\n" + call
+
+    def gen_nesting(self):
+        counter = self.name("n")
+        lines = [f"{counter}: number = 0"]
+        depth = self.random.randint(2, self.max_depth)
+        for level in range(depth):
+            indent = "  " * level
+            if self.random.random() < 0.5:
+                lines.append(f"{indent}while ({counter} < {self.random.randint(1, 5)}) {{")
+                lines.append(f"{indent}  {counter} = {counter} + 1")
+            else:
+                lines.append(f"{indent}if ({counter} >= {self.random.randint(0, 3)}) {{")
+        inner = "  " * depth
+        if self.functions and self.random.random() < 0.5:
+            lines.append(f"{inner}{counter} = {counter} + {self.random.choice(self.functions)}({counter}, 1)")
+        else:
+            lines.append(f"{inner}{counter} = {counter} * 2")
+        for level in reversed(range(depth)):
+            lines.append("  " * level + "}")
+        return "\n".join(lines) + "\n"
+
+    def gen_expression(self):
+        base = self.name("x")
+        return (f"{base}: number = {self.random.randint(1, 100)}\n"
+                f"{self.name('e')}: number = {self.expression([base], self.expression_terms)}\n")
+
+    def gen_literal(self):
+        pairs = ", ".join(f'"{self.random.choice(WORDS)}_{i}": {self.random.randint(0, 10 ** 6)}'
+                          for i in range(self.literal_pairs))
+        return f"{self.name('d')}: dict = {{{pairs}}}\n"
+
+    def gen_comment(self):
+        lines = [" ".join(self.random.choice(WORDS) for _ in range(self.random.randint(4, 12)))
+                 for _ in range(self.comment_lines)]
+        if self.random.random() < 0.5:
+            return "/* " + "\n * ".join(lines) + "\n */\n"
+        return "".join(f"# {line}\n" for line in lines)
+
+def generate_program(size, seed=0, shape="mixed", **options):
+    return ProgramGenerator(seed=seed, shape=shape, **options).generate(size)
+
+def main():
+    parser = argparse.ArgumentParser(prog="benchmarks.generator", description="Gera um programa minipar sintético válido.")
+    parser.add_argument("--size", default="10K", help="tamanho aproximado (ex.: 4096, 10K, 1M)")
+    parser.add_argument("--shape", choices=list(SHAPES), default="mixed")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-depth", type=int, default=6)
+    parser.add_argument("--expression-terms", type=int, default=30)
+    parser.add_argument("--literal-pairs", type=int, default=40)
+    args = parser.parse_args()
+    sys.stdout.write(generate_program(parse_size(args.size), args.seed, args.shape, max_depth=args.max_depth,
+                                      expression_terms=args.expression_terms, literal_pairs=args.literal_pairs))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+# Memória das listas do runtime (list_3000.MiniList) por milhão de elementos, comparada
+# com uma list do Python com os mesmos números (um objeto int/float por elemento), e
+# tempo de leitura/escrita por índice, len e sum num programa minipar.
+#
+#   python -m benchmarks.lists
+#   python -m benchmarks.lists --elements 1M 10M --ops 200K
+import argparse
+import gc
+import random
+import time
+import tracemalloc
+
+from benchmarks.generator import parse_size
+from minipar.list_3000 import MiniList
+from minipar.pipeline_3000 import Pipeline
+
+MILLION = 1_000_000
+
+def values(kind, n):
+    # números distintos: inteiros pequenos (< 256) seriam objetos compartilhados
+    rng = random.Random(0)
+    if kind == "int":
+        return [rng.randrange(10 ** 6, 10 ** 12) for _ in range(n)]
+    return [rng.random() for _ in range(n)]
+
+def traced_bytes(build):
+    gc.collect()
+    tracemalloc.start()
+    try:
+        value = build()
+        size = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del value
+    return size
+
+def memory_rows(n):
+    rows = []
+    for kind in ("int", "float"):
+        # os números são gerados dentro do build: a list do Python paga por eles, a
+        # MiniList só pelo array (a list temporária já foi liberada ao medir)
+        rows.append((f"list do Python ({kind})", traced_bytes(lambda: values(kind, n))))
+        rows.append((f"MiniList ({kind})", traced_bytes(lambda: MiniList(values(kind, n)))))
+    rows.append(("MiniList (range)", traced_bytes(lambda: MiniList.from_range(n))))
+    return rows
+
+PROGRAM = """
+n: number = {n}
+l: list = range(n)
+i: number = 0
+while (i < n) {{
+  l[i] = l[i] * 2
+  i = i + 1
+}}
+print(len(l), sum(l))
+"""
+
+def run_program(ops):
+    compiled = Pipeline().run(PROGRAM.format(n=ops), stop_after="semantic")
+    start = time.perf_counter()
+    Pipeline().run(result=compiled)
+    return time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(prog="benchmarks.lists", description="Memória e tempo das listas do runtime.")
+    parser.add_argument("--elements", nargs="*", default=["1M"], help="tamanhos das listas (ex.: 1M 10M)")
+    parser.add_argument("--ops", default="100K", help="leituras+escritas por índice no programa minipar")
+    args = parser.parse_args()
+
+    print(f"{'elementos':>10}  {'armazenamento':<24}{'MiB':>9}{'MiB/milhão':>12}{'bytes/elem':>12}")
+    for text in args.elements:
+        n = parse_size(text)
+        for label, size in memory_rows(n):
+            print(f"{text:>10}  {label:<24}{size / 1024 ** 2:>9.1f}{size / n * MILLION / 1024 ** 2:>12.1f}{size / n:>12.1f}")
+    ops = parse_size(args.ops)
+    seconds = run_program(ops)
+    print(f"\n{ops} voltas de l[i] = l[i] * 2: {seconds:.3f} s ({seconds / ops * 1e9:.0f} ns por volta)")
+
+if __name__ == "__main__":
+    main()
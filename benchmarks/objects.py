@@ -0,0 +1,66 @@
+# Objetos do minipar (class_3000): tempo dos programas com objetos com e sem os caches
+# por ponto de acesso do Interpreter, e memória por instância comparada com um objeto
+# guardado como dict {campo: valor}.
+#
+#   python -m benchmarks.objects
+#   python -m benchmarks.objects --fields 2 8 32 --repeat 5
+import argparse
+import os
+import sys
+import time
+
+from benchmarks.runtime import WORKLOAD_DIR, compile_source
+from minipar.class_3000 import Instance, build_layouts
+from minipar.interpreter_3000 import Interpreter
+
+class UncachedInterpreter(Interpreter):
+    # sem o cache no nó: todo acesso consulta a tabela de campos/métodos do layout
+    def _field_slot(self, node, obj):
+        if not isinstance(obj, Instance):
+            raise RuntimeError(f"Acesso ao campo '{node.member_name}' em um valor que não é objeto.")
+        return obj.layout.slots[node.member_name]
+
+    def _method(self, node, obj):
+        return obj.layout.methods[node.method_name]
+
+def best_time(interpreter_class, program, repeat):
+    best = None
+    for _ in range(repeat):
+        interpreter = interpreter_class(output=open(os.devnull, "w"))
+        start = time.perf_counter()
+        interpreter.interpret(program)
+        elapsed = time.perf_counter() - start
+        interpreter.output.close()
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def instance_bytes(fields):
+    source = "class P {\n" + "".join(f"  var f{i}: number = {i + 1000}\n" for i in range(fields)) + "}\n"
+    program = compile_source(source)
+    instance = Instance(build_layouts(program.classes)["P"])
+    as_dict = {f"f{i}": value for i, value in enumerate(instance.values)}
+    return sys.getsizeof(instance), sys.getsizeof(as_dict)
+
+def main():
+    parser = argparse.ArgumentParser(prog="benchmarks.objects", description="Objetos: caches por ponto de acesso e memória por instância.")
+    parser.add_argument("--workloads", nargs="*", default=["objects"], help="programas de benchmarks/workloads")
+    parser.add_argument("--fields", nargs="*", type=int, default=[2, 8, 32])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'programa':<12}{'com cache (ms)':>16}{'sem cache (ms)':>16}{'ganho':>8}")
+    for name in args.workloads:
+        with open(os.path.join(WORKLOAD_DIR, f"{name}.minipar"), encoding="utf-8") as f:
+            program = compile_source(f.read())
+        cached = best_time(Interpreter, program, args.repeat)
+        uncached = best_time(UncachedInterpreter, program, args.repeat)
+        print(f"{name:<12}{cached * 1000:>16.1f}{uncached * 1000:>16.1f}{uncached / cached:>7.2f}x")
+
+    # bytes do objeto e do contêiner dos campos; os valores são os mesmos nos dois casos
+    print(f"\n{'campos':>8}{'instância (B)':>15}{'dict (B)':>10}")
+    for fields in args.fields:
+        slots, as_dict = instance_bytes(fields)
+        print(f"{fields:>8}{slots:>15}{as_dict:>10}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+# Benchmarks do interpretador: cada programa de benchmarks/workloads roda em cada
+# motor de execução, e o resultado vai para um histórico JSON. Uma medida fica marcada
+# como regressão quando o melhor tempo passa da mediana das últimas execuções
+# registradas mais a margem de ruído (--threshold).
+#
+#   python -m benchmarks.runtime
+#   python -m benchmarks.runtime --only fib --engines ast --repeat 10 --no-save
+import argparse
+import datetime
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+
+from minipar.arena_3000 import ASTArena
+from minipar.interpreter_3000 import Interpreter
+from minipar.lexer_251018_215612 import Lexer
+from minipar.parser_251018_215706 import Parser
+from minipar.semantic_3000 import SemanticAnalyzer
+
+WORKLOAD_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "workloads")
+DEFAULT_HISTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), "history.json")
+
+# motor -> função que prepara a AST validada para o Interpreter
+ENGINES = {
+    "ast": lambda program: program,
+    "arena": lambda program: ASTArena.from_ast(program).root_node(),
+}
+
+def load_workloads(only=None):
+    workloads = {}
+    for name in sorted(os.listdir(WORKLOAD_DIR)):
+        stem, ext = os.path.splitext(name)
+        if ext == ".minipar" and (not only or stem in only):
+            with open(os.path.join(WORKLOAD_DIR, name), encoding="utf-8") as f:
+                workloads[stem] = f.read()
+    return workloads
+
+def compile_source(code):
+    return SemanticAnalyzer().analyze(Parser(Lexer(code).tokenize()).parse_program())
+
+def run_once(program, max_steps=None):
+    interpreter = Interpreter(output=io.StringIO(), max_steps=max_steps)
+    interpreter.interpret(program)
+    return interpreter
+
+def measure(program, repeat):
+    # uma execução contando passos (voltas de while e chamadas, como o Budget) e o pico
+    # de memória com tracemalloc; depois 'repeat' execuções só cronometradas
+    tracemalloc.start()
+    try:
+        steps = run_once(program, max_steps=sys.maxsize).budget.steps
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run_once(program)
+        times.append(time.perf_counter() - start)
+    best = min(times)
+    return {
+        "best": best,
+        "median": statistics.median(times),
+        "steps": steps,
+        "ops_per_sec": steps / best if best else 0.0,
+        "peak_bytes": peak,
+    }
+
+def load_history(path):
+    if not os.path.exists(path):
+        return []
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+def save_history(path, history):
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(history, f, indent=2)
+    os.replace(tmp, path)
+
+def baseline(history, key, window):
+    # mediana do melhor tempo nas últimas 'window' execuções com esta medida
+    previous = [entry["results"][key]["best"] for entry in history if key in entry["results"]][-window:]
+    return statistics.median(previous) if previous else None
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def main():
+    parser = argparse.ArgumentParser(prog="benchmarks.runtime", description="Benchmarks do interpretador com histórico de regressões.")
+    parser.add_argument("--only", nargs="*", default=None, help="nomes dos programas (sem .minipar)")
+    parser.add_argument("--engines", nargs="*", default=list(ENGINES), choices=list(ENGINES))
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--history", default=DEFAULT_HISTORY)
+    parser.add_argument("--window", type=int, default=5, help="execuções anteriores usadas como referência")
+    parser.add_argument("--threshold", type=float, default=0.10, help="margem de ruído (0.10 = 10%%)")
+    parser.add_argument("--no-save", action="store_true", help="compara mas não grava no histórico")
+    args = parser.parse_args()
+
+    history = load_history(args.history)
+    results = {}
+    regressions = []
+    print(f"{'medida':<22}{'melhor (ms)':>12}{'mediana (ms)':>14}{'passos/s':>12}{'pico (KiB)':>12}{'ref. (ms)':>11}")
+    for name, code in load_workloads(args.only).items():
+        program = compile_source(code)
+        for engine in args.engines:
+            key = f"{name}/{engine}"
+            stats = results[key] = measure(ENGINES[engine](program), args.repeat)
+            reference = baseline(history, key, args.window)
+            flag = ""
+            if reference is not None and stats["best"] > reference * (1 + args.threshold):
+                flag = f"  REGRESSÃO +{(stats['best'] / reference - 1) * 100:.0f}%"
+                regressions.append(key)
+            ref_text = f"{reference * 1000:.1f}" if reference is not None else "-"
+            print(f"{key:<22}{stats['best'] * 1000:>12.1f}{stats['median'] * 1000:>14.1f}{stats['ops_per_sec']:>12.0f}"
+                  f"{stats['peak_bytes'] / 1024:>12.1f}{ref_text:>11}{flag}")
+
+    if not args.no_save:
+        history.append({
+            "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "repeat": args.repeat,
+            "results": results,
+        })
+        save_history(args.history, history)
+    if regressions:
+        print(f"\n{len(regressions)} regressões acima de {args.threshold:.0%}: {', '.join(regressions)}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+# Latência p50/p99 do /run sob carga concorrente: execução inline (como antes, na
+# thread da requisição) contra o SandboxPool de processos.
+#
+#   python -m benchmarks.sandbox_latency --clients 16 --requests 400
+import argparse
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from minipar.sandbox_3000 import SandboxPool, execute_source
+
+PROGRAMS = [
+    open("exemplos/ex_fatorial1.minipar", encoding="utf-8").read(),
+    open("exemplos/ex_neuron1_corrigido.minipar", encoding="utf-8").read(),
+    "i: number = 0\ns: number = 0\nwhile (i < 20000) { s = s + i\n i = i + 1 }\nprint(s)",
+]
+
+def percentile(values, p):
+    values = sorted(values)
+    index = min(len(values) - 1, int(round(p / 100 * (len(values) - 1))))
+    return values[index]
+
+def measure(run, clients, requests):
+    def one(i):
+        start = time.perf_counter()
+        run(PROGRAMS[i % len(PROGRAMS)])
+        return time.perf_counter() - start
+    start = time.perf_counter()
+    with ThreadPoolExecutor(clients) as executor:
+        latencies = list(executor.map(one, range(requests)))
+    elapsed = time.perf_counter() - start
+    return {
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "mean_ms": statistics.mean(latencies) * 1000,
+        "throughput": requests / elapsed,
+    }
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--clients", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--workers", type=int, default=0)
+    args = parser.parse_args()
+    inline = measure(execute_source, args.clients, args.requests)
+    with SandboxPool(size=args.workers or None) as pool:
+        pool.run(PROGRAMS[0])
+        sandboxed = measure(pool.run, args.clients, args.requests)
+    print(f"{'modo':<10}{'p50 (ms)':>10}{'p99 (ms)':>10}{'média (ms)':>12}{'req/s':>10}")
+    for name, stats in (("inline", inline), ("sandbox", sandboxed)):
+        print(f"{name:<10}{stats['p50_ms']:>10.1f}{stats['p99_ms']:>10.1f}{stats['mean_ms']:>12.1f}{stats['throughput']:>10.1f}")
+
+if __name__ == "__main__":
+    main()
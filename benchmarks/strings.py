@@ -0,0 +1,72 @@
+# Montagem de texto com s = s + pedaço num while até o tamanho pedido, lido uma vez no
+# fim (print). Para cada tamanho: tempo com a StringRope do Interpreter, tempo com a
+# concatenação comum (até --baseline-max, porque cresce de forma quadrática) e o
+# expoente de crescimento em relação ao tamanho anterior (1.0 = linear).
+#
+#   python -m benchmarks.strings
+#   python -m benchmarks.strings --sizes 1M 10M 50M --baseline-max 1M
+import argparse
+import math
+import os
+import time
+
+from benchmarks.generator import parse_size
+from benchmarks.runtime import compile_source
+from minipar.interpreter_3000 import Interpreter
+
+CHUNK = "0123456789abcdef"
+
+PROGRAM = """
+s: string = ""
+i: number = 0
+while (i < {iterations}) {{
+  s = s + "{chunk}"
+  i = i + 1
+}}
+print(s)
+"""
+
+class ConcatInterpreter(Interpreter):
+    # sem a StringRope: cada volta copia o texto inteiro
+    def append_assign(self, name, right_node):
+        env = self.env.resolve(name)
+        left = env.values[name]
+        env.values[name] = left + self.visit(right_node)
+
+def run(interpreter_class, program):
+    with open(os.devnull, "w") as devnull:
+        start = time.perf_counter()
+        interpreter_class(output=devnull).interpret(program)
+        return time.perf_counter() - start
+
+def exponent(previous, current):
+    if previous is None:
+        return ""
+    (size_a, time_a), (size_b, time_b) = previous, current
+    return f"{math.log(time_b / time_a) / math.log(size_b / size_a):.2f}"
+
+def main():
+    parser = argparse.ArgumentParser(prog="benchmarks.strings", description="Montagem de strings por concatenação em laço.")
+    parser.add_argument("--sizes", nargs="*", default=["100K", "1M", "10M"], help="tamanho final do texto (ex.: 1M 10M)")
+    parser.add_argument("--baseline-max", default="1M", help="maior tamanho medido sem a StringRope")
+    args = parser.parse_args()
+    baseline_max = parse_size(args.baseline_max)
+
+    print(f"{'tamanho':>10}{'corda (s)':>11}{'MB/s':>8}{'expoente':>10}{'comum (s)':>11}{'expoente':>10}")
+    previous_rope = previous_concat = None
+    for text in args.sizes:
+        size = parse_size(text)
+        iterations = max(1, size // len(CHUNK))
+        program = compile_source(PROGRAM.format(iterations=iterations, chunk=CHUNK))
+        total = iterations * len(CHUNK)
+        rope = (total, run(Interpreter, program))
+        line = f"{text:>10}{rope[1]:>11.3f}{total / rope[1] / 1e6:>8.1f}{exponent(previous_rope, rope):>10}"
+        previous_rope = rope
+        if size <= baseline_max:
+            concat = (total, run(ConcatInterpreter, program))
+            line += f"{concat[1]:>11.3f}{exponent(previous_concat, concat):>10}"
+            previous_concat = concat
+        print(line, flush=True)
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,29 @@
-from fastapi import FastAPI, Request, Form
-from fastapi.responses import HTMLResponse
+from fastapi import FastAPI, Request, Form, Body, HTTPException
+from fastapi.responses import HTMLResponse, PlainTextResponse, StreamingResponse
 from fastapi.templating import Jinja2Templates
 from fastapi.staticfiles import StaticFiles
 
-from minipar.lexer_251018_215612 import Lexer
-from minipar.parser_251018_215706 import Parser
-from minipar.interpreter_3000 import Interpreter
+from minipar.pipeline_3000 import Pipeline
+from minipar.cache_3000 import MemoryProgramCache, source_key
+from minipar.arena_3000 import ASTArena, object_tree_bytes
+from minipar.sandbox_3000 import SandboxPool, StreamCancelled, StreamTimeout
 
-import io
+from interface.metrics import Registry, outcome
+
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+import asyncio
+import json
+import os
 import sys
+import threading
+import time
 
 app = FastAPI()
+program_cache = MemoryProgramCache(
+    max_entries=int(os.environ.get("MINIPAR_WEB_CACHE_ENTRIES", "256")),
+    max_bytes=int(os.environ.get("MINIPAR_WEB_CACHE_BYTES", str(64 * 1024 * 1024))),
+)
 templates = Jinja2Templates(directory="interface/templates")
 app.mount("/static", StaticFiles(directory="interface/static"), name="static")
 
@@ -23,29 +36,158 @@ def home(request: Request):
     )
 
 
+_sandbox_pool: Optional[SandboxPool] = None
+_sandbox_lock = threading.Lock()
+
+
+def env_limit(name: str) -> Optional[int]:
+    # orçamento padrão do servidor; vazio ou 0 desliga
+    return int(os.environ.get(name, "0")) or None
+
+
+def form_limit(value: Optional[str]) -> Optional[int]:
+    # campos opcionais do formulário; o pool só deixa apertar o limite do servidor
+    if value is None or not value.strip():
+        return None
+    try:
+        limit = int(value)
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Limite inválido: {value!r}")
+    return limit if limit > 0 else None
+
+
+def get_sandbox_pool() -> SandboxPool:
+    # workers pré-criados com os módulos do minipar já importados; código do usuário
+    # nunca roda no processo do servidor
+    global _sandbox_pool
+    with _sandbox_lock:
+        if _sandbox_pool is None:
+            _sandbox_pool = SandboxPool(
+                size=int(os.environ.get("MINIPAR_SANDBOX_WORKERS", "0")) or None,
+                timeout=float(os.environ.get("MINIPAR_SANDBOX_TIMEOUT", "5")),
+                cpu_seconds=int(os.environ.get("MINIPAR_SANDBOX_CPU_SECONDS", "5")),
+                memory_bytes=int(os.environ.get("MINIPAR_SANDBOX_MEMORY_BYTES", str(512 * 1024 * 1024))),
+                max_steps=env_limit("MINIPAR_MAX_STEPS"),
+                max_memory=env_limit("MINIPAR_MAX_MEMORY"),
+            )
+        return _sandbox_pool
+
+
+@app.on_event("startup")
+def start_sandbox():
+    get_sandbox_pool()
+
+
+@app.on_event("shutdown")
+def stop_sandbox():
+    global _sandbox_pool
+    with _sandbox_lock:
+        if _sandbox_pool is not None:
+            _sandbox_pool.close()
+            _sandbox_pool = None
+
+
+@dataclass
+class CompiledProgram:
+    ast: Any
+    ast_output: str
+    error: Optional[str]
+    phase: Optional[str]
+    timings: Dict[str, float]
+    arena: Optional[bytes] = None  # AST validada (ASTArena.to_bytes) enviada ao worker do sandbox
+
+
+def format_ast(ast_obj):
+    return str(ast_obj).replace("),", "),\n")  # ajusta conforme seu AST
+
+
+def compile_program(code: str, with_ast_output: bool = True):
+    # lexer, parser e semântica pelo mesmo pipeline do init_3000; programa com erro em
+    # qualquer fase não é executado. O resultado (inclusive o erro) fica no cache.
+    result = Pipeline().run(code, stop_after="semantic")
+    ast_output = format_ast(result.ast) if with_ast_output and result.ast is not None else ""
+    size = sys.getsizeof(ast_output) + sys.getsizeof(code)
+    if result.ast is not None:
+        size += object_tree_bytes(result.ast)[1]
+    arena = ASTArena.from_ast(result.ast).to_bytes() if result.ok else None
+    if arena is not None:
+        size += sys.getsizeof(arena)
+    return CompiledProgram(result.ast, ast_output, result.error, result.phase, result.timings, arena), size
+
+
+def compile_recorded(code: str, with_ast_output: bool = True):
+    # só compilações de fato (faltas no cache) entram nos histogramas de fase
+    compiled, size = compile_program(code, with_ast_output)
+    for phase in ("lexer", "parser", "semantic"):
+        if phase in compiled.timings:
+            PHASE_SECONDS.observe(compiled.timings[phase], phase)
+    return compiled, size
+
+
+def sandbox_execute(run, *args, **kwargs):
+    # 'run' é um método do SandboxPool; 'execute' mede o tempo visto pelo servidor,
+    # incluindo espera por worker e IPC
+    IN_FLIGHT.inc()
+    try:
+        result = run(*args, **kwargs)
+    finally:
+        IN_FLIGHT.dec()
+    PHASE_SECONDS.observe(result.timings.get("total", 0.0), "execute")
+    return result
+
+
+def cache_metrics():
+    stats = program_cache.stats()
+    return {("hit",): stats["hits"], ("miss",): stats["misses"]}
+
+
+def sandbox_metrics():
+    if _sandbox_pool is None:
+        return {}
+    stats = _sandbox_pool.stats()
+    return {("idle",): stats["idle"], ("busy",): stats["workers"] - stats["idle"], ("waiting",): stats["waiting"]}
+
+
+metrics = Registry()
+PHASE_SECONDS = metrics.histogram("minipar_phase_seconds", "Duração de cada fase (lexer, parser, semantic, execute).", ["phase"])
+REQUESTS = metrics.counter("minipar_requests_total", "Programas processados por endpoint e resultado.", ["endpoint", "outcome"])
+IN_FLIGHT = metrics.gauge("minipar_executions_in_flight", "Execuções em andamento no sandbox.")
+metrics.callback("minipar_program_cache_lookups_total", "Consultas ao cache de programas compilados.", cache_metrics, ["result"], kind="counter")
+metrics.callback("minipar_program_cache_hit_ratio", "Taxa de acerto do cache de programas compilados.", lambda: {(): program_cache.stats()["hit_rate"]})
+metrics.callback("minipar_program_cache_bytes", "Bytes aproximados no cache de programas compilados.", lambda: {(): program_cache.stats()["bytes"]})
+metrics.callback("minipar_sandbox_workers", "Workers do sandbox por estado.", sandbox_metrics, ["state"])
+metrics.callback("minipar_sandbox_replaced_total", "Workers do sandbox substituídos (timeout, limite, max_tasks).",
+                 lambda: {(): _sandbox_pool.replaced if _sandbox_pool is not None else 0}, kind="counter")
+
+
+@app.get("/metrics")
+def metrics_endpoint():
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+@app.get("/cache/stats")
+def cache_stats():
+    return program_cache.stats()
+
+
 @app.post("/run", response_class=HTMLResponse)
-def run_code(request: Request, code: str = Form(...)):
+def run_code(request: Request, code: str = Form(...), max_steps: Optional[str] = Form(None),
+             max_memory: Optional[str] = Form(None)):
     try:
-        # Lexing
-        lexer = Lexer(code)
-        tokens = lexer.tokenize()
-
-        # Parsing
-        parser = Parser(tokens)
-        ast = parser.parse_program()
-        def format_ast(ast_obj):
-            return str(ast_obj).replace("),", "),\n")  # ajusta conforme seu AST
-
-        ast_output = format_ast(ast)
-        # Interpretação
-        old_stdout = sys.stdout
-        sys.stdout = io.StringIO()
-        try:
-            interpreter = Interpreter()
-            interpreter.interpret(ast)
-            exec_output = sys.stdout.getvalue()
-        finally:
-            sys.stdout = old_stdout
+        compiled = program_cache.get_or_compile(code, compile_recorded)
+        ast_output = compiled.ast_output or f"Erro: {compiled.error}"
+        if compiled.error:
+            exec_output = f"Erro: {compiled.error}"
+            REQUESTS.inc("run", outcome(compiled.phase))
+        else:
+            # Interpretação: num worker do sandbox, com timeout e limites de CPU/memória;
+            # o worker recebe a AST do cache e vai direto para a execução
+            result = sandbox_execute(get_sandbox_pool().run, code, max_steps=form_limit(max_steps),
+                                     max_memory=form_limit(max_memory), arena=compiled.arena)
+            REQUESTS.inc("run", outcome(result.phase))
+            exec_output = result.output
+            if result.error:
+                exec_output += f"Erro: {result.error}"
 
         
         return templates.TemplateResponse(
@@ -53,21 +195,183 @@ def run_code(request: Request, code: str = Form(...)):
             {
                 "request": request,
                 "code": code,
+                "max_steps": max_steps or "",
+                "max_memory": max_memory or "",
                 "exec_result": exec_output,
                 "ast_result": ast_output,
             },
         )
 
     except Exception as e:
-        
+        REQUESTS.inc("run", "InternalError")
         return templates.TemplateResponse(
             "index.html",
             {
                 "request": request,
                 "code": code,
+                "max_steps": max_steps or "",
+                "max_memory": max_memory or "",
                 "exec_result": f"Erro: {e}",
                 "ast_result": f"Erro: {e}",
             },
         )
 
 
+
+
+STREAM_TIMEOUT = float(os.environ.get("MINIPAR_STREAM_TIMEOUT", "60"))
+STREAM_QUEUE_SIZE = 64
+
+
+def sse_event(event: str, data: Any) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+@app.post("/run/stream")
+async def run_code_stream(code: str = Form(...), max_steps: Optional[str] = Form(None),
+                          max_memory: Optional[str] = Form(None)):
+    # Server-Sent Events: 'output' com cada pedaço da saída assim que o worker o envia
+    # e 'done' no fim com erro, fase e tempos. A fila é limitada: se o cliente lê devagar,
+    # a thread que recebe do worker espera, o pipe enche e o programa pausa no print.
+    # Se o cliente desconecta, o gerador é fechado e o worker é morto e substituído.
+    limits = {"max_steps": form_limit(max_steps), "max_memory": form_limit(max_memory)}
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue(maxsize=STREAM_QUEUE_SIZE)
+    cancel = threading.Event()
+    deadline = [None]
+
+    def on_chunk(text: str):
+        # um cliente que não lê segura o worker aqui; o prazo da execução vale também
+        # para essa espera (StreamTimeout mata o worker)
+        future = asyncio.run_coroutine_threadsafe(queue.put(("output", text)), loop)
+        while True:
+            if cancel.is_set():
+                future.cancel()
+                raise StreamCancelled()
+            if time.perf_counter() >= deadline[0]:
+                future.cancel()
+                raise StreamTimeout()
+            try:
+                future.result(timeout=0.1)
+                return
+            except TimeoutError:
+                continue
+
+    def execute():
+        try:
+            compiled = program_cache.get_or_compile(code, compile_recorded)
+            if compiled.error:
+                REQUESTS.inc("stream", outcome(compiled.phase))
+                done = {"error": compiled.error, "phase": compiled.phase, "timings": compiled.timings, "usage": {}}
+                asyncio.run_coroutine_threadsafe(queue.put(("done", done)), loop)
+                return
+            deadline[0] = time.perf_counter() + STREAM_TIMEOUT
+            result = sandbox_execute(get_sandbox_pool().run_streaming, code, on_chunk, timeout=STREAM_TIMEOUT,
+                                     cancel_event=cancel, arena=compiled.arena, **limits)
+            REQUESTS.inc("stream", outcome(result.phase))
+            done = {"error": result.error, "phase": result.phase, "timings": {**compiled.timings, **result.timings},
+                    "usage": result.usage}
+        except Exception as e:
+            REQUESTS.inc("stream", "InternalError")
+            done = {"error": str(e), "phase": None, "timings": {}}
+        if not cancel.is_set():
+            asyncio.run_coroutine_threadsafe(queue.put(("done", done)), loop)
+
+    async def events():
+        task = loop.run_in_executor(None, execute)
+        try:
+            while True:
+                event, data = await queue.get()
+                yield sse_event(event, data)
+                if event == "done":
+                    break
+            await task
+        finally:
+            cancel.set()
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+BATCH_MAX_PROGRAMS = int(os.environ.get("MINIPAR_BATCH_MAX_PROGRAMS", "1000"))
+
+
+def parse_batch(payload: Any) -> List[Dict[str, Any]]:
+    # {"programs": [{"id": ..., "code": "...", "stdin": "...", "max_steps": n, "max_memory": n}, ...]};
+    # só 'code' é obrigatório; max_steps/max_memory no objeto externo valem para todos
+    programs = payload.get("programs") if isinstance(payload, dict) else None
+    if not isinstance(programs, list) or not programs:
+        raise HTTPException(status_code=400, detail="Esperado um objeto JSON com a lista 'programs'.")
+    if len(programs) > BATCH_MAX_PROGRAMS:
+        raise HTTPException(status_code=413, detail=f"No máximo {BATCH_MAX_PROGRAMS} programas por lote.")
+    batch = []
+    for index, item in enumerate(programs):
+        if not isinstance(item, dict) or not isinstance(item.get("code"), str):
+            raise HTTPException(status_code=400, detail=f"Programa {index}: campo 'code' ausente ou inválido.")
+        stdin = item.get("stdin")
+        if stdin is not None and not isinstance(stdin, str):
+            raise HTTPException(status_code=400, detail=f"Programa {index}: 'stdin' deve ser texto.")
+        limits = {}
+        for name in ("max_steps", "max_memory"):
+            value = item.get(name, payload.get(name))
+            if value is not None and (not isinstance(value, int) or isinstance(value, bool) or value <= 0):
+                raise HTTPException(status_code=400, detail=f"Programa {index}: '{name}' deve ser um inteiro positivo.")
+            limits[name] = value
+        batch.append({"index": index, "id": item.get("id", index), "code": item["code"], "stdin": stdin, "limits": limits})
+    return batch
+
+
+@app.post("/run/batch")
+async def run_batch(payload: Any = Body(...)):
+    # Execução em lote para correção automática: resposta em NDJSON, uma linha por
+    # programa na ordem em que terminam. Fontes repetidas são compiladas uma vez só;
+    # programas com erro léxico, sintático ou semântico nem chegam ao sandbox. A concorrência é
+    # limitada ao número de workers do pool, então o lote não monopoliza o servidor.
+    batch = parse_batch(payload)
+    loop = asyncio.get_running_loop()
+    pool = get_sandbox_pool()
+    limit = asyncio.Semaphore(pool.size)
+
+    def compile_batch():
+        # roda no executor: até BATCH_MAX_PROGRAMS compilações não travam o event loop.
+        # Passa pelo program_cache (o mesmo do /run); o dict local garante uma compilação
+        # por fonte mesmo se o cache descartar entradas no meio do lote
+        compiled: Dict[str, CompiledProgram] = {}
+        for item in batch:
+            key = source_key(item["code"])
+            if key not in compiled:
+                compiled[key] = program_cache.get_or_compile(item["code"], compile_recorded)
+            item["compiled"] = compiled[key]
+
+    await loop.run_in_executor(None, compile_batch)
+
+    def execute(item) -> Dict[str, Any]:
+        result = {"index": item["index"], "id": item["id"]}
+        program = item["compiled"]
+        if program.error:
+            REQUESTS.inc("batch", outcome(program.phase))
+            result.update(output="", error=program.error, phase=program.phase, timings=program.timings, usage={})
+            return result
+        run = sandbox_execute(pool.run, item["code"], stdin=item["stdin"], arena=program.arena, **item["limits"])
+        REQUESTS.inc("batch", outcome(run.phase))
+        result.update(output=run.output, error=run.error, phase=run.phase,
+                      timings={**program.timings, **run.timings}, usage=run.usage)
+        return result
+
+    async def run_one(item):
+        async with limit:
+            return await loop.run_in_executor(None, execute, item)
+
+    async def results():
+        tasks = [asyncio.ensure_future(run_one(item)) for item in batch]
+        try:
+            for task in asyncio.as_completed(tasks):
+                yield json.dumps(await task, ensure_ascii=False) + "\n"
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    return StreamingResponse(results(), media_type="application/x-ndjson")
@@ -53,6 +53,86 @@ function showTab(tabName) {
     }
 }
 
+let streamController = null;
+
+function setStreaming(active) {
+    document.getElementById('stream-button').disabled = active;
+    document.getElementById('stop-button').disabled = !active;
+}
+
+function appendOutput(text) {
+    const doc = execEditor.getDoc();
+    doc.replaceRange(text, CodeMirror.Pos(doc.lastLine()));
+    execEditor.scrollIntoView(CodeMirror.Pos(doc.lastLine()));
+}
+
+function handleStreamEvent(block) {
+    // bloco SSE: linhas "event: ..." e "data: ..."
+    let event = 'message';
+    let data = '';
+    for (const line of block.split('\n')) {
+        if (line.startsWith('event:')) {
+            event = line.slice(6).trim();
+        } else if (line.startsWith('data:')) {
+            data += line.slice(5).trim();
+        }
+    }
+    if (!data) {
+        return;
+    }
+    const payload = JSON.parse(data);
+    if (event === 'output') {
+        appendOutput(payload);
+    } else if (event === 'done' && payload.error) {
+        appendOutput(`Erro: ${payload.error}`);
+    }
+}
+
+async function runStreaming() {
+    editor.save();
+    execEditor.setValue('');
+    showTab('exec');
+    streamController = new AbortController();
+    setStreaming(true);
+    try {
+        const response = await fetch('/run/stream', {
+            method: 'POST',
+            body: new FormData(document.getElementById('form-editor')),
+            signal: streamController.signal
+        });
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        let buffer = '';
+        while (true) {
+            const { value, done } = await reader.read();
+            if (done) {
+                break;
+            }
+            buffer += decoder.decode(value, { stream: true });
+            let end;
+            while ((end = buffer.indexOf('\n\n')) >= 0) {
+                handleStreamEvent(buffer.slice(0, end));
+                buffer = buffer.slice(end + 2);
+            }
+        }
+    } catch (e) {
+        if (e.name === 'AbortError') {
+            appendOutput('\nExecução interrompida.');
+        } else {
+            appendOutput(`\nErro: ${e}`);
+        }
+    } finally {
+        streamController = null;
+        setStreaming(false);
+    }
+}
+
+function stopStreaming() {
+    if (streamController) {
+        streamController.abort();
+    }
+}
+
 editor.setOption('extraKeys', {
     Tab: cm => cm.somethingSelected() ? cm.indentSelection('add') : cm.replaceSelection('\t')
 });
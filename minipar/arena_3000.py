@@ -0,0 +1,306 @@
+import sys
+import marshal
+from array import array
+from typing import List, Optional, Dict, Any, Tuple
+import minipar.ast_251018_215806 as ast_nodes
+from minipar.ast_251018_215806 import AST, Program
+
+# Ids estáveis dos tipos de nó (ordenados por nome); LIST e TUPLE são pseudo-nós
+# usados para codificar campos do tipo lista e os pares de DictLiteral.
+NODE_CLASSES: List[type] = sorted(
+    (obj for obj in vars(ast_nodes).values()
+     if isinstance(obj, type) and issubclass(obj, AST) and '__dataclass_fields__' in vars(obj)),
+    key=lambda cls: cls.__name__)
+NODE_KIND_IDS: Dict[type, int] = {cls: i for i, cls in enumerate(NODE_CLASSES)}
+LIST_KIND = len(NODE_CLASSES)
+TUPLE_KIND = LIST_KIND + 1
+
+NONE_CODE = -1
+
+# versão do formato de to_bytes; muda junto com o layout dos arrays
+ARENA_FORMAT = 2
+
+class ArenaFormatError(Exception): pass
+
+class ASTArena:
+    # Representação struct-of-arrays da AST:
+    #   kinds[i]          tipo do nó i (índice em NODE_CLASSES, LIST_KIND ou TUPLE_KIND)
+    #   field_start[i]    início dos campos do nó i em 'fields' (field_start[i+1] é o fim)
+    #   fields[k]         >= 0 índice de nó, -1 None, <= -2 índice no pool de literais
+    #   types[i]          índice em 'type_names' do ast_type do nó (0 = não anotado)
+    #   lines[i]          linha do nó no fonte (0 = sem linha)
+    def __init__(self):
+        self.kinds = array('B')
+        self.field_start = array('I', [0])
+        self.fields = array('i')
+        # 'I': cada classe declarada é um nome de tipo, então podem passar de 255
+        self.types = array('I')
+        self.lines = array('I')
+        self.literals: List[Any] = []
+        self.type_names: List[Optional[str]] = [None]
+        self.root = NONE_CODE
+        self._literal_index: Dict[Tuple[type, Any], int] = {}
+        self._type_index: Dict[Optional[str], int] = {None: 0}
+        self._views: Dict[int, AST] = {}
+        self._sequences: Dict[int, Any] = {}
+
+    @classmethod
+    def from_ast(cls, node: AST) -> 'ASTArena':
+        arena = cls()
+        arena.root = arena._encode(node)
+        return arena
+
+    def __len__(self) -> int:
+        return len(self.kinds)
+
+    def _literal(self, value) -> int:
+        key = (type(value), value)
+        index = self._literal_index.get(key)
+        if index is None:
+            index = self._literal_index[key] = len(self.literals)
+            self.literals.append(value)
+        return -index - 2
+
+    def _type_code(self, type_name: Optional[str]) -> int:
+        index = self._type_index.get(type_name)
+        if index is None:
+            index = self._type_index[type_name] = len(self.type_names)
+            self.type_names.append(type_name)
+        return index
+
+    def _append(self, kind: int, codes: List[int], type_name: Optional[str] = None, line: int = 0) -> int:
+        index = len(self.kinds)
+        self.kinds.append(kind)
+        self.fields.extend(codes)
+        self.field_start.append(len(self.fields))
+        self.types.append(self._type_code(type_name))
+        self.lines.append(line)
+        return index
+
+    def _encode(self, value) -> int:
+        if value is None:
+            return NONE_CODE
+        if isinstance(value, AST):
+            kind = NODE_KIND_IDS[value.__class__]
+            codes = [self._encode(getattr(value, name)) for name in value.__dataclass_fields__]
+            return self._append(kind, codes, getattr(value, 'ast_type', None), getattr(value, 'line', 0))
+        if isinstance(value, list):
+            return self._append(LIST_KIND, [self._encode(item) for item in value])
+        if isinstance(value, tuple):
+            return self._append(TUPLE_KIND, [self._encode(item) for item in value])
+        return self._literal(value)
+
+    def kind(self, index: int) -> type:
+        return NODE_CLASSES[self.kinds[index]]
+
+    def field_codes(self, index: int) -> array:
+        return self.fields[self.field_start[index]:self.field_start[index + 1]]
+
+    def children(self, index: int) -> List[int]:
+        # índices dos nós filhos, com listas e pares achatados
+        result = []
+        for code in self.field_codes(index):
+            if code < 0:
+                continue
+            if self.kinds[code] >= LIST_KIND:
+                result.extend(self.children(code))
+            else:
+                result.append(code)
+        return result
+
+    def decode(self, code: int):
+        if code == NONE_CODE:
+            return None
+        if code < 0:
+            return self.literals[-code - 2]
+        kind = self.kinds[code]
+        if kind == LIST_KIND:
+            seq = self._sequences.get(code)
+            if seq is None:
+                seq = self._sequences[code] = [self.decode(c) for c in self.field_codes(code)]
+            return seq
+        if kind == TUPLE_KIND:
+            return tuple(self.decode(c) for c in self.field_codes(code))
+        return self.node(code)
+
+    def node(self, index: int) -> AST:
+        # visão do nó sobre a arena: instância de uma subclasse da classe original,
+        # então os visitors (SemanticAnalyzer, Interpreter) a percorrem sem mudanças
+        view = self._views.get(index)
+        if view is None:
+            view = object.__new__(_VIEW_CLASSES[self.kinds[index]])
+            view._arena = self
+            view._index = index
+            self._views[index] = view
+        return view
+
+    def root_node(self) -> AST:
+        return self.node(self.root)
+
+    def to_ast(self):
+        # reconstrói a árvore de dataclasses original; os filhos sempre têm índice
+        # menor que o pai (codificação em pós-ordem), então basta uma passada linear
+        built: List[Any] = [None] * len(self.kinds)
+        literals = self.literals
+        fields = self.fields
+        field_start = self.field_start
+        type_names = self.type_names
+        types = self.types
+        lines = self.lines
+        for index, kind in enumerate(self.kinds):
+            values = [built[c] if c >= 0 else (None if c == NONE_CODE else literals[-c - 2])
+                      for c in fields[field_start[index]:field_start[index + 1]]]
+            if kind == LIST_KIND:
+                built[index] = values
+            elif kind == TUPLE_KIND:
+                built[index] = tuple(values)
+            else:
+                node = NODE_CLASSES[kind](*values)
+                type_name = type_names[types[index]]
+                if type_name is not None:
+                    node.ast_type = type_name
+                if lines[index]:
+                    node.line = lines[index]
+                built[index] = node
+        if self.root == NONE_CODE:
+            return None
+        return built[self.root]
+
+    def to_bytes(self) -> bytes:
+        # marshal só serializa valores simples (str, números, listas, bytes), então
+        # carregar um arquivo não executa código arbitrário
+        return marshal.dumps({
+            'format': ARENA_FORMAT,
+            'byteorder': sys.byteorder,
+            'kind_names': [cls.__name__ for cls in NODE_CLASSES],
+            'root': self.root,
+            'kinds': self.kinds.tobytes(),
+            'field_start': self.field_start.tobytes(),
+            'fields': self.fields.tobytes(),
+            'types': self.types.tobytes(),
+            'lines': self.lines.tobytes(),
+            'literals': self.literals,
+            'type_names': self.type_names,
+        })
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'ASTArena':
+        try:
+            payload = marshal.loads(data)
+        except (EOFError, ValueError, TypeError) as e:
+            raise ArenaFormatError(f"Arena corrompida: {e}")
+        if not isinstance(payload, dict):
+            raise ArenaFormatError("Arena corrompida: formato inesperado")
+        if payload.get('format') != ARENA_FORMAT:
+            raise ArenaFormatError("Arena gravada com outro formato")
+        if payload.get('byteorder') != sys.byteorder:
+            raise ArenaFormatError("Arena gravada com outra ordem de bytes")
+        if payload.get('kind_names') != [c.__name__ for c in NODE_CLASSES]:
+            raise ArenaFormatError("Arena gravada com outra versão da AST")
+        arena = cls()
+        try:
+            arena.root = payload['root']
+            arena.kinds = array('B', payload['kinds'])
+            arena.field_start = array('I', payload['field_start'])
+            arena.fields = array('i', payload['fields'])
+            arena.types = array('I', payload['types'])
+            arena.lines = array('I', payload['lines'])
+            arena.literals = list(payload['literals'])
+            arena.type_names = list(payload['type_names'])
+        except (KeyError, TypeError, ValueError) as e:
+            raise ArenaFormatError(f"Arena corrompida: {e}")
+        if (len(arena.field_start) != len(arena.kinds) + 1 or len(arena.types) != len(arena.kinds)
+                or len(arena.lines) != len(arena.kinds)):
+            raise ArenaFormatError("Arena corrompida: tamanhos inconsistentes")
+        arena._literal_index = {(type(v), v): i for i, v in enumerate(arena.literals)}
+        arena._type_index = {name: i for i, name in enumerate(arena.type_names)}
+        return arena
+
+    def nbytes(self) -> int:
+        total = 0
+        for arr in (self.kinds, self.field_start, self.fields, self.types, self.lines):
+            total += arr.itemsize * len(arr)
+        total += sum(sys.getsizeof(v) for v in self.literals)
+        total += sum(sys.getsizeof(v) for v in self.type_names if v is not None)
+        return total
+
+    def node_count(self) -> int:
+        return sum(1 for kind in self.kinds if kind < LIST_KIND)
+
+def _make_field_property(position: int):
+    def getter(self):
+        arena = self._arena
+        return arena.decode(arena.fields[arena.field_start[self._index] + position])
+    def setter(self, value):
+        raise AttributeError("Nós de ASTArena são somente leitura.")
+    return property(getter, setter)
+
+def _get_ast_type(self):
+    type_name = self._arena.type_names[self._arena.types[self._index]]
+    if type_name is None:
+        raise AttributeError('ast_type')
+    return type_name
+
+def _set_ast_type(self, value):
+    self._arena.types[self._index] = self._arena._type_code(value)
+
+def _get_line(self):
+    return self._arena.lines[self._index]
+
+def _make_view_class(cls: type) -> type:
+    namespace: Dict[str, Any] = {'__slots__': ('_arena', '_index'), 'ast_type': property(_get_ast_type, _set_ast_type),
+                                 'line': property(_get_line)}
+    for position, name in enumerate(cls.__dataclass_fields__):
+        namespace[name] = _make_field_property(position)
+    return type(cls.__name__, (cls,), namespace)
+
+_VIEW_CLASSES: List[type] = [_make_view_class(cls) for cls in NODE_CLASSES]
+for _view_cls, _cls in zip(_VIEW_CLASSES, NODE_CLASSES):
+    NODE_KIND_IDS[_view_cls] = NODE_KIND_IDS[_cls]
+
+def object_tree_bytes(node: AST) -> Tuple[int, int]:
+    # (número de nós, bytes) da árvore de dataclasses, contando listas e tuplas de filhos
+    count = 0
+    total = 0
+    stack = [node]
+    while stack:
+        current = stack.pop()
+        total += sys.getsizeof(current)
+        if isinstance(current, AST):
+            count += 1
+            if hasattr(current, '__dict__'):
+                total += sys.getsizeof(current.__dict__)
+            for name in current.__dataclass_fields__:
+                value = getattr(current, name)
+                if isinstance(value, (AST, list, tuple)):
+                    stack.append(value)
+        elif isinstance(current, (list, tuple)):
+            stack.extend(item for item in current if isinstance(item, (AST, list, tuple)))
+    return count, total
+
+def memory_report(program: Program) -> Dict[str, float]:
+    count, tree_bytes = object_tree_bytes(program)
+    arena = ASTArena.from_ast(program)
+    return {
+        'nodes': count,
+        'object_bytes_per_node': tree_bytes / count,
+        'arena_bytes_per_node': arena.nbytes() / count,
+    }
+
+def main():
+    from minipar.lexer_251018_215612 import Lexer
+    from minipar.parser_251018_215706 import Parser
+    from minipar.semantic_3000 import SemanticAnalyzer
+    if len(sys.argv) < 2:
+        print("Uso: python -m minipar.arena_3000 <arquivo.minipar>")
+        sys.exit(1)
+    with open(sys.argv[1], 'r', encoding='utf-8') as f:
+        code = f.read()
+    program = SemanticAnalyzer().analyze(Parser(Lexer(code).tokenize()).parse_program())
+    report = memory_report(program)
+    print(f"Nós: {report['nodes']}")
+    print(f"Bytes por nó (dataclasses): {report['object_bytes_per_node']:.1f}")
+    print(f"Bytes por nó (arena):       {report['arena_bytes_per_node']:.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+import math
+import random as py_random
+from typing import Any
+
+# Tipo 'array' do minipar: vetor de float64 sobre o NumPy, com operadores elemento a
+# elemento (+ - * / e comparações, entre arrays ou com number) e builtins que viram uma
+# única chamada do NumPy. O NumPy é opcional: só é importado quando um programa cria o
+# primeiro array; sem ele, esses builtins geram erro de runtime e o resto da linguagem
+# funciona normalmente.
+_numpy = None
+
+def numpy():
+    global _numpy
+    if _numpy is None:
+        try:
+            import numpy as np
+        except ImportError:
+            from minipar.interpreter_3000 import RuntimeError
+            raise RuntimeError("O tipo 'array' precisa do NumPy (pip install numpy).")
+        _numpy = np
+    return _numpy
+
+def is_array(value: Any) -> bool:
+    # sem o NumPy carregado não pode existir nenhum array
+    return _numpy is not None and isinstance(value, _numpy.ndarray)
+
+def _length(value) -> str:
+    return str(len(value)) if is_array(value) else "number"
+
+def shape_error(op: str, left, right):
+    from minipar.interpreter_3000 import RuntimeError
+    return RuntimeError(f"Operação '{op}' entre arrays de tamanhos diferentes: {_length(left)} e {_length(right)}.")
+
+def _size(n) -> int:
+    if isinstance(n, float) and n.is_integer():
+        n = int(n)
+    if not isinstance(n, int) or isinstance(n, bool) or n < 0:
+        from minipar.interpreter_3000 import RuntimeError
+        raise RuntimeError(f"Tamanho de array inválido: {n!r}.")
+    return n
+
+def array(values):
+    # de uma MiniList com array('q'/'d') o NumPy copia o buffer, sem criar objetos
+    items = getattr(values, 'items', values)
+    if isinstance(items, range):
+        items = list(items)
+    try:
+        return numpy().array(items, dtype=numpy().float64)
+    except (TypeError, ValueError):
+        from minipar.interpreter_3000 import RuntimeError
+        raise RuntimeError("array() espera uma lista de números.")
+
+def zeros(n):
+    return numpy().zeros(_size(n))
+
+def dot(a, b) -> float:
+    if len(a) != len(b):
+        from minipar.interpreter_3000 import RuntimeError
+        raise RuntimeError(f"dot() entre arrays de tamanhos diferentes: {len(a)} e {len(b)}.")
+    return float(numpy().dot(a, b))
+
+# builtins que já existiam para number/list e ganham a versão para array
+def exp(x):
+    if is_array(x):
+        return numpy().exp(x)
+    return math.exp(x)
+
+def total(values):
+    if is_array(values):
+        return float(values.sum())
+    if hasattr(values, 'sum'):
+        # MiniList: soma direto sobre o armazenamento (fórmula fechada para o range)
+        return values.sum()
+    return sum(values)
+
+def random(n=None):
+    if n is None:
+        return py_random.random()
+    return numpy().random.random(_size(n))
@@ -2,189 +2,204 @@ from dataclasses import dataclass
 from typing import List, Tuple, Optional, Any
 
 class AST: 
-    pass
+    # 'ast_type' é preenchido pela análise semântica; sem valor até lá.
+    # 'line' (linha no fonte) é preenchido pelo parser nas instruções; como não é campo
+    # da dataclass, fica fora do repr, da comparação e do fingerprint incremental
+    __slots__ = ('ast_type', 'line')
 
-@dataclass
+@dataclass(slots=True)
 class Program(AST):
     classes: List['ClassDecl']
     stmts: List['Stmt']
 
-@dataclass
+@dataclass(slots=True)
 class ClassDecl(AST):
     name: str
     base: Optional[str]
     fields: List['VarDecl']
     methods: List['FuncDecl']
 
-@dataclass
+@dataclass(slots=True)
 class VarDecl(AST):
     name: str
     type_name: str
     init: Optional['Expr']
 
-@dataclass
+@dataclass(slots=True)
 class FuncDecl(AST):
     name: str
     params: List[VarDecl]
     ret_type: str
     body: 'Block'
 
-@dataclass
-class FieldAccess(AST):
+class CachedAccess(AST):
+    # 'inline_cache' é preenchido pelo interpretador: (layout, posição do campo ou
+    # FuncDecl do método) do último objeto visto neste ponto do programa. Uma tupla só,
+    # trocada de uma vez, então threads do 'par' nunca veem layout e valor misturados
+    __slots__ = ('inline_cache',)
+
+@dataclass(slots=True)
+class FieldAccess(CachedAccess):
     target: AST
     member_name: str
 
-@dataclass
-class MethodCall(AST):
+@dataclass(slots=True)
+class MethodCall(CachedAccess):
     target: AST 
     method_name: str
     args: List[AST]
 
 # Statements
-class Stmt(AST): pass
+class Stmt(AST):
+    __slots__ = ()
 
-@dataclass
+@dataclass(slots=True)
 class Block(Stmt):
     stmts: List[Stmt]
 
-@dataclass
+@dataclass(slots=True)
 class IfStmt(Stmt):
     cond: 'Expr'
     then_branch: Stmt
     else_branch: Optional[Stmt]
 
-@dataclass
+@dataclass(slots=True)
 class WhileStmt(Stmt):
     cond: 'Expr'
     body: Stmt
 
-@dataclass
+@dataclass(slots=True)
 class ForStmt(Stmt):
     decl: VarDecl 
     iterable: Any  
     body: Any
 
-@dataclass
+@dataclass(slots=True)
 class ExprStmt(Stmt):
     expr: 'Expr'
 
-@dataclass
+@dataclass(slots=True)
 class VarAssign(Stmt):
     target: 'Expr' 
     value: 'Expr'
 
-@dataclass
+@dataclass(slots=True)
 class VarDeclStmt(Stmt):
     decl: VarDecl
 
-@dataclass
+@dataclass(slots=True)
 class SeqBlock(Stmt):
     block: Block
 
-@dataclass
+@dataclass(slots=True)
 class ParBlock(Stmt):
     block: Block
 
-@dataclass
+@dataclass(slots=True)
 class SendStmt(Stmt):
     channel_expr: 'Expr'
     data_expr: 'Expr'
 
-@dataclass
+@dataclass(slots=True)
 class ReceiveStmt(Stmt):
     channel_expr: 'Expr'
     target: Optional[str] 
 
-@dataclass
+@dataclass(slots=True)
 class PrintStmt(Stmt):
     expressions: List['Expr']
 
-@dataclass
+@dataclass(slots=True)
 class ReturnStmt(Stmt): 
     expr: Optional['Expr']
 
-@dataclass
+@dataclass(slots=True)
 class BreakStmt(Stmt): 
     pass
 
-@dataclass
+@dataclass(slots=True)
 class ParStmt(Stmt):
     stmts: List[Any]
 
-@dataclass
+@dataclass(slots=True)
 class SeqStmt(Stmt):
     stmts: List[Any]
 
-@dataclass
+@dataclass(slots=True)
 class SendStmt(Stmt):
     channel: Any
     data: Any
 
-@dataclass
+@dataclass(slots=True)
+class ImportStmt(Stmt):
+    module: str
+
+@dataclass(slots=True)
 class CChannelClientStmt(Stmt): 
     name: str
     address: AST 
     port: AST
 
 # Expressoes
-class Expr(AST): pass
+class Expr(AST):
+    __slots__ = ()
 
-@dataclass
+@dataclass(slots=True)
 class Literal (Expr):
     value: object
 
-@dataclass
+@dataclass(slots=True)
 class DictLiteral(Expr):
     pairs: List[Tuple['Expr', 'Expr']] 
 
-@dataclass
+@dataclass(slots=True)
 class ListLiteral(Expr):
     elements: List['Expr']
     
-@dataclass
+@dataclass(slots=True)
 class IndexAccess(Expr):
     target: 'Expr'   
     index: 'Expr' 
 
-@dataclass
+@dataclass(slots=True)
 class PropertyAccess(Expr):
     target: Any          
     property_name: str   
 
-@dataclass
+@dataclass(slots=True)
 class VarRef(Expr):
     name: str
 
-@dataclass
+@dataclass(slots=True)
 class BinaryOp(Expr):
     left: Expr
     op: str
     right: Expr
 
-@dataclass
+@dataclass(slots=True)
 class UnaryOp(Expr):
     op: str
     expr: Expr
 
-@dataclass
+@dataclass(slots=True)
 class Call(Expr):
     callee: Expr
     args: List[Expr]
 
-@dataclass
+@dataclass(slots=True)
 class NewObj(Expr):
     class_name: str
 
-@dataclass
+@dataclass(slots=True)
 class AttrAccess(Expr):
     obj: Expr
     attr: str
 
-@dataclass
+@dataclass(slots=True)
 class ReceiveExpr(Expr):
     channel: Any
 
-@dataclass
+@dataclass(slots=True)
 class NewExpr(Expr):
     target_type: str
     args: List[Any]
@@ -0,0 +1,373 @@
+import argparse
+import io
+import json
+import sys
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+from minipar.ast_251018_215806 import (AST, Program, Block, VarRef, BinaryOp, IfStmt, WhileStmt, FuncDecl, VarDecl, Literal,
+                                       VarAssign, VarDeclStmt, Call, ReturnStmt, PrintStmt, BreakStmt, ExprStmt, Stmt)
+from minipar.interpreter_3000 import Interpreter, ASTVisitor, Environment
+from minipar.pipeline_3000 import Pipeline
+
+# Execução em lote: o mesmo programa rodando para N conjuntos de entradas (valores
+# iniciais de variáveis globais, ex. input_val e lr do neurônio) numa única passada
+# do interpretador. Cada variável number/bool vira um vetor do NumPy com uma posição
+# ("pista") por execução; if e while divergentes são tratados com máscaras das pistas
+# ativas, e break/return tiram pistas da máscara até o fim do laço/da chamada.
+# A saída de cada execução é idêntica à do Interpreter. Programas com recursos fora do
+# subconjunto suportado (strings fora do print, listas, dicts, builtins, par, canais,
+# imports), entradas de tipos mistos, estouro de int64 ou divisão por zero voltam para
+# uma execução do Interpreter por conjunto de entradas.
+
+class BatchUnsupported(Exception): pass
+
+@dataclass
+class BatchResult:
+    outputs: List[str]
+    errors: List[Optional[str]]
+    mode: str                              # 'batch' ou 'fallback'
+    reason: Optional[str] = None           # por que voltou para execuções individuais
+    lanes: int = field(init=False)
+
+    def __post_init__(self):
+        self.lanes = len(self.outputs)
+
+SUPPORTED_NODES = (Program, Block, VarRef, BinaryOp, IfStmt, WhileStmt, FuncDecl, VarDecl, Literal, VarAssign,
+                   VarDeclStmt, Call, ReturnStmt, PrintStmt, BreakStmt, ExprStmt)
+INT64_LIMIT = 2 ** 62                      # margem para detectar estouro antes do int64
+
+def check_supported(program: Program):
+    # verificação estática do subconjunto; o resto é detectado durante a execução
+    functions = {stmt.name for stmt in _walk(program) if isinstance(stmt, FuncDecl)}
+    for node in _walk(program):
+        if not isinstance(node, SUPPORTED_NODES):
+            raise BatchUnsupported(f"{type(node).__name__} não é suportado em lote")
+        if isinstance(node, Call) and getattr(node.callee, 'name', None) not in functions:
+            raise BatchUnsupported(f"chamada de '{getattr(node.callee, 'name', '?')}' não é suportada em lote")
+        if isinstance(node, VarDeclStmt) and node.decl.type_name not in ('number', 'bool'):
+            raise BatchUnsupported(f"variável do tipo '{node.decl.type_name}' não é suportada em lote")
+    if program.classes:
+        raise BatchUnsupported("classes não são suportadas em lote")
+
+def _walk(node: Any):
+    stack = [node]
+    while stack:
+        current = stack.pop()
+        if isinstance(current, AST):
+            yield current
+            stack.extend(getattr(current, name) for name in current.__dataclass_fields__)
+        elif isinstance(current, (list, tuple)):
+            stack.extend(current)
+
+class SeededInterpreter(Interpreter):
+    # Interpreter em que as declarações globais com nome em 'inputs' usam o valor dado
+    # no lugar do inicializador (modo individual e referência do modo em lote)
+    def __init__(self, *args, inputs: Optional[Dict[str, Any]] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.inputs = inputs or {}
+
+    def visit_VarDeclStmt(self, node: VarDeclStmt):
+        if self.env is self.global_env and node.decl.name in self.inputs:
+            self.env.define(node.decl.name, self.inputs[node.decl.name])
+        else:
+            super().visit_VarDeclStmt(node)
+
+class BatchInterpreter(ASTVisitor):
+    def __init__(self, np, lanes: int, inputs: Dict[str, Any]):
+        self.np = np
+        self.lanes = lanes
+        self.inputs = inputs
+        self.global_env = Environment()
+        self.env = self.global_env
+        self.functions: Dict[str, FuncDecl] = {}
+        self.outputs: List[List[str]] = [[] for _ in range(lanes)]
+        self.broken = np.zeros(lanes, dtype=bool)      # pistas que deram break no laço atual
+        self.returned = np.zeros(lanes, dtype=bool)    # pistas que retornaram da chamada atual
+        self.return_value = None
+
+    def interpret(self, program: Program):
+        everyone = self.np.ones(self.lanes, dtype=bool)
+        for stmt in program.stmts:
+            if isinstance(stmt, FuncDecl):
+                self.execute(stmt, everyone)
+        for stmt in program.stmts:
+            if not isinstance(stmt, FuncDecl):
+                self.execute(stmt, everyone)
+
+    def lane_array(self, value):
+        np = self.np
+        if isinstance(value, np.ndarray):
+            return value
+        if isinstance(value, bool):
+            return np.full(self.lanes, value, dtype=bool)
+        if isinstance(value, int):
+            if abs(value) >= INT64_LIMIT:
+                raise BatchUnsupported("inteiro grande demais para int64")
+            return np.full(self.lanes, value, dtype=np.int64)
+        if isinstance(value, float):
+            return np.full(self.lanes, value, dtype=np.float64)
+        raise BatchUnsupported(f"valor do tipo {type(value).__name__} não é suportado em lote")
+
+    def merge(self, mask, new, old):
+        # atribuição só nas pistas ativas; com máscara parcial o tipo não pode mudar,
+        # senão pistas com int passariam a imprimir como float
+        new = self.lane_array(new)
+        if old is None or mask.all():
+            return new
+        if new.dtype != old.dtype:
+            raise BatchUnsupported("o tipo de uma variável diverge entre as execuções")
+        return self.np.where(mask, new, old)
+
+    # instruções: executam só nas pistas de 'mask'
+    def execute(self, node: Stmt, mask):
+        return getattr(self, f'exec_{type(node).__name__}')(node, mask)
+
+    def exec_Block(self, node: Block, mask):
+        self.env = self.env.enter_scope()
+        try:
+            for stmt in node.stmts:
+                active = mask & ~self.broken & ~self.returned
+                if not active.any():
+                    break
+                self.execute(stmt, active)
+        finally:
+            self.env = self.env.exit_scope()
+
+    def exec_FuncDecl(self, node: FuncDecl, mask):
+        self.functions[node.name] = node
+        self.env.define(node.name, node)
+
+    def exec_VarDeclStmt(self, node: VarDeclStmt, mask):
+        decl = node.decl
+        if self.env is self.global_env and decl.name in self.inputs:
+            value = self.inputs[decl.name]
+        elif decl.init is not None:
+            value = self.evaluate(decl.init, mask)
+        else:
+            value = 0 if decl.type_name == 'number' else False
+        self.env.define(decl.name, self.lane_array(value))
+
+    def exec_VarAssign(self, node: VarAssign, mask):
+        name = node.target.name
+        value = self.evaluate(node.value, mask)
+        self.env.assign(name, self.merge(mask, value, self.env.lookup(name)))
+
+    def exec_ExprStmt(self, node: ExprStmt, mask):
+        self.evaluate(node.expr, mask)
+
+    def exec_PrintStmt(self, node: PrintStmt, mask):
+        lanes = self.np.flatnonzero(mask)
+        columns = []
+        for expr in node.expressions:
+            value = self.evaluate(expr, mask)
+            # str() dos escalares do Python, igual ao print do Interpreter
+            if isinstance(value, self.np.ndarray):
+                columns.append(list(map(str, value[lanes].tolist())))
+            else:
+                columns.append([str(value)] * len(lanes))
+        outputs = self.outputs
+        for lane, parts in zip(lanes.tolist(), zip(*columns)):
+            outputs[lane].append(f"{' '.join(parts)}\n")
+
+    def exec_IfStmt(self, node: IfStmt, mask):
+        cond = self.condition(node.cond, mask)
+        then_mask = mask & cond
+        if then_mask.any():
+            self.execute(node.then_branch, then_mask)
+        if node.else_branch is not None:
+            else_mask = mask & ~cond & ~self.returned & ~self.broken
+            if else_mask.any():
+                self.execute(node.else_branch, else_mask)
+
+    def exec_WhileStmt(self, node: WhileStmt, mask):
+        outer_broken = self.broken
+        self.broken = self.np.zeros(self.lanes, dtype=bool)
+        try:
+            active = mask.copy()
+            while True:
+                active &= ~self.broken & ~self.returned
+                if not active.any():
+                    break
+                active &= self.condition(node.cond, active)
+                if not active.any():
+                    break
+                self.execute(node.body, active)
+        finally:
+            self.broken = outer_broken
+
+    def exec_BreakStmt(self, node: BreakStmt, mask):
+        self.broken = self.broken | mask
+
+    def exec_ReturnStmt(self, node: ReturnStmt, mask):
+        if node.expr is None:
+            raise BatchUnsupported("return sem valor não é suportado em lote")
+        value = self.evaluate(node.expr, mask)
+        self.return_value = self.merge(mask, value, self.return_value)
+        self.returned = self.returned | mask
+
+    # expressões: calculadas em todas as pistas; verificações (divisão por zero, estouro)
+    # só olham as pistas ativas, as demais são descartadas pelo merge
+    def evaluate(self, node: AST, mask):
+        return getattr(self, f'eval_{type(node).__name__}')(node, mask)
+
+    def condition(self, node: AST, mask):
+        value = self.evaluate(node, mask)
+        if isinstance(value, self.np.ndarray):
+            if value.dtype != bool:
+                raise BatchUnsupported("condição não booleana")
+            return value
+        return self.np.full(self.lanes, bool(value), dtype=bool)
+
+    def eval_Literal(self, node: Literal, mask):
+        return node.value
+
+    def eval_VarRef(self, node: VarRef, mask):
+        return self.env.lookup(node.name)
+
+    def eval_BinaryOp(self, node: BinaryOp, mask):
+        np = self.np
+        left = self.evaluate(node.left, mask)
+        right = self.evaluate(node.right, mask)
+        if isinstance(left, str) or isinstance(right, str):
+            raise BatchUnsupported("operação com string não é suportada em lote")
+        op = node.op
+        with np.errstate(all='ignore'):
+            if op in ('+', '-', '*'):
+                result = {'+': np.add, '-': np.subtract, '*': np.multiply}[op](left, right)
+                self.check_overflow(result, left, right, op, mask)
+                return result
+            if op == '/':
+                divisor = self.lane_array(right)
+                if (mask & (divisor == 0)).any():
+                    raise BatchUnsupported("divisão por zero")
+                # mesma regra do Interpreter: esquerda int e direita number -> divisão inteira
+                if self.dtype_kind(left) == 'i' and self.dtype_kind(right) in 'if':
+                    return np.floor_divide(left, right)
+                return np.true_divide(left, right)
+            if op in ('==', '!=', '<', '>', '<=', '>='):
+                return {'==': np.equal, '!=': np.not_equal, '<': np.less, '>': np.greater,
+                        '<=': np.less_equal, '>=': np.greater_equal}[op](left, right)
+            if op in ('&&', '||'):
+                if self.dtype_kind(left) != 'b' or self.dtype_kind(right) != 'b':
+                    raise BatchUnsupported("&& e || só com bool em lote")
+                return (np.logical_and if op == '&&' else np.logical_or)(left, right)
+        raise BatchUnsupported(f"operador '{op}' não é suportado em lote")
+
+    def dtype_kind(self, value) -> str:
+        if isinstance(value, self.np.ndarray):
+            return value.dtype.kind
+        if isinstance(value, bool):
+            return 'b'
+        return 'i' if isinstance(value, int) else 'f'
+
+    def check_overflow(self, result, left, right, op, mask):
+        # int do Python não estoura; int64 sim: refaz a conta em float e compara a magnitude
+        if self.dtype_kind(result) != 'i':
+            return
+        np = self.np
+        approx = {'+': np.add, '-': np.subtract, '*': np.multiply}[op](
+            np.asarray(left, dtype=np.float64), np.asarray(right, dtype=np.float64))
+        if (mask & (np.abs(approx) >= INT64_LIMIT)).any():
+            raise BatchUnsupported("estouro de int64")
+
+    def eval_Call(self, node: Call, mask):
+        func_decl = self.functions.get(node.callee.name)
+        if func_decl is None:
+            raise BatchUnsupported(f"função '{node.callee.name}' não suportada em lote")
+        args = [self.lane_array(self.evaluate(arg, mask)) for arg in node.args]
+        outer = (self.env, self.returned, self.broken, self.return_value)
+        self.env = self.env.enter_scope()
+        self.returned = self.np.zeros(self.lanes, dtype=bool)
+        self.broken = self.np.zeros(self.lanes, dtype=bool)
+        self.return_value = None
+        try:
+            for param, value in zip(func_decl.params, args):
+                self.env.define(param.name, value)
+            self.execute(func_decl.body, mask)
+            if not (self.returned | ~mask).all():
+                # no Interpreter a chamada valeria None nessas pistas
+                raise BatchUnsupported("função terminou sem return em alguma execução")
+            return self.return_value
+        finally:
+            self.env, self.returned, self.broken, self.return_value = outer
+
+def _load_numpy():
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+def _input_types_uniform(inputs: List[Dict[str, Any]]) -> bool:
+    names = set(inputs[0])
+    for name in names:
+        kinds = {type(run.get(name)) for run in inputs}
+        if len(kinds) != 1 or kinds.pop() not in (int, float, bool):
+            return False
+    return all(set(run) == names for run in inputs)
+
+def run_individually(program: Program, inputs: List[Dict[str, Any]], reason: Optional[str] = None) -> BatchResult:
+    outputs, errors = [], []
+    for values in inputs:
+        output = io.StringIO()
+        interpreter = SeededInterpreter(output=output, inputs=values)
+        error = None
+        try:
+            interpreter.interpret(program)
+        except Exception as e:
+            error = str(e)
+        outputs.append(output.getvalue())
+        errors.append(error)
+    return BatchResult(outputs, errors, "fallback", reason)
+
+def run_batch(program: Program, inputs: List[Dict[str, Any]]) -> BatchResult:
+    # 'program' já validado pela análise semântica
+    if not inputs:
+        return BatchResult([], [], "batch")
+    np = _load_numpy()
+    if np is None:
+        return run_individually(program, inputs, "NumPy não instalado")
+    if not _input_types_uniform(inputs):
+        return run_individually(program, inputs, "entradas com nomes ou tipos diferentes entre as execuções")
+    try:
+        check_supported(program)
+        lanes = len(inputs)
+        columns = {name: np.array([run[name] for run in inputs]) for name in inputs[0]}
+        for name, column in columns.items():
+            if column.dtype.kind not in 'bif' or (column.dtype.kind == 'i' and (np.abs(column) >= INT64_LIMIT).any()):
+                raise BatchUnsupported(f"valores de '{name}' não cabem em int64")
+        interpreter = BatchInterpreter(np, lanes, columns)
+        interpreter.interpret(program)
+    except BatchUnsupported as e:
+        return run_individually(program, inputs, str(e))
+    except RecursionError:
+        return run_individually(program, inputs, "recursão profunda demais para o modo em lote")
+    return BatchResult(["".join(lines) for lines in interpreter.outputs], [None] * lanes, "batch")
+
+def main():
+    parser = argparse.ArgumentParser(prog="batch_3000", description="Executa um programa minipar para vários conjuntos de entradas de uma vez.")
+    parser.add_argument("input_file", metavar="arquivo.minipar")
+    parser.add_argument("--inputs", required=True, metavar="ARQUIVO.json",
+                        help="lista JSON de objetos {variável global: valor inicial}, um por execução")
+    parser.add_argument("--individual", action="store_true", help="força uma execução do Interpreter por conjunto")
+    args = parser.parse_args()
+    with open(args.input_file, encoding="utf-8") as f:
+        code = f.read()
+    with open(args.inputs, encoding="utf-8") as f:
+        inputs = json.load(f)
+    compiled = Pipeline().run(code, stop_after="semantic")
+    if not compiled.ok:
+        print(f"Erro ({compiled.phase}): {compiled.error}", file=sys.stderr)
+        sys.exit(1)
+    if args.individual:
+        result = run_individually(compiled.ast, inputs)
+    else:
+        result = run_batch(compiled.ast, inputs)
+    for index, (output, error) in enumerate(zip(result.outputs, result.errors)):
+        print(json.dumps({"index": index, "output": output, "error": error}, ensure_ascii=False))
+    reason = f" ({result.reason})" if result.reason else ""
+    print(f"{result.lanes} execuções, modo {result.mode}{reason}", file=sys.stderr)
+    sys.exit(1 if any(result.errors) else 0)
+
+if __name__ == "__main__":
+    main()
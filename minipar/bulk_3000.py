@@ -0,0 +1,108 @@
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional
+from minipar.pipeline_3000 import Pipeline
+from minipar.cache_3000 import ProgramCache, cache_enabled
+from minipar.modules_3000 import MODULE_EXTENSION, ModuleLoader
+
+# estado por processo do pool, criado pelo initializer
+_cache: Optional[ProgramCache] = None
+_module_loader: Optional[ModuleLoader] = None
+
+def _init_worker(use_cache: bool, cache_dir: Optional[str]):
+    global _cache, _module_loader
+    _cache = ProgramCache(cache_dir) if use_cache else None
+    _module_loader = ModuleLoader(cache_dir=cache_dir, use_disk_cache=use_cache)
+
+def iter_sources(root: str, extension: str = MODULE_EXTENSION) -> List[str]:
+    paths = []
+    for directory, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames if not d.startswith("."))
+        for name in sorted(filenames):
+            if name.endswith(extension):
+                paths.append(os.path.join(directory, name))
+    return paths
+
+def check_file(path: str) -> Dict[str, Any]:
+    # léxico, sintaxe e semântica de um arquivo; programas já validados (mesmo fonte e
+    # imports inalterados) vêm do cache em disco sem rodar nenhuma fase
+    result: Dict[str, Any] = {"path": path, "ok": True, "cached": False, "error": None, "phase": None, "timings": {}}
+    start = time.perf_counter()
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            code = f.read()
+    except (OSError, UnicodeDecodeError) as e:
+        result.update(ok=False, error=str(e), phase="read")
+        return result
+    result["timings"]["read"] = time.perf_counter() - start
+    pipeline = Pipeline(module_loader=_module_loader, base_dir=os.path.dirname(os.path.abspath(path)), cache=_cache)
+    checked = pipeline.run(code, stop_after="semantic")
+    result["timings"].update(checked.timings)
+    result.update(ok=checked.ok, cached=checked.cached, error=checked.error, phase=checked.phase)
+    return result
+
+def check_paths(paths: List[str], workers: Optional[int] = None, use_cache: Optional[bool] = None,
+                cache_dir: Optional[str] = None) -> List[Dict[str, Any]]:
+    if use_cache is None:
+        use_cache = cache_enabled()
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(paths) < 2:
+        _init_worker(use_cache, cache_dir)
+        return [check_file(path) for path in paths]
+    # lotes grandes o bastante para diluir o custo de IPC, pequenos o bastante para
+    # equilibrar arquivos de tamanhos muito diferentes entre os processos
+    chunksize = max(1, min(64, len(paths) // (workers * 8)))
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(use_cache, cache_dir)) as executor:
+        return list(executor.map(check_file, paths, chunksize=chunksize))
+
+def summarize(root: str, results: List[Dict[str, Any]], wall_time: float, workers: int) -> Dict[str, Any]:
+    phase_totals: Dict[str, float] = {}
+    for result in results:
+        for phase, seconds in result["timings"].items():
+            phase_totals[phase] = phase_totals.get(phase, 0.0) + seconds
+    failed = [r for r in results if not r["ok"]]
+    return {
+        "root": root,
+        "workers": workers,
+        "files": len(results),
+        "ok": len(results) - len(failed),
+        "failed": len(failed),
+        "cached": sum(1 for r in results if r["cached"]),
+        "wall_time": wall_time,
+        "phase_totals": phase_totals,
+        "results": results,
+    }
+
+def check_directory(root: str, workers: Optional[int] = None, use_cache: Optional[bool] = None,
+                    cache_dir: Optional[str] = None) -> Dict[str, Any]:
+    workers = workers or os.cpu_count() or 1
+    start = time.perf_counter()
+    results = check_paths(iter_sources(root), workers, use_cache, cache_dir)
+    return summarize(root, results, time.perf_counter() - start, workers)
+
+def main():
+    parser = argparse.ArgumentParser(prog="bulk_3000", description="Valida (léxico, sintaxe e semântica) todos os programas .minipar de um diretório.")
+    parser.add_argument("directory")
+    parser.add_argument("--workers", type=int, default=None, help="processos em paralelo (padrão: número de CPUs)")
+    parser.add_argument("--no-cache", action="store_true", help="ignora o cache em disco")
+    parser.add_argument("--output", default=None, help="grava o resumo JSON neste arquivo em vez da saída padrão")
+    args = parser.parse_args()
+    if not os.path.isdir(args.directory):
+        print(f"Erro: '{args.directory}' não é um diretório.", file=sys.stderr)
+        sys.exit(2)
+    summary = check_directory(args.directory, args.workers, use_cache=False if args.no_cache else None)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(summary, f, ensure_ascii=False, indent=2)
+    else:
+        json.dump(summary, sys.stdout, ensure_ascii=False, indent=2)
+        print()
+    print(f"{summary['files']} arquivos, {summary['failed']} com erro, {summary['cached']} do cache, {summary['wall_time']:.2f}s", file=sys.stderr)
+    sys.exit(1 if summary["failed"] else 0)
+
+if __name__ == "__main__":
+    main()
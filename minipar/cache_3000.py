@@ -0,0 +1,289 @@
+import hashlib
+import marshal
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from minipar.ast_251018_215806 import Program
+from minipar.arena_3000 import ASTArena, ArenaFormatError
+
+# Muda sempre que lexer, parser, AST ou análise semântica mudarem de forma que
+# programas já validados possam ter outro resultado; invalida todo o cache.
+COMPILER_VERSION = "minipar-3000.7"
+
+CACHE_MAGIC = b"MPC1"
+CACHE_SUFFIX = ".mpc"
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+STALE_TMP_SECONDS = 3600
+RESCAN_DIVISOR = 16
+
+def default_cache_dir() -> str:
+    env_dir = os.environ.get("MINIPAR_CACHE_DIR")
+    if env_dir:
+        return env_dir
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "minipar")
+
+def cache_enabled() -> bool:
+    return os.environ.get("MINIPAR_NO_CACHE", "") in ("", "0")
+
+def module_search_path() -> List[str]:
+    env_path = os.environ.get("MINIPAR_PATH", "")
+    return [p for p in env_path.split(os.pathsep) if p]
+
+def import_context(base_dir: Optional[str], search_path: Optional[List[str]] = None) -> str:
+    # 'import' procura no diretório do programa e depois no caminho de busca: o mesmo
+    # fonte rodado de outro diretório (ou com outro MINIPAR_PATH) pode importar outro
+    # módulo, então esse ambiente entra na chave de um programa validado
+    if search_path is None:
+        search_path = module_search_path()
+    return os.pathsep.join(os.path.abspath(d) for d in [base_dir or os.getcwd(), *search_path])
+
+def source_key(source: str, version: str = COMPILER_VERSION, context: str = "") -> str:
+    digest = hashlib.sha256(version.encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(context.encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(source.encode("utf-8"))
+    return digest.hexdigest()
+
+def file_stamp(path: str) -> Tuple[str, int, int]:
+    st = os.stat(path)
+    return (os.path.abspath(path), st.st_mtime_ns, st.st_size)
+
+def stamps_valid(stamps) -> bool:
+    for path, mtime_ns, size in stamps:
+        try:
+            if file_stamp(path) != (path, mtime_ns, size):
+                return False
+        except OSError:
+            return False
+    return True
+
+def atomic_write(directory: str, path: str, data: bytes):
+    # escreve num temporário do mesmo diretório e troca com os.replace: leitores
+    # concorrentes veem o arquivo antigo ou o novo, nunca um parcial. Sem fsync: depois
+    # de uma queda o arquivo pode estar truncado, mas o checksum o rejeita na leitura
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-", suffix=CACHE_SUFFIX)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+class ProgramCache:
+    # Cache em disco de programas já validados pela análise semântica.
+    # Formato do arquivo: MAGIC | sha256(payload) | versão\0 | payload, com payload =
+    # marshal((carimbos dos módulos importados, ASTArena.to_bytes())).
+    # Escrita atômica (arquivo temporário + os.replace), então execuções concorrentes
+    # nunca leem um arquivo parcial; o diretório é limitado a max_bytes, removendo
+    # primeiro as entradas usadas há mais tempo (mtime é atualizado a cada acerto).
+    def __init__(self, directory: Optional[str] = None, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.directory = directory or default_cache_dir()
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        # estimativa do tamanho do diretório: evita listar o diretório inteiro a cada
+        # gravação. Outros processos (workers do bulk_3000, daemon) gravam no mesmo
+        # diretório sem passar por aqui, então ela é recalculada (por evict) quando passa
+        # do limite e também a cada max_bytes / RESCAN_DIVISOR bytes gravados por este
+        # processo: com N processos o diretório passa do limite em no máximo
+        # N * max_bytes / RESCAN_DIVISOR
+        self._size_estimate: Optional[int] = None
+        self._written_since_scan = 0
+
+    def path_for(self, key: str) -> str:
+        return os.path.join(self.directory, key + CACHE_SUFFIX)
+
+    def load_bytes(self, key: str) -> Optional[bytes]:
+        path = self.path_for(key)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except OSError:
+            return None
+        header_len = len(CACHE_MAGIC) + 32
+        version_end = data.find(b"\0", header_len)
+        if not data.startswith(CACHE_MAGIC) or version_end < 0:
+            self._discard(path)
+            return None
+        checksum = data[len(CACHE_MAGIC):header_len]
+        version = data[header_len:version_end].decode("utf-8", "replace")
+        payload = data[version_end + 1:]
+        if version != COMPILER_VERSION or hashlib.sha256(payload).digest() != checksum:
+            self._discard(path)
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return payload
+
+    def store_bytes(self, key: str, payload: bytes):
+        data = CACHE_MAGIC + hashlib.sha256(payload).digest() + COMPILER_VERSION.encode("utf-8") + b"\0" + payload
+        atomic_write(self.directory, self.path_for(key), data)
+        self.track_write(len(data))
+
+    def track_write(self, nbytes: int):
+        # chamado depois de gravar um arquivo no diretório do cache; remove os mais
+        # antigos quando o total estimado passa de max_bytes
+        if self._size_estimate is None:
+            self._size_estimate = self.size()
+        else:
+            self._size_estimate += nbytes
+        self._written_since_scan += nbytes
+        if self._size_estimate > self.max_bytes or self._written_since_scan * RESCAN_DIVISOR >= self.max_bytes:
+            self.evict()
+
+    def get(self, source: str, context: str = "") -> Optional[Tuple[Program, list]]:
+        # (programa, carimbos dos módulos importados) ou None; context vem de import_context
+        key = source_key(source, context=context)
+        payload = self.load_bytes(key)
+        if payload is None:
+            self.misses += 1
+            return None
+        try:
+            dependencies, arena_bytes = marshal.loads(payload)
+            if not stamps_valid(dependencies):
+                # um módulo importado mudou desde a validação
+                self.misses += 1
+                return None
+            program = ASTArena.from_bytes(arena_bytes).to_ast()
+        except (ArenaFormatError, EOFError, ValueError, TypeError):
+            self._discard(self.path_for(key))
+            self.misses += 1
+            return None
+        self.hits += 1
+        return program, [tuple(stamp) for stamp in dependencies]
+
+    def put(self, source: str, program: Program, dependencies=(), context: str = ""):
+        # dependencies: carimbos (caminho, mtime_ns, tamanho) dos módulos importados
+        payload = marshal.dumps((list(dependencies), ASTArena.from_ast(program).to_bytes()))
+        self.store_bytes(source_key(source, context=context), payload)
+
+    def invalidate(self, source: str, context: str = ""):
+        self._discard(self.path_for(source_key(source, context=context)))
+
+    def entries(self) -> List[Tuple[str, int, float]]:
+        result = []
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return result
+        now = time.time()
+        for name in names:
+            path = os.path.join(self.directory, name)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            if name.startswith(".tmp-"):
+                # temporários órfãos de processos que morreram no meio da escrita
+                if now - st.st_mtime > STALE_TMP_SECONDS:
+                    self._discard(path)
+                continue
+            if name.endswith(CACHE_SUFFIX):
+                result.append((path, st.st_size, st.st_mtime))
+        return result
+
+    def size(self) -> int:
+        return sum(size for _, size, _ in self.entries())
+
+    def evict(self):
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        self._size_estimate = total
+        self._written_since_scan = 0
+        if total <= self.max_bytes:
+            return
+        entries.sort(key=lambda entry: entry[2])
+        for path, size, _ in entries:
+            if total <= self.max_bytes:
+                break
+            self._discard(path)
+            total -= size
+        self._size_estimate = total
+
+    def clear(self):
+        for path, _, _ in self.entries():
+            self._discard(path)
+
+    def _discard(self, path: str):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+class MemoryProgramCache:
+    # LRU em memória, limitado por número de entradas e por bytes aproximados,
+    # para servidores que recebem os mesmos programas repetidamente. Os valores são
+    # tratados como imutáveis depois de inseridos e podem ser compartilhados entre threads.
+    def __init__(self, max_entries: int = 256, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.bytes = 0
+        self._entries: "OrderedDict[str, Tuple[Any, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, source: str, context: str = "") -> Optional[Any]:
+        key = source_key(source, context=context)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, source: str, value: Any, size: int, context: str = ""):
+        key = source_key(source, context=context)
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.bytes -= old[1]
+            self._entries[key] = (value, size)
+            self.bytes += size
+            while self._entries and (len(self._entries) > self.max_entries or self.bytes > self.max_bytes):
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.bytes -= evicted_size
+                self.evictions += 1
+
+    def get_or_compile(self, source: str, compile_fn: Callable[[str], Tuple[Any, int]], context: str = "") -> Any:
+        # compile_fn devolve (valor, tamanho em bytes); roda fora do lock, então duas
+        # requisições simultâneas do mesmo código podem compilar em duplicidade
+        value = self.get(source, context)
+        if value is None:
+            value, size = compile_fn(source)
+            self.put(source, value, size, context)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "bytes": self.bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
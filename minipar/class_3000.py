@@ -0,0 +1,136 @@
+import sys
+from typing import Any, Callable, Dict, List, Optional
+from minipar.ast_251018_215806 import ClassDecl, Literal
+
+# Classes do minipar. Cada ClassDecl, com a cadeia de 'extends', vira um ClassLayout com
+# a posição fixa de cada campo: primeiro os da base, na ordem de declaração, depois os
+# novos da subclasse (redeclarar um campo da base reaproveita a posição dele). Uma
+# instância guarda só o layout e uma list com um valor por posição, sem dict por objeto.
+# A tabela de métodos já vem achatada: os da base entram na da subclasse, que pode
+# sobrescrevê-los, então achar um método não depende da profundidade da herança.
+
+# método chamado pelo 'new Classe(args)', se a classe (ou uma base) o declarar
+CONSTRUCTOR = "init"
+
+class ClassLayoutError(Exception):
+    pass
+
+def field_default(type_name: str) -> Any:
+    # mesmo valor inicial de uma variável declarada sem inicialização
+    if type_name == 'number':
+        return 0
+    if type_name == 'bool':
+        return False
+    return None
+
+class ClassLayout:
+    __slots__ = ('name', 'base', 'fields', 'slots', 'field_types', 'methods', 'template', 'initializers', 'module')
+
+    def __init__(self, decl: ClassDecl, base: Optional['ClassLayout']):
+        self.name = decl.name
+        self.base = base
+        # ModuleScope do módulo que declarou a classe (None: programa principal); os
+        # métodos e inicializações de campo rodam com as globais e funções dele
+        self.module = None
+        self.fields: List[str] = list(base.fields) if base else []
+        self.field_types: Dict[str, str] = dict(base.field_types) if base else {}
+        self.methods: Dict[str, Any] = dict(base.methods) if base else {}
+        # valores iniciais constantes, copiados a cada 'new'; as inicializações que não
+        # são literais ficam em (posição, expressão) e são avaliadas na criação
+        self.template: List[Any] = list(base.template) if base else []
+        self.initializers = list(base.initializers) if base else []
+        declared = set()
+        for field in decl.fields:
+            if field.name in declared:
+                raise ClassLayoutError(f"Campo '{field.name}' declarado mais de uma vez na classe '{decl.name}'.")
+            declared.add(field.name)
+            inherited = self.field_types.get(field.name)
+            if inherited is not None and inherited != field.type_name:
+                raise ClassLayoutError(f"Campo '{field.name}' da classe '{decl.name}' redeclarado como {field.type_name}, mas é {inherited} na classe base.")
+            if inherited is None:
+                self.fields.append(field.name)
+                self.template.append(None)
+                self.field_types[field.name] = field.type_name
+            slot = self.fields.index(field.name)
+            self.initializers = [(s, expr) for s, expr in self.initializers if s != slot]
+            if isinstance(field.init, Literal):
+                self.template[slot] = field.init.value
+            else:
+                self.template[slot] = field_default(field.type_name)
+                if field.init is not None:
+                    self.initializers.append((slot, field.init))
+        self.slots: Dict[str, int] = {name: slot for slot, name in enumerate(self.fields)}
+        own_methods = set()
+        for method in decl.methods:
+            if method.name in own_methods:
+                raise ClassLayoutError(f"Método '{method.name}' declarado mais de uma vez na classe '{decl.name}'.")
+            own_methods.add(method.name)
+            self.methods[method.name] = method
+
+    def is_subclass_of(self, name: str) -> bool:
+        layout = self
+        while layout is not None:
+            if layout.name == name:
+                return True
+            layout = layout.base
+        return False
+
+class Instance:
+    __slots__ = ('layout', 'values')
+
+    def __init__(self, layout: ClassLayout):
+        self.layout = layout
+        self.values = list(layout.template)
+
+    def __str__(self) -> str:
+        fields = ", ".join(f"{name}={value}" for name, value in zip(self.layout.fields, self.values))
+        return f"{self.layout.name}({fields})"
+
+    __repr__ = __str__
+
+    def __sizeof__(self) -> int:
+        return object.__sizeof__(self) + sys.getsizeof(self.values)
+
+def build_layouts(classes: List[ClassDecl], on_error: Optional[Callable[[str], None]] = None) -> Dict[str, ClassLayout]:
+    # layouts de todas as classes, bases antes das subclasses (a ordem no fonte não
+    # importa). Sem on_error o primeiro erro é levantado; com ele, a classe com erro
+    # (e as que herdam dela) fica de fora e as demais seguem.
+    decls: Dict[str, ClassDecl] = {}
+    layouts: Dict[str, ClassLayout] = {}
+    failed = set()
+
+    def fail(message: str):
+        if on_error is None:
+            raise ClassLayoutError(message)
+        on_error(message)
+
+    for decl in classes:
+        if decl.name in decls:
+            fail(f"Classe '{decl.name}' declarada mais de uma vez.")
+        decls[decl.name] = decl
+
+    def build(name: str, chain: tuple) -> Optional[ClassLayout]:
+        if name in layouts or name in failed:
+            return layouts.get(name)
+        decl = decls[name]
+        base = None
+        if decl.base is not None:
+            if decl.base not in decls:
+                fail(f"Classe base '{decl.base}' de '{name}' não declarada.")
+            elif decl.base in chain:
+                fail(f"Herança circular entre as classes {' -> '.join(chain + (name, decl.base))}.")
+            else:
+                base = build(decl.base, chain + (name,))
+            if base is None:
+                failed.add(name)
+                return None
+        try:
+            layouts[name] = ClassLayout(decl, base)
+        except ClassLayoutError as e:
+            failed.add(name)
+            fail(str(e))
+        return layouts.get(name)
+
+    for name in decls:
+        build(name, ())
+    return layouts
@@ -0,0 +1,70 @@
+import argparse
+import json
+import os
+import socket
+import struct
+import sys
+
+# Cliente do daemon_3000. Só usa a biblioteca padrão e não importa o minipar, para
+# que a partida seja o mais barata possível; o protocolo está descrito em daemon_3000.
+FRAME_HEADER = struct.Struct(">cI")
+FRAME_OUTPUT = b"O"
+FRAME_EXIT = b"X"
+
+def default_socket_path() -> str:
+    env_path = os.environ.get("MINIPAR_DAEMON_SOCKET")
+    if env_path:
+        return env_path
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir:
+        return os.path.join(runtime_dir, "minipar.sock")
+    return os.path.join("/tmp", f"minipar-{os.getuid()}.sock")
+
+def read_exact(sock, size: int) -> bytes:
+    chunks = []
+    while size:
+        chunk = sock.recv(size)
+        if not chunk:
+            raise EOFError
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b"".join(chunks)
+
+def run(path: str, socket_path: str, stdin=None, max_steps=None, max_memory=None, out=None) -> int:
+    out = out or sys.stdout
+    request = {"path": os.path.abspath(path), "stdin": stdin, "max_steps": max_steps, "max_memory": max_memory}
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(socket_path)
+        sock.sendall(json.dumps(request).encode("utf-8") + b"\n")
+        while True:
+            kind, length = FRAME_HEADER.unpack(read_exact(sock, FRAME_HEADER.size))
+            data = read_exact(sock, length)
+            if kind == FRAME_OUTPUT:
+                out.write(data.decode("utf-8"))
+                out.flush()
+            elif kind == FRAME_EXIT:
+                return int(data)
+
+def main():
+    parser = argparse.ArgumentParser(prog="client_3000", description="Executa um programa minipar no daemon_3000.")
+    parser.add_argument("input_file", metavar="arquivo.minipar")
+    parser.add_argument("--socket", default=default_socket_path(), help="caminho do socket UNIX do daemon")
+    parser.add_argument("--stdin", action="store_true", help="envia a entrada padrão para o input() do programa")
+    parser.add_argument("--max-steps", type=int, default=None)
+    parser.add_argument("--max-memory", type=int, default=None)
+    args = parser.parse_args()
+    stdin = sys.stdin.read() if args.stdin else None
+    try:
+        status = run(args.input_file, args.socket, stdin, args.max_steps, args.max_memory)
+    except (FileNotFoundError, ConnectionRefusedError):
+        print(f"Erro: daemon do minipar não encontrado em {args.socket} (inicie com python -m minipar.daemon_3000).", file=sys.stderr)
+        sys.exit(2)
+    except EOFError:
+        print("Erro: o daemon encerrou a conexão antes do fim da execução.", file=sys.stderr)
+        sys.exit(2)
+    except KeyboardInterrupt:
+        sys.exit(130)
+    sys.exit(status)
+
+if __name__ == "__main__":
+    main()
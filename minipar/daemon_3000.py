@@ -0,0 +1,221 @@
+import argparse
+import io
+import json
+import os
+import signal
+import socketserver
+import struct
+import sys
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+from minipar.lexer_251018_215612 import LexerError
+from minipar.parser_251018_215706 import ParserError
+from minipar.semantic_3000 import SemanticError
+from minipar.pipeline_3000 import Pipeline
+from minipar.interpreter_3000 import Interpreter, RuntimeError
+from minipar.cache_3000 import MemoryProgramCache, ProgramCache, cache_enabled, import_context, stamps_valid
+from minipar.modules_3000 import ModuleLoader
+
+# Protocolo (o mesmo de client_3000, que não importa nada do minipar):
+#   cliente -> daemon: uma linha JSON {"path": ..., "stdin": ..., "max_steps": ..., "max_memory": ...}
+#   daemon -> cliente: quadros tipo (1 byte) | tamanho (4 bytes, big-endian) | dados
+#     b"O" trecho da saída (utf-8), b"X" código de saída (texto ascii), sempre o último
+FRAME_HEADER = struct.Struct(">cI")
+FRAME_OUTPUT = b"O"
+FRAME_EXIT = b"X"
+MAX_REQUEST_BYTES = 16 * 1024 * 1024
+FLUSH_BYTES = 8192
+FLUSH_INTERVAL = 0.05
+
+def default_socket_path() -> str:
+    env_path = os.environ.get("MINIPAR_DAEMON_SOCKET")
+    if env_path:
+        return env_path
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir:
+        return os.path.join(runtime_dir, "minipar.sock")
+    return os.path.join("/tmp", f"minipar-{os.getuid()}.sock")
+
+class ClientGone(Exception): pass
+
+class SocketOutput:
+    # saída do programa de um cliente: junta as linhas e envia quadros quando passa de
+    # FLUSH_BYTES ou FLUSH_INTERVAL desde o último envio; sendall bloqueia se o cliente
+    # lê devagar, o que pausa o programa. Threads do 'par' escrevem sob o mesmo lock.
+    def __init__(self, sock):
+        self.sock = sock
+        self._parts = []
+        self._buffered = 0
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+
+    def write(self, text: str) -> int:
+        with self._lock:
+            self._parts.append(text)
+            self._buffered += len(text)
+            now = time.monotonic()
+            if self._buffered >= FLUSH_BYTES or now - self._last_flush >= FLUSH_INTERVAL:
+                self._flush_locked(now)
+        return len(text)
+
+    def _flush_locked(self, now: float):
+        if self._parts:
+            self.send(FRAME_OUTPUT, "".join(self._parts).encode("utf-8"))
+            self._parts.clear()
+            self._buffered = 0
+        self._last_flush = now
+
+    def flush(self):
+        with self._lock:
+            self._flush_locked(time.monotonic())
+
+    def send(self, kind: bytes, data: bytes):
+        try:
+            self.sock.sendall(FRAME_HEADER.pack(kind, len(data)) + data)
+        except OSError:
+            raise ClientGone()
+
+class Toolchain:
+    # estado compartilhado entre clientes: carregador de módulos e caches de programas
+    # validados. Cada execução tem o seu Interpreter (globais, funções, saída e entrada),
+    # então programas de clientes diferentes não se enxergam.
+    def __init__(self, memory_entries: int = 256):
+        self.module_loader = ModuleLoader()
+        self.disk_cache = ProgramCache() if cache_enabled() else None
+        self.memory_cache = MemoryProgramCache(max_entries=memory_entries)
+        self.runs = 0
+        self._lock = threading.Lock()
+
+    def compile(self, code: str, base_dir: str):
+        # chave pelo fonte e pelo ambiente de import (diretório e caminho de busca); a
+        # entrada guarda os carimbos dos módulos importados, vindos da análise ou do
+        # cache em disco, e deixa de valer quando um deles muda
+        context = import_context(base_dir, self.module_loader.search_path)
+        entry = self.memory_cache.get(code, context)
+        if entry is not None and stamps_valid(entry[1]):
+            return entry[0]
+        pipeline = Pipeline(module_loader=self.module_loader, base_dir=base_dir, cache=self.disk_cache)
+        result = pipeline.run(code, stop_after="semantic")
+        if result.exception is not None:
+            raise result.exception
+        self.memory_cache.put(code, (result.ast, result.dependencies), len(code) * 8, context)
+        return result.ast
+
+    def run(self, request: Dict[str, Any], output: SocketOutput) -> int:
+        with self._lock:
+            self.runs += 1
+        path = request["path"]
+        base_dir = os.path.dirname(path)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                code = f.read()
+            program = self.compile(code, base_dir)
+            interpreter = Interpreter(module_loader=self.module_loader, base_dir=base_dir, output=output,
+                                      input_source=io.StringIO(request.get("stdin") or ""),
+                                      max_steps=request.get("max_steps"), max_memory=request.get("max_memory"))
+            interpreter.interpret(program)
+            return 0
+        except FileNotFoundError:
+            output.write(f"Erro: O arquivo '{path}' não foi encontrado.\n")
+        except LexerError as e:
+            output.write(f"Erro de Análise Léxica: {e}\n")
+        except ParserError as e:
+            output.write(f"Erro de Análise Sintática: {e}\n")
+        except SemanticError as e:
+            output.write(f"Erro de Análise Semântica: {e}\n")
+        except RuntimeError as e:
+            output.write(f"Erro em Tempo de Execução: {e}\n")
+        except RecursionError:
+            output.write("Erro em Tempo de Execução: Profundidade máxima de recursão excedida.\n")
+        except ClientGone:
+            raise
+        except Exception as e:
+            output.write(f"Erro inesperado: {e}\n")
+        return 1
+
+def read_request(rfile) -> Dict[str, Any]:
+    line = rfile.readline(MAX_REQUEST_BYTES)
+    if not line.endswith(b"\n"):
+        raise ValueError("pedido incompleto ou grande demais")
+    request = json.loads(line)
+    if not isinstance(request, dict) or not isinstance(request.get("path"), str) or not os.path.isabs(request["path"]):
+        raise ValueError("campo 'path' ausente ou não absoluto")
+    for name in ("max_steps", "max_memory"):
+        value = request.get(name)
+        if value is not None and (not isinstance(value, int) or value <= 0):
+            raise ValueError(f"campo '{name}' inválido")
+    return request
+
+class DaemonHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        output = SocketOutput(self.connection)
+        try:
+            try:
+                request = read_request(self.rfile)
+            except (ValueError, UnicodeDecodeError) as e:
+                output.write(f"Erro: pedido inválido ({e}).\n")
+                status = 2
+            else:
+                status = self.server.toolchain.run(request, output)
+            output.flush()
+            output.send(FRAME_EXIT, str(status).encode("ascii"))
+        except ClientGone:
+            # cliente desconectou no meio da execução; o programa já foi interrompido
+            pass
+
+class DaemonServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, socket_path: str, toolchain: Optional[Toolchain] = None):
+        self.socket_path = socket_path
+        self.toolchain = toolchain or Toolchain()
+        _remove_stale_socket(socket_path)
+        old_umask = os.umask(0o177)
+        try:
+            super().__init__(socket_path, DaemonHandler)
+        finally:
+            os.umask(old_umask)
+
+    def server_close(self):
+        super().server_close()
+        try:
+            os.remove(self.socket_path)
+        except OSError:
+            pass
+
+def _remove_stale_socket(path: str):
+    # um socket que sobrou de um daemon morto impede o bind; um daemon vivo não é derrubado
+    import socket
+    if not os.path.exists(path):
+        return
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(path)
+    except OSError:
+        os.remove(path)
+    else:
+        raise OSError(f"Já existe um daemon escutando em {path}")
+    finally:
+        probe.close()
+
+def main():
+    parser = argparse.ArgumentParser(prog="daemon_3000", description="Daemon do minipar: mantém o compilador carregado e executa programas enviados por client_3000.")
+    parser.add_argument("--socket", default=default_socket_path(), help="caminho do socket UNIX")
+    args = parser.parse_args()
+    try:
+        server = DaemonServer(args.socket)
+    except OSError as e:
+        print(f"Erro: {e}")
+        sys.exit(1)
+    signal.signal(signal.SIGTERM, lambda signum, frame: threading.Thread(target=server.shutdown).start())
+    print(f"Daemon do minipar escutando em {args.socket}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+if __name__ == "__main__":
+    main()
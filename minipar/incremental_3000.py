@@ -0,0 +1,180 @@
+import hashlib
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import List, Optional, Dict, Any, Tuple
+from minipar.ast_251018_215806 import AST, Program, FuncDecl, VarRef
+from minipar.symbol_3000 import SymbolEntry, FunctionSymbolEntry
+from minipar.semantic_3000 import SemanticAnalyzer
+
+def iter_nodes(node: AST):
+    # percurso em pré-ordem, determinístico, usado para gravar e reaplicar as anotações
+    stack = [node]
+    while stack:
+        current = stack.pop()
+        yield current
+        children = []
+        for name in getattr(current, '__dataclass_fields__', ()):
+            value = getattr(current, name)
+            if isinstance(value, AST):
+                children.append(value)
+            elif isinstance(value, (list, tuple)):
+                for item in value:
+                    if isinstance(item, AST):
+                        children.append(item)
+                    elif isinstance(item, tuple):
+                        children.extend(x for x in item if isinstance(x, AST))
+        stack.extend(reversed(children))
+
+_FIELDS_CACHE: Dict[type, Tuple[str, ...]] = {}
+
+def fingerprint(node: AST) -> Tuple[List[Any], List[AST]]:
+    # forma estrutural do nó (tipos e valores escalares) e a lista de nós em pré-ordem,
+    # numa única passada; equivalente a iter_nodes, mas sem o custo do gerador
+    parts: List[Any] = []
+    nodes: List[AST] = []
+    stack = [node]
+    pop, push, add_part, add_node = stack.pop, stack.append, parts.append, nodes.append
+    while stack:
+        current = pop()
+        add_node(current)
+        cls = current.__class__
+        fields = _FIELDS_CACHE.get(cls)
+        if fields is None:
+            fields = _FIELDS_CACHE[cls] = tuple(getattr(cls, '__dataclass_fields__', ()))
+        add_part(cls.__name__)
+        children = []
+        for name in fields:
+            value = getattr(current, name)
+            if isinstance(value, AST):
+                children.append(value)
+            elif isinstance(value, list):
+                add_part(len(value))
+                for item in value:
+                    if isinstance(item, AST):
+                        children.append(item)
+                    elif isinstance(item, tuple):
+                        children.extend(x for x in item if isinstance(x, AST))
+            else:
+                add_part(value)
+        for child in reversed(children):
+            push(child)
+    return parts, nodes
+
+def _entry_signature(entry: Optional[SymbolEntry]):
+    if entry is None:
+        return None
+    if isinstance(entry, FunctionSymbolEntry):
+        return (entry.kind, tuple(entry.param_types), entry.return_type)
+    return (entry.kind, entry.type_name)
+
+@dataclass
+class FunctionAnalysis:
+    errors: List[str]
+    annotations: List[Tuple[int, str]]
+
+@dataclass
+class IncrementalResult:
+    errors: List[str]
+    analyzed: List[str] = field(default_factory=list)
+    reused: List[str] = field(default_factory=list)
+    full_time: float = 0.0
+    incremental_time: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+    @property
+    def speedup(self) -> float:
+        if self.incremental_time == 0:
+            return 0.0
+        return self.full_time / self.incremental_time
+
+# A chave de cada FuncDecl combina a assinatura e a forma do corpo com a assinatura
+# dos nomes livres que o corpo resolve no escopo externo (funções chamadas e globais).
+# Se nada disso mudou, os erros e as anotações 'ast_type' são reaplicados sem revisitar o corpo.
+# O cache é um LRU com até max_entries funções: cada edição gera chaves novas e as
+# antigas deixam de ser usadas, então um editor aberto por horas não cresce sem limite.
+DEFAULT_MAX_FUNCTIONS = 4096
+
+class IncrementalSemanticAnalyzer(SemanticAnalyzer):
+    def __init__(self, cache: Optional[Dict[str, FunctionAnalysis]] = None, module_loader=None, base_dir: Optional[str] = None,
+                 max_entries: int = DEFAULT_MAX_FUNCTIONS):
+        super().__init__(module_loader=module_loader, base_dir=base_dir)
+        self.cache: "OrderedDict[str, FunctionAnalysis]" = cache if isinstance(cache, OrderedDict) else OrderedDict(cache or {})
+        self.max_entries = max_entries
+        self.analyzed: List[str] = []
+        self.reused: List[str] = []
+
+    def reset(self):
+        # estado por execução; o cache de funções é preservado
+        self.__init__(self.cache, self.module_loader, self.base_dir, self.max_entries)
+
+    def function_key(self, node: FuncDecl) -> Tuple[str, List[AST]]:
+        own_signature = ('function', tuple(p.type_name for p in node.params), node.ret_type)
+        parts, nodes = fingerprint(node)
+        free_names = sorted({n.name for n in nodes if isinstance(n, VarRef)})
+        resolved = []
+        for name in free_names:
+            if name == node.name:
+                resolved.append((name, own_signature))
+            else:
+                resolved.append((name, _entry_signature(self.current_scope.resolve(name))))
+        # campos e métodos das classes tipam 'new', campos e chamadas de método do corpo
+        classes = sorted((name, layout.base.name if layout.base else None, sorted(layout.field_types.items()),
+                          sorted((m, self.signature(d)) for m, d in layout.methods.items()))
+                         for name, layout in self.layouts.items())
+        digest = hashlib.sha1(repr(parts).encode('utf-8'))
+        digest.update(repr(resolved).encode('utf-8'))
+        digest.update(repr(classes).encode('utf-8'))
+        return digest.hexdigest(), nodes
+
+    def visit_FuncDecl(self, node: FuncDecl):
+        key, nodes = self.function_key(node)
+        cached = self.cache.get(key)
+        if cached is None:
+            errors_before = len(self.errors)
+            super().visit_FuncDecl(node)
+            annotations = []
+            for index, child in enumerate(nodes):
+                ast_type = getattr(child, 'ast_type', None)
+                if ast_type is not None:
+                    annotations.append((index, ast_type))
+            self.cache[key] = FunctionAnalysis(self.errors[errors_before:], annotations)
+            while len(self.cache) > self.max_entries:
+                self.cache.popitem(last=False)
+            self.analyzed.append(node.name)
+            return
+        self.cache.move_to_end(key)
+        func_entry = FunctionSymbolEntry(name=node.name, param_types=[p.type_name for p in node.params], return_type=node.ret_type, kind='function')
+        self.current_scope.define(func_entry)
+        for index, ast_type in cached.annotations:
+            setattr(nodes[index], 'ast_type', ast_type)
+        self.errors.extend(cached.errors)
+        self.reused.append(node.name)
+
+    def diagnose(self, program: Program) -> List[str]:
+        self.reset()
+        self.visit(program)
+        return list(self.errors)
+
+    def analyze_incremental(self, old_program: Optional[Program], new_program: Program) -> IncrementalResult:
+        # a versão anterior só aquece o cache; a comparação é com uma análise completa,
+        # sem cache, da nova versão
+        if old_program is not None:
+            self.diagnose(old_program)
+        start = time.perf_counter()
+        errors = self.diagnose(new_program)
+        incremental_time = time.perf_counter() - start
+        start = time.perf_counter()
+        SemanticAnalyzer(module_loader=self.module_loader, base_dir=self.base_dir).visit(new_program)
+        full_time = time.perf_counter() - start
+        return IncrementalResult(errors=errors, analyzed=list(self.analyzed), reused=list(self.reused),
+                                 full_time=full_time, incremental_time=incremental_time)
+
+def analyze_incremental(old_program: Optional[Program], new_program: Program,
+                        analyzer: Optional[IncrementalSemanticAnalyzer] = None) -> IncrementalResult:
+    if analyzer is None:
+        analyzer = IncrementalSemanticAnalyzer()
+    return analyzer.analyze_incremental(old_program, new_program)
@@ -1,3 +1,5 @@
+import argparse
+import os
 import sys
 from typing import List, Optional, Dict, Any
 from minipar.lexer_251018_215612 import Lexer, Token, LexerError
@@ -5,31 +7,137 @@ from minipar.parser_251018_215706 import Parser, ParserError
 from minipar.ast_251018_215806 import Program, AST, Block, VarRef, BinaryOp, IfStmt, WhileStmt, FuncDecl, VarDecl, Literal, Call, VarAssign, VarDeclStmt, PrintStmt, Stmt
 from minipar.semantic_3000 import SemanticAnalyzer, SemanticError, ASTVisitor
 from minipar.interpreter_3000 import Interpreter, RuntimeError, ReturnException, BreakException
+from minipar.cache_3000 import ProgramCache, cache_enabled
+from minipar.modules_3000 import ModuleLoader
+from minipar.pipeline_3000 import Pipeline, PipelineResult
+from minipar.output_3000 import BufferedOutput, FLUSH_POLICIES, DEFAULT_BUFFER_SIZE, default_flush_policy, dump_ast
+from minipar.profile_3000 import ProfilingInterpreter, MemoryProfilingInterpreter
 
 def print_section_header(title):
     print("\n")
     print(f" {title.center(46)} ")
     print("\n")
 
-def main():
-    if len(sys.argv) < 2:
-        print("Uso: python init.py <arquivo.minipar>")
-        sys.exit(1)
-    input_file = sys.argv[1]
+def format_token(token: Token) -> str:
+    return f"Token(type='{token.type.ljust(10)}', value='{token.value.replace('\n', '\\n')}', line={token.line}, col={token.col})"
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog="init_3000", description="Compila e executa um programa minipar.")
+    parser.add_argument("input_file", metavar="arquivo.minipar")
+    parser.add_argument("--max-steps", type=int, default=None,
+                        help="limite de passos (voltas de while e chamadas de função)")
+    parser.add_argument("--max-memory", type=int, default=None,
+                        help="limite de bytes alocados em strings, listas e dicts")
+    # sem nenhuma destas opções, mantém a saída completa de todas as fases
+    phases = parser.add_argument_group("fases")
+    phases.add_argument("--dump-tokens", action="store_true", help="lista os tokens")
+    phases.add_argument("--dump-ast", action="store_true", help="imprime a AST validada, um nó por linha")
+    mode = phases.add_mutually_exclusive_group()
+    mode.add_argument("--run", action="store_true", help="executa o programa")
+    mode.add_argument("--check-only", action="store_true", help="só valida (léxico, sintaxe e semântica)")
+    mode.add_argument("--profile", action="store_true",
+                      help="executa medindo tempo e execuções por função e por linha; o relatório vai para a saída de erro")
+    mode.add_argument("--memory-profile", action="store_true",
+                      help="executa atribuindo memória alocada e retida às linhas; o relatório vai para a saída de erro")
+    parser.add_argument("--profile-output", metavar="ARQUIVO", default=None,
+                        help="com --profile, grava também as pilhas no formato 'collapsed' (flamegraph.pl, speedscope)")
+    parser.add_argument("--flush", choices=FLUSH_POLICIES, default=None,
+                        help="política de descarga da saída (padrão: interval num terminal, block caso contrário)")
+    parser.add_argument("--buffer-size", type=int, default=DEFAULT_BUFFER_SIZE, help="tamanho do buffer de saída, em caracteres")
+    return parser.parse_args(argv)
+
+def selected_phases(args) -> bool:
+    return args.dump_tokens or args.dump_ast or args.run or args.check_only or args.profile or args.memory_profile
+
+def read_source(path: str) -> str:
+    with open(path, 'r', encoding='utf-8') as f:
+        return f.read()
+
+def make_pipeline(args, output=None) -> Pipeline:
+    return Pipeline(module_loader=ModuleLoader(), base_dir=os.path.dirname(os.path.abspath(args.input_file)),
+                    cache=ProgramCache() if cache_enabled() else None, output=output,
+                    max_steps=args.max_steps, max_memory=args.max_memory,
+                    interpreter_class=interpreter_class(args))
+
+def interpreter_class(args) -> type:
+    if args.profile:
+        return ProfilingInterpreter
+    if args.memory_profile:
+        return MemoryProfilingInterpreter
+    return Interpreter
+
+ERROR_LABELS = {
+    "lexer": "Erro de Análise Léxica",
+    "parser": "Erro de Análise Sintática",
+    "semantic": "Erro de Análise Semântica",
+    "runtime": "Erro em Tempo de Execução",
+}
+
+def report_error(result: PipelineResult):
+    expected = (LexerError, ParserError, SemanticError, RuntimeError, RecursionError)
+    if result.phase in ERROR_LABELS and isinstance(result.exception, expected):
+        print("\n" + "-"*50)
+        print(f"{ERROR_LABELS[result.phase]}: {result.error}")
+    else:
+        print(f"\nErro inesperado: {result.error}")
+    sys.exit(1)
+
+def report_profile(args, result: PipelineResult):
+    profile = getattr(result.interpreter, 'profile', None)
+    if profile is None:
+        return
+    print("\n" + profile.report(result.source), end="", file=sys.stderr)
+    if args.profile_output and args.profile:
+        with open(args.profile_output, 'w', encoding='utf-8') as f:
+            f.write(profile.collapsed())
+
+def run_phases(args):
+    # só as fases pedidas; tudo que é impresso passa por um único BufferedOutput
+    code = read_source(args.input_file)
+    out = BufferedOutput(policy=args.flush or default_flush_policy(), buffer_size=args.buffer_size)
+    pipeline = make_pipeline(args, output=out)
+    result = PipelineResult(code)
     try:
-        with open(input_file, 'r', encoding='utf-8') as f:
-            code = f.read()
+        if args.dump_tokens:
+            pipeline.run(stop_after="lexer", result=result)
+            if result.tokens is not None:
+                for token in result.tokens:
+                    out.write(format_token(token) + "\n")
+                out.write(f"Total de tokens: {len(result.tokens)}\n")
+        run = args.run or args.profile or args.memory_profile
+        if run or args.check_only or args.dump_ast:
+            pipeline.run(stop_after="semantic", result=result)
+        if result.ok and args.dump_ast:
+            dump_ast(result.ast, out)
+        if result.ok and args.check_only:
+            out.write("Programa válido.\n")
+        elif result.ok and run:
+            pipeline.run(stop_after="runtime", result=result)
+    finally:
+        out.close()
+    report_profile(args, result)
+    if not result.ok:
+        report_error(result)
+
+def run_full(args):
+    code = read_source(args.input_file)
+    pipeline = make_pipeline(args)
+    result = pipeline.run(code, stop_after="semantic")
+    if result.cached:
+        print_section_header("Programa validado carregado do cache")
+    else:
         #1: Analise lexica
         print_section_header("1: Análise Léxica (Tokens gerados):")
-        lexer = Lexer(code)
-        tokens: List[Token] = lexer.tokenize()
-        for token in tokens:
-            print(f"Token(type='{token.type.ljust(10)}', value='{token.value.replace('\n', '\\n')}', line={token.line}, col={token.col})")
-        print(f"Total de tokens: {len(tokens)}")
+        if result.phase == "lexer":
+            report_error(result)
+        for token in result.tokens:
+            print(format_token(token))
+        print(f"Total de tokens: {len(result.tokens)}")
         #2: Analise sintatica (AST)
         print_section_header("2: Análise Sintática (AST):")
-        parser = Parser(tokens)
-        program_ast: Program = parser.parse_program()
+        if result.phase == "parser":
+            report_error(result)
+        program_ast: Program = result.ast
         print(program_ast)
         print("---Estrutura do Programa:")
         print(f"Classes Declaradas ({len(program_ast.classes)}):")
@@ -44,35 +152,27 @@ def main():
              print(f"  - {stmt.__class__.__name__}")
         #3: Anaçise semantica
         print_section_header("3: Análise Semântica: ")
-        analyzer = SemanticAnalyzer()
-        validated_ast = analyzer.analyze(program_ast)
+        if not result.ok:
+            report_error(result)
         print("Escopo e Tipos validados:")
-        print(validated_ast) #print da AST validade pela analise semantica
-        #AST: Arvore sintática Abstrata, arvore de derivação
-        #4: Iinterpretador
-        print_section_header("4: Interpretador: ")
-        interpreter = Interpreter()
-        interpreter.interpret(validated_ast)
-        print("\nExecução finalizada com sucesso")
-        
+        print(result.ast) #print da AST validade pela analise semantica
+    #AST: Arvore sintática Abstrata, arvore de derivação
+    #4: Iinterpretador
+    print_section_header("4: Interpretador: ")
+    pipeline.run(stop_after="runtime", result=result)
+    if not result.ok:
+        report_error(result)
+    print("\nExecução finalizada com sucesso")
+
+def main():
+    args = parse_args()
+    try:
+        if selected_phases(args):
+            run_phases(args)
+        else:
+            run_full(args)
     except FileNotFoundError:
-        print(f"Erro: O arquivo '{input_file}' não foi encontrado.")
-        sys.exit(1)
-    except LexerError as e:
-        print("\n" + "-"*50)
-        print(f"Erro de Análise Léxica: {e}")
-        sys.exit(1)
-    except ParserError as e:
-        print("\n" + "-"*50)
-        print(f"Erro de Análise Sintática: {e}")
-        sys.exit(1)
-    except SemanticError as e:
-        print("\n" + "-"*50)
-        print(f"Erro de Análise Semântica: {e}")
-        sys.exit(1)
-    except RuntimeError as e:
-        print("\n" + "-"*50)
-        print(f"Erro em Tempo de Execução: {e}")
+        print(f"Erro: O arquivo '{args.input_file}' não foi encontrado.")
         sys.exit(1)
     except Exception as e:
         print(f"\nErro inesperado: {e}")
@@ -80,5 +180,3 @@ def main():
 
 if __name__ == "__main__":
     main()
-
-
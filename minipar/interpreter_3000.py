@@ -1,13 +1,30 @@
 from typing import List, Optional, Dict, Any
-from ast_251018_215806 import Program, Block, VarRef, BinaryOp, IfStmt, WhileStmt, FuncDecl, Literal, VarAssign, VarDeclStmt, Call, ReturnStmt, PrintStmt, AST, NewExpr, SendStmt, ReceiveExpr, ParStmt, SeqStmt, DictLiteral
-import math
-import random as py_random
+from minipar.ast_251018_215806 import Program, Block, VarRef, BinaryOp, IfStmt, WhileStmt, ForStmt, FuncDecl, Literal, VarAssign, VarDeclStmt, Call, ReturnStmt, PrintStmt, AST, NewExpr, SendStmt, ReceiveExpr, ParStmt, SeqStmt, DictLiteral, ListLiteral, IndexAccess, ImportStmt, FieldAccess, MethodCall
+from minipar import array_3000
+from minipar.class_3000 import CONSTRUCTOR, ClassLayout, ClassLayoutError, Instance, build_layouts
+from minipar.list_3000 import MiniList
+from minipar.string_3000 import StringRope
 import queue
+import sys
 import threading
 import time
 
 class RuntimeError(Exception): 
-    pass
+    # line: linha da instrução mais interna em execução quando o erro ocorreu
+    line: Optional[int] = None
+
+    def __str__(self) -> str:
+        message = super().__str__()
+        return message if self.line is None else f"{message} (linha {self.line})"
+
+def at_line(error: Exception, stmt: AST) -> RuntimeError:
+    # erro do programa ao executar 'stmt'; ValueError vem do NumPy (tamanhos, conversões)
+    # e também vira RuntimeError. Instruções aninhadas marcam a linha antes das externas.
+    if not isinstance(error, RuntimeError):
+        error = RuntimeError(str(error))
+    if error.line is None:
+        error.line = getattr(stmt, 'line', None)
+    return error
 
 class ReturnException(Exception): 
     def __init__(self, value):
@@ -16,6 +33,38 @@ class ReturnException(Exception):
 class BreakException(Exception): 
     pass 
 
+class BudgetExceeded(RuntimeError):
+    def __init__(self, message: str, usage: Dict[str, Any]):
+        super().__init__(message)
+        self.usage = usage
+
+class Budget:
+    # Orçamentos de execução. Passos são contados nas voltas de while e nas chamadas;
+    # memória é o total de bytes alocados (sys.getsizeof) em strings, listas e dicts
+    # criados pelo programa, não o pico de memória viva. Compartilhado pelas threads do
+    # 'par' sem lock: sob concorrência a contagem é aproximada, o que basta para um limite.
+    def __init__(self, max_steps: Optional[int] = None, max_memory: Optional[int] = None):
+        self.max_steps = max_steps
+        self.max_memory = max_memory
+        self.steps = 0
+        self.memory = 0
+
+    def step(self):
+        self.steps += 1
+        if self.max_steps is not None and self.steps > self.max_steps:
+            raise BudgetExceeded(f"Limite de passos excedido ({self.max_steps}). {self.describe()}", self.usage())
+
+    def allocate(self, value):
+        self.memory += sys.getsizeof(value)
+        if self.max_memory is not None and self.memory > self.max_memory:
+            raise BudgetExceeded(f"Limite de memória excedido ({self.max_memory} bytes). {self.describe()}", self.usage())
+
+    def usage(self) -> Dict[str, Any]:
+        return {"steps": self.steps, "max_steps": self.max_steps, "memory": self.memory, "max_memory": self.max_memory}
+
+    def describe(self) -> str:
+        return f"Uso: {self.steps} passos, {self.memory} bytes alocados."
+
 class ASTVisitor:
     def visit(self, node: AST, *args, **kwargs):
         method_name = f'visit_{node.__class__.__name__}'
@@ -69,36 +118,76 @@ class Environment:
             current = current.parent
         return None
 
+class ModuleScope:
+    # Estado de execução de um módulo importado: globais, funções e imports próprios,
+    # separados dos de quem importa. O corpo de cada função é carregado na primeira chamada.
+    __slots__ = ('module', 'global_env', 'functions', 'module_functions')
+
+    def __init__(self, module):
+        self.module = module
+        self.global_env = Environment()
+        self.functions: Dict[str, FuncDecl] = {}
+        self.module_functions: Dict[str, 'ModuleScope'] = {}
+
 class Interpreter(ASTVisitor): 
-    def __init__(self):
+    def __init__(self, module_loader=None, base_dir: Optional[str] = None, output=None, input_source=None,
+                 max_steps: Optional[int] = None, max_memory: Optional[int] = None):
         super().__init__()
         self.global_env = Environment()
         self.env: Environment = self.global_env
         self.functions: Dict[str, FuncDecl] = {}
+        self.classes: Dict[str, ClassLayout] = {}
+        self.module_loader = module_loader
+        self.base_dir = base_dir
+        # módulos já executados, por caminho (cada um roda uma vez só); module_functions
+        # diz de qual módulo importado vem cada função visível no contexto atual, e
+        # current_module é o ModuleScope em execução (None no programa principal)
+        self.imported_modules: Dict[str, ModuleScope] = {}
+        self.module_functions: Dict[str, ModuleScope] = {}
+        self.current_module: Optional[ModuleScope] = None
+        # destino do print: qualquer objeto com write(str); None usa o sys.stdout do momento
+        self.output = output
+        # origem do input(): qualquer objeto com readline(); None usa o input() do Python
+        self.input_source = input_source
+        # None quando não há limites: os pontos de contagem custam só um teste de atributo
+        self.budget: Optional[Budget] = Budget(max_steps, max_memory) if max_steps is not None or max_memory is not None else None
         self.runtime_builtins = {
-            "exp": math.exp,
+            "exp": array_3000.exp,
             "pow": pow,
-            "random": py_random.random,
-            "range": range,
+            "random": array_3000.random,
+            "range": MiniList.from_range,
             "len": len,
-            "sum": sum,
+            "sum": array_3000.total,
             "sleep": time.sleep,
-            "input": input
+            "input": self.read_input,
+            "zeros": array_3000.zeros,
+            "dot": array_3000.dot,
+            "array": array_3000.array
         }
 
     def interpret(self, ast: Program):
+        try:
+            self.classes = build_layouts(ast.classes)
+        except ClassLayoutError as e:
+            raise RuntimeError(str(e))
         for stmt in ast.stmts:
             if isinstance(stmt, FuncDecl):
                 self.visit(stmt)
         for stmt in ast.stmts:
              if not isinstance(stmt, FuncDecl):
-                self.visit(stmt)
+                try:
+                    self.visit(stmt)
+                except (RuntimeError, ValueError) as e:
+                    raise at_line(e, stmt)
 
     def visit_Block(self, node: Block):
         self.env = self.env.enter_scope()
         try:
             for stmt in node.stmts: 
-                self.visit(stmt)
+                try:
+                    self.visit(stmt)
+                except (RuntimeError, ValueError) as e:
+                    raise at_line(e, stmt)
         finally:
             self.env = self.env.exit_scope()
 
@@ -114,16 +203,85 @@ class Interpreter(ASTVisitor):
         self.env.define(node.decl.name, init_val)
 
     def visit_VarAssign(self, node: VarAssign):
+        if isinstance(node.target, IndexAccess):
+            container = self.visit(node.target.target)
+            index = self.visit(node.target.index)
+            value = self.visit(node.value)
+            if not isinstance(container, (MiniList, dict)):
+                raise RuntimeError(f"Atribuição por índice não suportada em '{type(container).__name__}'.")
+            container[index] = value
+            return
+        if isinstance(node.target, FieldAccess):
+            obj = self.visit(node.target.target)
+            value = self.visit(node.value)
+            obj.values[self._field_slot(node.target, obj)] = value
+            return
         name = node.target.name 
-        value = self.visit(node.value)
+        value_node = node.value
+        if (isinstance(value_node, BinaryOp) and value_node.op == '+' and isinstance(value_node.left, VarRef)
+                and value_node.left.name == name):
+            # só texto usa o atalho; números, listas e arrays seguem pelo visit_BinaryOp
+            env = self.env.resolve(name)
+            if env is not None:
+                if type(env.values[name]) in (str, StringRope):
+                    self.append_assign(name, value_node.right)
+                else:
+                    env.values[name] = self.visit_BinaryOp(value_node)
+                return
+        value = self.visit(value_node)
         self.env.assign(name, value) 
 
+    def append_assign(self, name: str, right_node: AST):
+        # x = x + expr com x texto: acumula os pedaços numa StringRope no próprio slot
+        env = self.env.resolve(name)
+        if env is None:
+            raise RuntimeError(f"Variável não definida: {name}")
+        left = env.values[name]
+        length = left.length if type(left) is StringRope else None
+        right = self.visit(right_node)
+        if type(right) is str:
+            if type(left) is StringRope and env.values.get(name) is left and left.length == length:
+                left.append(right)
+                if self.budget is not None:
+                    self.budget.allocate(right)
+                return
+            if type(left) is str:
+                rope = StringRope(left)
+                rope.append(right)
+                if self.budget is not None:
+                    self.budget.allocate(rope)
+                env.values[name] = rope
+                return
+        if length is not None:
+            # o lado direito mexeu na variável: vale o texto lido antes dele
+            left = str(left)[:length]
+        result = left + right
+        if self.budget is not None:
+            self.budget.allocate(result)
+        env.values[name] = result
+
     def visit_PrintStmt(self, node: PrintStmt):
-        output_parts = []
-        for expr_node in node.expressions:
-            value = self.visit(expr_node)
-            output_parts.append(str(value))
-        print(f"{' '.join(output_parts)}")
+        visit = self.visit
+        self.write_output(' '.join([str(visit(expr_node)) for expr_node in node.expressions]) + "\n")
+
+    def write_output(self, text: str):
+        # uma única chamada write por linha: linhas de threads do 'par' não se misturam
+        output = self.output if self.output is not None else sys.stdout
+        output.write(text)
+
+    def read_input(self, prompt: str = "") -> str:
+        if self.input_source is None:
+            # saída bufferizada precisa aparecer antes do prompt
+            flush = getattr(self.output, 'flush', None)
+            if flush is not None:
+                flush()
+            return input(prompt)
+        if prompt:
+            self.write_output(prompt)
+        line = self.input_source.readline()
+        if not line:
+            raise RuntimeError("Entrada esgotada: input() chamado sem mais linhas disponíveis.")
+        return line[:-1] if line.endswith("\n") else line
 
     def visit_FuncDecl(self, node: FuncDecl):
         self.functions[node.name] = node
@@ -143,7 +301,10 @@ class Interpreter(ASTVisitor):
             self.visit(node.else_branch)
 
     def visit_WhileStmt(self, node: WhileStmt):
+        budget = self.budget
         while self.visit(node.cond):
+            if budget is not None:
+                budget.step()
             try:
                 self.visit(node.body)
             except BreakException:
@@ -151,6 +312,35 @@ class Interpreter(ASTVisitor):
             except ReturnException as e:
                 raise e 
     
+    def visit_ForStmt(self, node: ForStmt):
+        # Iteração do Python sobre o range/lista/dict (chaves, numa cópia: o corpo pode
+        # alterar o dict). A variável do laço ocupa uma única entrada de um escopo criado
+        # uma vez; com corpo em bloco, as instruções rodam nesse mesmo escopo em vez de
+        # um Environment novo por volta.
+        iterable = self.visit(node.iterable)
+        if isinstance(iterable, dict):
+            iterable = list(iterable)
+        budget = self.budget
+        name = node.decl.name
+        stmts = node.body.stmts if isinstance(node.body, Block) else [node.body]
+        visit = self.visit
+        self.env = self.env.enter_scope()
+        values = self.env.values
+        try:
+            for item in iterable:
+                if budget is not None:
+                    budget.step()
+                values[name] = item
+                try:
+                    for stmt in stmts:
+                        visit(stmt)
+                except BreakException:
+                    break
+                except (RuntimeError, ValueError) as e:
+                    raise at_line(e, stmt)
+        finally:
+            self.env = self.env.exit_scope()
+
     def visit_BreakStmt(self, node):
         raise BreakException()
 
@@ -158,51 +348,84 @@ class Interpreter(ASTVisitor):
         return node.value
 
     def visit_VarRef(self, node: VarRef):
-        return self.env.lookup(node.name)
+        value = self.env.lookup(node.name)
+        if type(value) is StringRope:
+            return str(value)
+        return value
 
     def visit_BinaryOp(self, node: BinaryOp):
         left = self.visit(node.left)
         right = self.visit(node.right)
         op = node.op
-        if op == '+': 
-            return left + right
-        if op == '-':
-            return left - right
-        if op == '*':
-            return left * right
-        if op == '/':
-            if isinstance(left, int):
-                return left // right #divisao inteiro
-            else:
-                left / right #divisao float
-        if op == '==':
-            return left == right
-        if op == '<':
-            return left < right
-        if op == '>':
-            return left > right
-        if op == '<=':
-            return left <= right
-        if op == '>=':
-            return left >= right
-        if op == '!=':
-            return left != right
-        if op == '&&':
-            return left and right
-        if op == '||':
-            return left or right
+        try:
+            if op == '+': 
+                result = left + right
+                if self.budget is not None and isinstance(result, str):
+                    self.budget.allocate(result)
+                return result
+            if op == '-':
+                return left - right
+            if op == '*':
+                return left * right
+            if op == '/':
+                if isinstance(left, int) and isinstance(right, (int, float)):
+                    return left // right #divisao inteiro
+                return left / right #divisao float (e de arrays)
+            if op == '==':
+                return left == right
+            if op == '<':
+                return left < right
+            if op == '>':
+                return left > right
+            if op == '<=':
+                return left <= right
+            if op == '>=':
+                return left >= right
+            if op == '!=':
+                return left != right
+            if op == '&&':
+                return left and right
+            if op == '||':
+                return left or right
+        except ValueError:
+            # NumPy: operação elemento a elemento entre arrays de tamanhos diferentes
+            if array_3000.is_array(left) or array_3000.is_array(right):
+                raise array_3000.shape_error(op, left, right)
+            raise
         raise RuntimeError(f"Operador '{op}' não suportado.")
 
     def visit_Call(self, node: Call):
         func_name = node.callee.name 
         if func_name in self.runtime_builtins:
-            func = self.runtime_builtins[func_name]
             args_values = [self.visit(arg) for arg in node.args]
-            return func(*args_values)
+            return self.call_builtin(func_name, args_values)
         func_decl = self.functions.get(func_name)
-        if not func_decl:
+        if func_decl is None and self.current_module is not None:
+            func_decl = self._load_module_function(self.current_module, func_name)
+        if func_decl is not None:
+            return self.call_function(func_decl, [self.visit(arg) for arg in node.args])
+        scope = self.module_functions.get(func_name)
+        if scope is None:
             raise RuntimeError(f"Função '{func_name}' não definida.")
+        # função de um módulo importado: roda com as globais e funções do módulo
+        func_decl = self._load_module_function(scope, func_name)
         evaluated_args = [self.visit(arg) for arg in node.args]
+        return self.run_in_module(scope, self.call_function, func_decl, evaluated_args)
+
+    # chamadas já com os argumentos avaliados (pontos de extensão do perfil de execução)
+    def call_builtin(self, func_name: str, args_values: List[Any]):
+        func = self.runtime_builtins[func_name]
+        if self.budget is None:
+            return func(*args_values)
+        self.budget.step()
+        result = func(*args_values)
+        if isinstance(result, (str, MiniList, dict)) or array_3000.is_array(result):
+            self.budget.allocate(result)
+        return result
+
+    def call_function(self, func_decl: FuncDecl, evaluated_args: List[Any]):
+        if self.budget is not None:
+            self.budget.step()
         self.env = self.env.enter_scope()
         for param, arg_val in zip(func_decl.params, evaluated_args):
             self.env.define(param.name, arg_val)
@@ -215,10 +438,138 @@ class Interpreter(ASTVisitor):
             self.env = self.env.exit_scope()
         return result
     
+    def visit_ImportStmt(self, node: ImportStmt):
+        if self.module_loader is None:
+            raise RuntimeError(f"Import de '{node.module}' não suportado neste contexto.")
+        from minipar.modules_3000 import ModuleError
+        try:
+            module = self.module_loader.load(node.module, self.base_dir)
+            scope = self.imported_modules.get(module.path)
+            if scope is None:
+                init = module.init_program()
+                layouts = build_layouts(init.classes)
+        except (ModuleError, ClassLayoutError) as e:
+            raise RuntimeError(str(e))
+        if scope is None:
+            for name in layouts:
+                if name in self.classes:
+                    raise RuntimeError(f"Classe '{name}' do módulo '{node.module}' já declarada.")
+            scope = ModuleScope(module)
+            self.imported_modules[module.path] = scope
+            # as funções do módulo criam objetos das classes dele; o importador também pode
+            for layout in layouts.values():
+                layout.module = scope
+            self.classes.update(layouts)
+            # instruções de topo do módulo rodam no ambiente global dele
+            self.run_in_module(scope, self._run_module_init, init)
+        for name in scope.module.functions:
+            self.module_functions[name] = scope
+
+    def _run_module_init(self, init: Program):
+        for stmt in init.stmts:
+            self.visit(stmt)
+
+    def run_in_module(self, scope: ModuleScope, run, *args):
+        # troca globais, funções, imports e diretório pelos do módulo durante 'run'
+        saved = (self.env, self.global_env, self.functions, self.module_functions, self.current_module, self.base_dir)
+        self.env = self.global_env = scope.global_env
+        self.functions, self.module_functions = scope.functions, scope.module_functions
+        self.current_module, self.base_dir = scope, scope.module.directory
+        try:
+            return run(*args)
+        finally:
+            (self.env, self.global_env, self.functions, self.module_functions,
+             self.current_module, self.base_dir) = saved
+
+    def _load_module_function(self, scope: ModuleScope, name: str) -> Optional[FuncDecl]:
+        # função declarada no próprio módulo; fica na tabela de funções dele
+        func_decl = scope.functions.get(name)
+        if func_decl is not None or name not in scope.module.functions:
+            return func_decl
+        from minipar.modules_3000 import ModuleError
+        try:
+            func_decl = scope.module.function(name)
+        except ModuleError as e:
+            raise RuntimeError(str(e))
+        scope.functions[name] = func_decl
+        return func_decl
+
     def visit_NewExpr(self, node: NewExpr):
         if node.target_type == 'c_channel':
             return Channel()
-        raise RuntimeError(f"Criação 'new' de tipo '{node.target_type}' não suportada no runtime.")
+        layout = self.classes.get(node.target_type)
+        if layout is None:
+            raise RuntimeError(f"Criação 'new' de tipo '{node.target_type}' não suportada no runtime.")
+        instance = Instance(layout)
+        if layout.initializers:
+            if layout.module is None or layout.module is self.current_module:
+                self._initialize_fields(instance)
+            else:
+                self.run_in_module(layout.module, self._initialize_fields, instance)
+        if self.budget is not None:
+            self.budget.allocate(instance)
+        constructor = layout.methods.get(CONSTRUCTOR)
+        if constructor is not None:
+            self.call_method(instance, constructor, [self.visit(arg) for arg in node.args])
+        elif node.args:
+            raise RuntimeError(f"A classe '{layout.name}' não tem método '{CONSTRUCTOR}' para receber argumentos.")
+        return instance
+
+    def _initialize_fields(self, instance: Instance):
+        values = instance.values
+        for slot, expr in instance.layout.initializers:
+            values[slot] = self.visit(expr)
+
+    def _field_slot(self, node: FieldAccess, obj) -> int:
+        if not isinstance(obj, Instance):
+            raise RuntimeError(f"Acesso ao campo '{node.member_name}' em um valor que não é objeto.")
+        # cache no próprio nó: erra só quando o objeto neste ponto muda de classe
+        try:
+            cached = node.inline_cache
+            if cached[0] is obj.layout:
+                return cached[1]
+        except AttributeError:
+            pass
+        slot = obj.layout.slots.get(node.member_name)
+        if slot is None:
+            raise RuntimeError(f"A classe '{obj.layout.name}' não tem o campo '{node.member_name}'.")
+        node.inline_cache = (obj.layout, slot)
+        return slot
+
+    def visit_FieldAccess(self, node: FieldAccess):
+        obj = self.visit(node.target)
+        return obj.values[self._field_slot(node, obj)]
+
+    def visit_MethodCall(self, node: MethodCall):
+        obj = self.visit(node.target)
+        if not isinstance(obj, Instance):
+            raise RuntimeError(f"Chamada do método '{node.method_name}' em um valor que não é objeto.")
+        return self.call_method(obj, self._method(node, obj), [self.visit(arg) for arg in node.args])
+
+    def _method(self, node: MethodCall, obj: Instance) -> FuncDecl:
+        try:
+            cached = node.inline_cache
+            if cached[0] is obj.layout:
+                return cached[1]
+        except AttributeError:
+            pass
+        method = obj.layout.methods.get(node.method_name)
+        if method is None:
+            raise RuntimeError(f"A classe '{obj.layout.name}' não tem o método '{node.method_name}'.")
+        node.inline_cache = (obj.layout, method)
+        return method
+
+    def call_method(self, instance: Instance, method: FuncDecl, evaluated_args: List[Any]):
+        # 'this' fica num escopo logo acima do da chamada, visível no corpo do método
+        module = instance.layout.module
+        if module is not None and module is not self.current_module:
+            return self.run_in_module(module, self.call_method, instance, method, evaluated_args)
+        self.env = self.env.enter_scope()
+        self.env.values['this'] = instance
+        try:
+            return self.call_function(method, evaluated_args)
+        finally:
+            self.env = self.env.exit_scope()
     
     def visit_SendStmt(self, node: SendStmt):
         channel_obj = self.visit(node.channel)
@@ -236,14 +587,11 @@ class Interpreter(ASTVisitor):
     def visit_ParStmt(self, node: ParStmt):
         threads = []
         def thread_target(stmt, env_snapshot):
-            local_interpreter = Interpreter()
-            local_interpreter.global_env = self.global_env
-            local_interpreter.functions = self.functions
-            local_interpreter.env = env_snapshot
+            local_interpreter = self.fork(env_snapshot)
             try:
                 local_interpreter.visit(stmt)
             except Exception as e:
-                print(f"Erro de Runtime em Thread Paralela: {e}")
+                local_interpreter.write_output(f"Erro de Runtime em Thread Paralela: {e}\n")
         for stmt in node.stmts:
             thread = threading.Thread(target=thread_target, args=(stmt, self.env))
             threads.append(thread)
@@ -251,9 +599,25 @@ class Interpreter(ASTVisitor):
         for thread in threads:
             thread.join()
 
+    def fork(self, env: Environment) -> 'Interpreter':
+        # interpretador de uma thread do 'par': compartilha globais, funções, módulos e saída
+        local_interpreter = self.__class__(module_loader=self.module_loader, base_dir=self.base_dir, output=self.output, input_source=self.input_source)
+        local_interpreter.global_env = self.global_env
+        local_interpreter.functions = self.functions
+        local_interpreter.classes = self.classes
+        local_interpreter.imported_modules = self.imported_modules
+        local_interpreter.module_functions = self.module_functions
+        local_interpreter.current_module = self.current_module
+        local_interpreter.env = env
+        local_interpreter.budget = self.budget
+        return local_interpreter
+
     def visit_SeqStmt(self, node: SeqStmt):
         for stmt in node.stmts:
-            self.visit(stmt)
+            try:
+                self.visit(stmt)
+            except (RuntimeError, ValueError) as e:
+                raise at_line(e, stmt)
 
     def visit_DictLiteral(self, node: DictLiteral) -> Dict[Any, Any]:
         result_dict = {}
@@ -261,8 +625,27 @@ class Interpreter(ASTVisitor):
             key_value = self.visit(key_node) 
             value_value = self.visit(value_node)
             result_dict[key_value] = value_value
+        if self.budget is not None:
+            self.budget.allocate(result_dict)
         return result_dict
 
+    def visit_ListLiteral(self, node: ListLiteral) -> MiniList:
+        result_list = MiniList([self.visit(element) for element in node.elements])
+        if self.budget is not None:
+            self.budget.allocate(result_list)
+        return result_list
+
+    def visit_IndexAccess(self, node: IndexAccess):
+        container = self.visit(node.target)
+        index = self.visit(node.index)
+        if isinstance(container, MiniList):
+            return container[index]
+        if isinstance(container, dict):
+            if index not in container:
+                raise RuntimeError(f"Chave {index!r} não encontrada no dicionário.")
+            return container[index]
+        raise RuntimeError(f"Acesso por índice não suportado em '{type(container).__name__}'.")
+
     def visit_CChannelClientStmt(self, node):
         address = self.visit(node.address)
         port = self.visit(node.port)
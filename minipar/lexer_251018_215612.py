@@ -27,7 +27,7 @@ class Lexer:
     KEYWORDS = {
         "class","extends","new","if","else","while","for","func","return",
         "var","seq","par","print","true","false","int","bool","string","c_channel",
-        "break", "number", "in"}
+        "break", "number", "in", "import"}
     
     def __init__(self, text: str):
         self.text = text
@@ -0,0 +1,95 @@
+import sys
+from array import array
+from typing import Any, Iterable
+
+# Listas do runtime. Listas só de int (que cabem em 64 bits) ficam num array('q') e
+# listas só de float num array('d'): 8 bytes por elemento, sem um objeto do Python
+# para cada número. As demais (strings, bool, int misturado com float, listas vazias)
+# usam uma list comum. O range() guarda só o próprio range e vira array('q') na primeira
+# escrita. Gravar um valor que o array não comporta (float numa lista de int, int
+# grande demais) converte a lista para list, sem mudar o que o print mostra.
+INT64_MIN, INT64_MAX = -2 ** 63, 2 ** 63 - 1
+
+def _storage(values: list):
+    if values and all(type(v) is int for v in values):
+        if INT64_MIN <= min(values) and max(values) <= INT64_MAX:
+            return array('q', values)
+    elif values and all(type(v) is float for v in values):
+        return array('d', values)
+    return values
+
+class MiniList:
+    __slots__ = ('items',)
+
+    def __init__(self, values: Iterable[Any] = ()):
+        self.items = _storage(list(values))
+
+    @classmethod
+    def from_range(cls, *args) -> 'MiniList':
+        from minipar.interpreter_3000 import RuntimeError
+        bounds = []
+        for a in args:
+            if type(a) is float and a.is_integer():
+                a = int(a)
+            if type(a) is not int:
+                raise RuntimeError(f"Argumento de range() deve ser inteiro, recebido {a!r}.")
+            bounds.append(a)
+        result = cls.__new__(cls)
+        result.items = range(*bounds)
+        return result
+
+    @property
+    def storage(self) -> str:
+        # 'q', 'd', 'range' ou 'list'
+        if isinstance(self.items, array):
+            return self.items.typecode
+        return 'range' if isinstance(self.items, range) else 'list'
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def _check_index(self, index) -> int:
+        from minipar.interpreter_3000 import RuntimeError
+        if type(index) is float and index.is_integer():
+            index = int(index)
+        if type(index) is not int:
+            raise RuntimeError(f"Índice de lista deve ser inteiro, recebido {index!r}.")
+        if not 0 <= index < len(self.items):
+            raise RuntimeError(f"Índice {index} fora dos limites da lista (tamanho {len(self.items)}).")
+        return index
+
+    def __getitem__(self, index):
+        return self.items[self._check_index(index)]
+
+    def __setitem__(self, index, value):
+        index = self._check_index(index)
+        if isinstance(self.items, range):
+            self.items = _storage(list(self.items))
+        try:
+            if isinstance(self.items, array) and type(value) is not (int if self.items.typecode == 'q' else float):
+                raise TypeError
+            self.items[index] = value
+        except (TypeError, OverflowError):
+            self.items = list(self.items)
+            self.items[index] = value
+
+    def sum(self):
+        items = self.items
+        if isinstance(items, range):
+            return len(items) * (items[0] + items[-1]) // 2 if items else 0
+        return sum(items)
+
+    def __str__(self) -> str:
+        items = self.items
+        if isinstance(items, array):
+            return str(items.tolist())
+        return str(list(items) if isinstance(items, range) else items)
+
+    __repr__ = __str__
+
+    def __sizeof__(self) -> int:
+        # objeto + armazenamento (os elementos de uma list são contados à parte)
+        return object.__sizeof__(self) + sys.getsizeof(self.items)
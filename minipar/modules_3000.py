@@ -0,0 +1,195 @@
+import hashlib
+import io
+import marshal
+import os
+import threading
+from typing import List, Optional, Dict, Any, Tuple
+from minipar.ast_251018_215806 import Program, FuncDecl, VarDeclStmt
+from minipar.arena_3000 import ASTArena
+from minipar.cache_3000 import (COMPILER_VERSION, ProgramCache, atomic_write, cache_enabled, default_cache_dir, file_stamp,
+                                module_search_path, stamps_valid)
+
+MODULE_MAGIC = b"MPM1"
+MODULE_EXTENSION = ".minipar"
+
+class ModuleError(Exception): pass
+
+class CompiledModule:
+    # Artefato de um módulo compilado. O arquivo tem um cabeçalho pequeno (exports,
+    # dependências e o deslocamento de cada blob) seguido dos blobs: o das instruções
+    # de topo ('init') e um por função. O artefato é lido inteiro ao importar (nenhum
+    # arquivo fica aberto no daemon ou no servidor); só o 'init' é desserializado na
+    # hora, o corpo de cada função na primeira chamada.
+    def __init__(self, path: str, header: Dict[str, Any], data_offset: int, data: bytes):
+        self.path = path
+        self.directory = os.path.dirname(path)
+        self.header = header
+        self.functions: Dict[str, Tuple[List[str], str]] = header['functions']
+        self.globals: Dict[str, str] = header['globals']
+        self.dependencies: List[Tuple[str, int, int]] = header['dependencies']
+        self._data_offset = data_offset
+        self._data = data
+        self._loaded: Dict[str, FuncDecl] = {}
+        self._init: Optional[Program] = None
+
+    def _read_blob(self, entry) -> bytes:
+        offset, length, checksum = entry
+        blob = self._data[self._data_offset + offset:self._data_offset + offset + length]
+        if hashlib.sha256(blob).digest() != checksum:
+            raise ModuleError(f"Artefato do módulo '{self.path}' corrompido.")
+        return blob
+
+    def init_program(self) -> Program:
+        if self._init is None:
+            self._init = ASTArena.from_bytes(self._read_blob(self.header['init'])).to_ast()
+        return self._init
+
+    def function(self, name: str) -> FuncDecl:
+        func = self._loaded.get(name)
+        if func is None:
+            func = ASTArena.from_bytes(self._read_blob(self.header['blobs'][name])).to_ast()
+            self._loaded[name] = func
+        return func
+
+def _pack_module(path: str, program: Program, dependencies) -> bytes:
+    blobs: List[bytes] = []
+    entries: Dict[str, Tuple[int, int, bytes]] = {}
+    offset = 0
+    def add(blob: bytes):
+        nonlocal offset
+        entry = (offset, len(blob), hashlib.sha256(blob).digest())
+        blobs.append(blob)
+        offset += len(blob)
+        return entry
+    functions = {}
+    globals_ = {}
+    init_stmts = []
+    for stmt in program.stmts:
+        if isinstance(stmt, FuncDecl):
+            functions[stmt.name] = ([p.type_name for p in stmt.params], stmt.ret_type)
+            entries[stmt.name] = add(ASTArena.from_ast(stmt).to_bytes())
+        else:
+            if isinstance(stmt, VarDeclStmt):
+                globals_[stmt.decl.name] = stmt.decl.type_name
+            init_stmts.append(stmt)
+    init_entry = add(ASTArena.from_ast(Program(classes=program.classes, stmts=init_stmts)).to_bytes())
+    header = marshal.dumps({
+        'version': COMPILER_VERSION,
+        'path': path,
+        'functions': functions,
+        'globals': globals_,
+        'dependencies': list(dependencies),
+        'init': init_entry,
+        'blobs': entries,
+    })
+    return MODULE_MAGIC + hashlib.sha256(header).digest() + len(header).to_bytes(4, 'big') + header + b"".join(blobs)
+
+def _read_header(f) -> Tuple[Dict[str, Any], int]:
+    prefix = f.read(len(MODULE_MAGIC) + 32 + 4)
+    if len(prefix) != len(MODULE_MAGIC) + 36 or not prefix.startswith(MODULE_MAGIC):
+        raise ModuleError("Artefato de módulo inválido.")
+    checksum = prefix[len(MODULE_MAGIC):len(MODULE_MAGIC) + 32]
+    length = int.from_bytes(prefix[-4:], 'big')
+    header_bytes = f.read(length)
+    if hashlib.sha256(header_bytes).digest() != checksum:
+        raise ModuleError("Artefato de módulo corrompido.")
+    try:
+        header = marshal.loads(header_bytes)
+    except (EOFError, ValueError, TypeError):
+        raise ModuleError("Artefato de módulo corrompido.")
+    if not isinstance(header, dict) or header.get('version') != COMPILER_VERSION:
+        raise ModuleError("Artefato de módulo de outra versão do compilador.")
+    return header, len(prefix) + length
+
+class ModuleLoader:
+    # Resolve, compila e guarda módulos importados com 'import nome' ou 'import "caminho"'.
+    # Cada módulo é compilado uma vez: em memória (por processo) e em disco, num artefato
+    # cuja chave é o caminho absoluto mais mtime/tamanho do fonte, de forma que verificar
+    # se o artefato ainda vale não exige ler o fonte da biblioteca.
+    def __init__(self, search_path: Optional[List[str]] = None, cache_dir: Optional[str] = None, use_disk_cache: Optional[bool] = None):
+        self.search_path = search_path if search_path is not None else module_search_path()
+        if use_disk_cache is None:
+            use_disk_cache = cache_enabled()
+        self.cache = ProgramCache(cache_dir or default_cache_dir()) if use_disk_cache else None
+        self._modules: Dict[str, CompiledModule] = {}
+        self._loading: List[str] = []
+        self._lock = threading.RLock()
+
+    def resolve(self, name: str, base_dir: Optional[str]) -> str:
+        filename = name if name.endswith(MODULE_EXTENSION) else name + MODULE_EXTENSION
+        if os.path.isabs(filename):
+            candidates = [filename]
+        else:
+            candidates = [os.path.join(d, filename) for d in [base_dir or os.getcwd()] + self.search_path]
+        for candidate in candidates:
+            if os.path.isfile(candidate):
+                return os.path.abspath(candidate)
+        raise ModuleError(f"Módulo '{name}' não encontrado (procurado em: {', '.join(candidates)}).")
+
+    def load(self, name: str, base_dir: Optional[str] = None) -> CompiledModule:
+        path = self.resolve(name, base_dir)
+        with self._lock:
+            module = self._modules.get(path)
+            if module is not None and stamps_valid(module.dependencies):
+                return module
+            if path in self._loading:
+                chain = " -> ".join(self._loading + [path])
+                raise ModuleError(f"Importação circular: {chain}")
+            self._loading.append(path)
+            try:
+                module = self._load_artifact(path)
+                if module is None:
+                    module = self._compile(path)
+            finally:
+                self._loading.pop()
+            self._modules[path] = module
+            return module
+
+    def _artifact_key(self, stamp) -> str:
+        return hashlib.sha256(f"{COMPILER_VERSION}\0module\0{stamp!r}".encode('utf-8')).hexdigest()
+
+    def _load_artifact(self, path: str) -> Optional[CompiledModule]:
+        if self.cache is None:
+            return None
+        artifact_path = self.cache.path_for(self._artifact_key(file_stamp(path)))
+        try:
+            with open(artifact_path, 'rb') as f:
+                data = f.read()
+            with io.BytesIO(data) as f:
+                header, data_offset = _read_header(f)
+        except (OSError, ModuleError):
+            return None
+        if header.get('path') != path or not stamps_valid(header['dependencies']):
+            return None
+        try:
+            os.utime(artifact_path)
+        except OSError:
+            return None
+        return CompiledModule(path, header, data_offset, data)
+
+    def _compile(self, path: str) -> CompiledModule:
+        from minipar.lexer_251018_215612 import Lexer, LexerError
+        from minipar.parser_251018_215706 import Parser, ParserError
+        from minipar.semantic_3000 import SemanticAnalyzer
+        from minipar.symbol_3000 import SemanticError
+        stamp = file_stamp(path)
+        with open(path, 'r', encoding='utf-8') as f:
+            source = f.read()
+        try:
+            program = Parser(Lexer(source).tokenize()).parse_program()
+            analyzer = SemanticAnalyzer(module_loader=self, base_dir=os.path.dirname(path))
+            analyzer.analyze(program)
+        except (LexerError, ParserError, SemanticError) as e:
+            raise ModuleError(f"Erro ao compilar o módulo '{path}': {e}")
+        dependencies = [stamp] + [d for d in analyzer.dependencies if d[0] != path]
+        data = _pack_module(path, program, dependencies)
+        if self.cache is not None:
+            artifact_path = self.cache.path_for(self._artifact_key(stamp))
+            try:
+                atomic_write(self.cache.directory, artifact_path, data)
+                self.cache.track_write(len(data))
+            except OSError:
+                pass
+        with io.BytesIO(data) as f:
+            header, data_offset = _read_header(f)
+        return CompiledModule(path, header, data_offset, data)
@@ -0,0 +1,117 @@
+import sys
+import threading
+import time
+from typing import Any, List, Optional
+from minipar.ast_251018_215806 import AST
+
+FLUSH_POLICIES = ("line", "block", "interval")
+DEFAULT_BUFFER_SIZE = 64 * 1024
+DEFAULT_FLUSH_INTERVAL = 0.1
+
+def default_flush_policy(stream=None) -> str:
+    # terminal: o usuário vê a saída aos poucos; arquivo/pipe: blocos grandes
+    stream = stream if stream is not None else sys.stdout
+    try:
+        return "interval" if stream.isatty() else "block"
+    except (AttributeError, ValueError):
+        return "block"
+
+class BufferedOutput:
+    # Destino de saída do interpretador que junta as linhas antes de escrever no stream.
+    # Políticas de descarga:
+    #   line      a cada write (equivale ao print() por PrintStmt)
+    #   block     quando o buffer passa de buffer_size caracteres
+    #   interval  como block, e também se passou flush_interval segundos desde a última;
+    #             uma thread auxiliar descarrega o que ficou no buffer enquanto o programa
+    #             calcula sem imprimir
+    # close() precisa ser chamado no fim (ou usar 'with'); é seguro entre threads do 'par'.
+    def __init__(self, stream=None, policy: str = "block", buffer_size: int = DEFAULT_BUFFER_SIZE,
+                 flush_interval: float = DEFAULT_FLUSH_INTERVAL):
+        if policy not in FLUSH_POLICIES:
+            raise ValueError(f"Política de descarga desconhecida: {policy}")
+        self.stream = stream if stream is not None else sys.stdout
+        self.policy = policy
+        self.buffer_size = buffer_size
+        self.flush_interval = flush_interval
+        self._parts: List[str] = []
+        self._buffered = 0
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+        self._closed = threading.Event()
+        self._flusher: Optional[threading.Thread] = None
+
+    def write(self, text: str) -> int:
+        with self._lock:
+            self._parts.append(text)
+            self._buffered += len(text)
+            if self.policy == "line" or self._buffered >= self.buffer_size:
+                self._flush_locked()
+            elif self.policy == "interval":
+                if time.monotonic() - self._last_flush >= self.flush_interval:
+                    self._flush_locked()
+                elif self._flusher is None:
+                    # criada no primeiro texto retido, só para quem de fato imprime
+                    self._flusher = threading.Thread(target=self._flush_periodically, daemon=True)
+                    self._flusher.start()
+        return len(text)
+
+    def _flush_periodically(self):
+        while not self._closed.wait(self.flush_interval):
+            with self._lock:
+                if self._parts and time.monotonic() - self._last_flush >= self.flush_interval:
+                    self._flush_locked()
+
+    def _flush_locked(self):
+        if self._parts:
+            self.stream.write("".join(self._parts))
+            self._parts.clear()
+            self._buffered = 0
+        self.stream.flush()
+        self._last_flush = time.monotonic()
+
+    def flush(self):
+        with self._lock:
+            self._flush_locked()
+
+    def __enter__(self):
+        return self
+
+    def close(self):
+        self._closed.set()
+        self.flush()
+
+    def __exit__(self, *exc):
+        self.close()
+
+def dump_ast(node: Any, out, indent: str = "  "):
+    # Impressão da AST em forma de árvore, um nó por linha, escrita à medida que percorre
+    # (pilha explícita: nem string gigante como o repr, nem limite de recursão):
+    #   Program
+    #     stmts:
+    #       - VarDeclStmt
+    #         decl: VarDecl : number
+    stack = [(0, None, node)]
+    while stack:
+        depth, label, value = stack.pop()
+        if label is None:
+            prefix = indent * depth
+        elif label == "-":
+            prefix = f"{indent * depth}- "
+        else:
+            prefix = f"{indent * depth}{label}: "
+        if isinstance(value, AST):
+            ast_type = getattr(value, 'ast_type', None)
+            suffix = f" : {ast_type}" if ast_type is not None else ""
+            out.write(f"{prefix}{type(value).__name__}{suffix}\n")
+            fields = list(value.__dataclass_fields__)
+            for name in reversed(fields):
+                stack.append((depth + 1, name, getattr(value, name)))
+        elif isinstance(value, (list, tuple)):
+            if not value:
+                out.write(f"{prefix}{'[]' if isinstance(value, list) else '()'}\n")
+                continue
+            out.write(f"{prefix.rstrip()}\n" if label not in (None, "-") else f"{prefix}{type(value).__name__}\n")
+            for item in reversed(value):
+                stack.append((depth + 1, "-", item))
+        else:
+            out.write(f"{prefix}{value!r}\n")
@@ -45,7 +45,7 @@ class Parser:
         fields = []
         methods = []
         while self.peek().type != "OP" or self.peek().value != "}":
-            if self.peek().type == "VAR": 
+            if self.peek().type == "VAR" or self.peek().type == "ID": 
                 fields.append(self.parse_var_decl())
             elif self.peek().type == "FUNC": 
                 methods.append(self.parse_func_decl())
@@ -83,7 +83,7 @@ class Parser:
             pass
         elif self.peek().type == "EOF":
             pass
-        elif self.peek().type in ("VAR", "FUNC", "IF", "WHILE", "PRINT", "BREAK", "RETURN", "SEND", "RECEIVE"):
+        elif self.peek().type in ("VAR", "FUNC", "IF", "WHILE", "FOR", "PRINT", "BREAK", "RETURN", "SEND", "RECEIVE"):
             pass
         elif self.peek().type == "ID":
             pass 
@@ -293,11 +293,20 @@ class Parser:
         return IfStmt(cond, then_branch, else_branch)
 
     def parse_stmt(self) -> Stmt:
+        # linha do primeiro token da instrução, usada nas mensagens e no perfil de execução
+        line = self.peek().line
+        stmt = self.parse_stmt_kind()
+        stmt.line = line
+        return stmt
+
+    def parse_stmt_kind(self) -> Stmt:
         tok = self.peek()
         if tok.type == "IF": 
             return self.parse_if() 
         if tok.type == "WHILE": 
             return self.parse_while()
+        if tok.type == "FOR":
+            return self.parse_for()
         if tok.type == "FUNC":
             return self.parse_func_decl()
         if tok.type == "OP" and tok.value == "{":
@@ -308,6 +317,8 @@ class Parser:
             return self.parse_par()
         if tok.type == "SEQ":
             return self.parse_seq()
+        if tok.type == "IMPORT":
+            return self.parse_import()
         stmt: Stmt = None
         if tok.type == "VAR":
             self.expect("VAR")
@@ -374,6 +385,27 @@ class Parser:
         body = self.parse_stmt()
         return WhileStmt(cond, body)
     
+    def parse_for(self) -> ForStmt:
+        # for (x in iterável) corpo, ou sem parênteses; o tipo de x é opcional: for (x: number in ...)
+        self.expect("FOR")
+        parenthesized = self.peek().type == "OP" and self.peek().value == "("
+        if parenthesized:
+            self.next()
+        name = self.expect("ID").value
+        type_name = None
+        if self.peek().type == "OP" and self.peek().value == ":":
+            self.next()
+            type_tok = self.next()
+            if type_tok.type not in ("ID", "NUMBER", "INT", "BOOL", "STRING", "C_CHANNEL"):
+                raise ParserError(f"Esperado um identificador de tipo, mas encontrado {type_tok.type} ('{type_tok.value}') em {type_tok.line}:{type_tok.col}")
+            type_name = type_tok.value
+        self.expect("IN")
+        iterable = self.parse_expression()
+        if parenthesized:
+            self.expect_symbol(")", "Esperado ')' para fechar o cabeçalho do for")
+        body = self.parse_stmt()
+        return ForStmt(VarDecl(name, type_name, None), iterable, body)
+
     def parse_block_stmts(self) -> List[Any]:
         self.expect_symbol("{", "Esperado '{' para iniciar bloco de instruções")
         stmts = []
@@ -394,10 +426,30 @@ class Parser:
         stmts = self.parse_block_stmts()
         return SeqStmt(stmts)
 
+    def parse_import(self) -> ImportStmt:
+        self.expect("IMPORT")
+        tok = self.next()
+        if tok.type == "ID":
+            return ImportStmt(module=tok.value)
+        if tok.type == "STRING":
+            return ImportStmt(module=tok.value[1:-1])
+        raise ParserError(f"Esperado nome do módulo após 'import', mas encontrado '{tok.value}' em {tok.line}:{tok.col}")
+
     def parse_new(self) -> NewExpr:
-        type_tok = self.expect("C_CHANNEL")
+        # new c_channel() ou new Classe(args), com os args repassados ao método init
+        type_tok = self.next()
+        if type_tok.type not in ("C_CHANNEL", "ID"):
+            raise ParserError(f"Esperado tipo após 'new', mas encontrado '{type_tok.value}' em {type_tok.line}:{type_tok.col}")
         self.expect_symbol("(", "Esperado '(' após construtor 'new'")
         args = [] 
+        if self.peek().type != "OP" or self.peek().value != ")":
+            while True:
+                args.append(self.parse_expression())
+                if self.peek().type == "OP" and self.peek().value == ",":
+                    self.next()
+                    continue
+                else:
+                    break
         self.expect_symbol(")", "Esperado ')' após construtor 'new'")
         return NewExpr(target_type=type_tok.value, args=args)
         
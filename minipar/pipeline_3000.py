@@ -0,0 +1,159 @@
+import io
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+from minipar.lexer_251018_215612 import Lexer, Token
+from minipar.parser_251018_215706 import Parser
+from minipar.ast_251018_215806 import Program
+from minipar.semantic_3000 import SemanticAnalyzer
+from minipar.interpreter_3000 import Interpreter
+from minipar.cache_3000 import import_context
+
+PHASES = ("lexer", "parser", "semantic", "runtime")
+
+class PipelineError(Exception): pass
+
+@dataclass
+class PipelineResult:
+    source: str
+    tokens: Optional[List[Token]] = None
+    ast: Optional[Program] = None
+    validated: bool = False              # ast já passou pela análise semântica
+    cached: bool = False                 # ast validada veio do cache, sem lexer/parser/semântica
+    executed: bool = False
+    output: Optional[str] = None         # saída capturada (Pipeline(capture_output=True))
+    diagnostics: List[str] = field(default_factory=list)
+    dependencies: List[Any] = field(default_factory=list)
+    error: Optional[str] = None
+    phase: Optional[str] = None          # fase em que ocorreu o erro
+    exception: Optional[BaseException] = None
+    timings: Dict[str, float] = field(default_factory=dict)
+    interpreter: Optional[Interpreter] = None   # interpretador da fase runtime (perfil, ...)
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    @property
+    def completed(self) -> Optional[str]:
+        # última fase concluída
+        if self.executed:
+            return "runtime"
+        if self.validated:
+            return "semantic"
+        if self.ast is not None:
+            return "parser"
+        if self.tokens is not None:
+            return "lexer"
+        return None
+
+class Pipeline:
+    # lexer -> parser -> semântica -> interpretador, com tempo de cada fase.
+    # run(source, stop_after=fase) para depois da fase pedida; passando o resultado de
+    # uma execução anterior em 'result', as fases já feitas são reaproveitadas, por
+    # exemplo run(src, "lexer") para listar os tokens e depois run(src, result=r).
+    # Com 'cache' (ProgramCache), um programa já validado pula as três primeiras fases.
+    # Erros não são lançados: ficam em result.error/phase/exception. check_semantics=False
+    # executa sem a análise semântica (como o /run antigo). interpreter_class troca o
+    # interpretador (por exemplo profile_3000.ProfilingInterpreter).
+    def __init__(self, module_loader=None, base_dir: Optional[str] = None, cache=None, output=None,
+                 capture_output: bool = False, input_source=None, max_steps: Optional[int] = None,
+                 max_memory: Optional[int] = None, check_semantics: bool = True,
+                 interpreter_class: type = Interpreter):
+        self.module_loader = module_loader
+        self.base_dir = base_dir
+        self.cache = cache
+        self.output = output
+        self.capture_output = capture_output
+        self.input_source = input_source
+        self.max_steps = max_steps
+        self.max_memory = max_memory
+        self.check_semantics = check_semantics
+        self.interpreter_class = interpreter_class
+
+    def run(self, source: Optional[str] = None, stop_after: str = "runtime",
+            result: Optional[PipelineResult] = None) -> PipelineResult:
+        if stop_after not in PHASES:
+            raise PipelineError(f"Fase desconhecida: {stop_after}")
+        if result is None:
+            if source is None:
+                raise PipelineError("É preciso o código-fonte ou um resultado anterior.")
+            result = PipelineResult(source)
+        if result.error is not None:
+            return result
+        target = PHASES.index(stop_after)
+        phase = None
+        try:
+            if target >= 2 and not result.validated and result.ast is None and self.cache is not None and self.check_semantics:
+                phase = "cache"
+                start = time.perf_counter()
+                entry = self.cache.get(result.source, self.cache_context())
+                result.timings["cache"] = time.perf_counter() - start
+                if entry is not None:
+                    result.ast, result.dependencies = entry
+                    result.validated, result.cached = True, True
+            if result.tokens is None and result.ast is None:
+                phase = "lexer"
+                start = time.perf_counter()
+                try:
+                    result.tokens = Lexer(result.source).tokenize()
+                finally:
+                    result.timings["lexer"] = time.perf_counter() - start
+            if target >= 1 and result.ast is None:
+                phase = "parser"
+                start = time.perf_counter()
+                try:
+                    result.ast = Parser(result.tokens).parse_program()
+                finally:
+                    result.timings["parser"] = time.perf_counter() - start
+            if target >= 2 and not result.validated and self.check_semantics:
+                phase = "semantic"
+                self._analyze(result)
+            if target >= 3 and not result.executed:
+                phase = "runtime"
+                self._execute(result)
+        except Exception as e:
+            result.error, result.phase, result.exception = str(e), phase, e
+            if isinstance(e, RecursionError):
+                result.error = "Profundidade máxima de recursão excedida."
+        return result
+
+    def _analyze(self, result: PipelineResult):
+        analyzer = SemanticAnalyzer(module_loader=self.module_loader, base_dir=self.base_dir)
+        start = time.perf_counter()
+        try:
+            analyzer.analyze(result.ast)
+        finally:
+            result.timings["semantic"] = time.perf_counter() - start
+            result.diagnostics = list(analyzer.errors)
+        result.validated = True
+        result.dependencies = list(analyzer.dependencies)
+        if self.cache is not None:
+            # o cache é só atalho: qualquer falha ao gravar (disco, serialização da
+            # arena) não pode derrubar um programa que já foi validado
+            try:
+                self.cache.put(result.source, result.ast, result.dependencies, self.cache_context())
+            except Exception:
+                pass
+
+    def cache_context(self) -> str:
+        search_path = self.module_loader.search_path if self.module_loader is not None else None
+        return import_context(self.base_dir, search_path)
+
+    def _execute(self, result: PipelineResult):
+        output = io.StringIO() if self.capture_output else self.output
+        interpreter = self.interpreter_class(module_loader=self.module_loader, base_dir=self.base_dir, output=output,
+                                             input_source=self.input_source, max_steps=self.max_steps,
+                                             max_memory=self.max_memory)
+        result.interpreter = interpreter
+        start = time.perf_counter()
+        try:
+            interpreter.interpret(result.ast)
+            result.executed = True
+        finally:
+            result.timings["runtime"] = time.perf_counter() - start
+            if self.capture_output:
+                result.output = output.getvalue()
+
+def run_source(source: str, stop_after: str = "runtime", **options) -> PipelineResult:
+    return Pipeline(**options).run(source, stop_after)
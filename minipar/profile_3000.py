@@ -0,0 +1,379 @@
+import sys
+import time
+import tracemalloc
+from typing import Any, Dict, List, Optional, Tuple
+from minipar.ast_251018_215806 import AST, Block, FuncDecl, Program, Stmt
+from minipar.interpreter_3000 import Interpreter, Environment
+from minipar.list_3000 import MiniList
+from minipar.class_3000 import Instance
+from minipar.string_3000 import StringRope
+
+MAIN_FRAME = "<main>"
+PAR_FRAME = "<par>"
+
+# estatística de uma função ou linha: [execuções, tempo total, tempo próprio]
+HITS, TOTAL, SELF = 0, 1, 2
+
+class Profile:
+    # Contadores de um ProfilingInterpreter, por função e por linha do fonte:
+    #   execuções  chamadas da função / instruções iniciadas na linha
+    #   total      tempo inclusivo, somado só na ativação mais externa (recursão não conta duas vezes)
+    #   próprio    total menos o tempo das chamadas feitas (função) ou das instruções aninhadas (linha)
+    # e o tempo próprio de cada pilha de chamadas, para o formato 'collapsed' dos flame graphs.
+    # Cada thread do 'par' tem o seu Profile, em 'children'; merged() junta todos.
+    def __init__(self):
+        self.functions: Dict[str, List[float]] = {}
+        self.lines: Dict[int, List[float]] = {}
+        self.stacks: Dict[Tuple[str, ...], float] = {}
+        self.children: List['Profile'] = []
+        self.wall_time = 0.0
+
+    def merged(self) -> 'Profile':
+        result = Profile()
+        result.wall_time = self.wall_time
+        pending = [self]
+        while pending:
+            profile = pending.pop()
+            pending.extend(profile.children)
+            for target, source in ((result.functions, profile.functions), (result.lines, profile.lines)):
+                for key, stats in source.items():
+                    entry = target.get(key)
+                    if entry is None:
+                        target[key] = list(stats)
+                    else:
+                        entry[HITS] += stats[HITS]
+                        entry[TOTAL] += stats[TOTAL]
+                        entry[SELF] += stats[SELF]
+            for stack, seconds in profile.stacks.items():
+                result.stacks[stack] = result.stacks.get(stack, 0.0) + seconds
+        return result
+
+    def report(self, source: Optional[str] = None, limit: int = 20) -> str:
+        # texto com as funções e as linhas mais caras, ordenadas por tempo próprio
+        profile = self.merged()
+        source_lines = source.splitlines() if source is not None else []
+        out = [f"Perfil de execução: {profile.wall_time:.6f}s no total", ""]
+        out.append("Funções (por tempo próprio):")
+        out.append(f"{'chamadas':>10} {'total(s)':>12} {'próprio(s)':>12}  função")
+        for name, stats in _top(profile.functions, limit):
+            out.append(f"{int(stats[HITS]):>10} {stats[TOTAL]:>12.6f} {stats[SELF]:>12.6f}  {name}")
+        out.append("")
+        out.append("Linhas (por tempo próprio):")
+        out.append(f"{'execuções':>10} {'total(s)':>12} {'próprio(s)':>12}  {'linha':>6}")
+        for line, stats in _top(profile.lines, limit):
+            text = source_lines[line - 1].strip() if 0 < line <= len(source_lines) else ""
+            out.append(f"{int(stats[HITS]):>10} {stats[TOTAL]:>12.6f} {stats[SELF]:>12.6f}  {line:>6}  {text}")
+        return "\n".join(out) + "\n"
+
+    def collapsed(self) -> str:
+        # uma linha por pilha, 'main;f;g <microssegundos>', o formato de entrada do
+        # flamegraph.pl, do speedscope e do inferno
+        profile = self.merged()
+        out = []
+        for stack, seconds in sorted(profile.stacks.items()):
+            micros = int(round(seconds * 1_000_000))
+            if micros > 0:
+                out.append(f"{';'.join(stack)} {micros}")
+        return "\n".join(out) + ("\n" if out else "")
+
+def _top(stats: Dict[Any, List[float]], limit: int):
+    return sorted(stats.items(), key=lambda item: item[1][SELF], reverse=True)[:limit]
+
+class ProfilingInterpreter(Interpreter):
+    # Interpreter que mede cada instrução e cada chamada com perf_counter: dois relógios
+    # e alguns acessos a dict por instrução, sem amostragem, então as contagens são
+    # exatas e o custo fica em torno de 2x o tempo da execução normal.
+    # As linhas vêm de node.line, preenchido pelo parser (0 quando o nó não tem linha).
+    def __init__(self, *args, profile: Optional[Profile] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.profile = profile if profile is not None else Profile()
+        self._frames: List[str] = [MAIN_FRAME]   # pilha de funções ativas
+        self._active_functions: Dict[str, int] = {}
+        self._active_lines: Dict[int, int] = {}
+        self._call_time = 0.0   # tempo gasto em chamadas dentro do quadro atual
+        self._stmt_time = 0.0   # tempo gasto em instruções aninhadas na instrução atual
+
+    def interpret(self, ast: Program):
+        start = time.perf_counter()
+        try:
+            super().interpret(ast)
+        finally:
+            elapsed = time.perf_counter() - start
+            self.profile.wall_time += elapsed
+            self._record_function(MAIN_FRAME, elapsed, elapsed - self._call_time, 0)
+
+    def visit(self, node: AST, *args, **kwargs):
+        if not isinstance(node, Stmt) or isinstance(node, Block):
+            return super().visit(node, *args, **kwargs)
+        line = getattr(node, 'line', 0)
+        active = self._active_lines
+        depth = active.get(line, 0)
+        active[line] = depth + 1
+        outer = self._stmt_time
+        self._stmt_time = 0.0
+        start = time.perf_counter()
+        try:
+            return super().visit(node, *args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - start
+            active[line] = depth
+            stats = self.profile.lines.get(line)
+            if stats is None:
+                stats = self.profile.lines[line] = [0, 0.0, 0.0]
+            stats[HITS] += 1
+            if depth == 0:
+                stats[TOTAL] += elapsed
+            stats[SELF] += elapsed - self._stmt_time
+            self._stmt_time = outer + elapsed
+
+    def call_builtin(self, func_name: str, args_values: List[Any]):
+        return self._timed_call(func_name, super().call_builtin, func_name, args_values)
+
+    def call_function(self, func_decl: FuncDecl, evaluated_args: List[Any]):
+        return self._timed_call(func_decl.name, super().call_function, func_decl, evaluated_args)
+
+    def _timed_call(self, name: str, call, *args):
+        frames = self._frames
+        frames.append(name)
+        active = self._active_functions
+        depth = active.get(name, 0)
+        active[name] = depth + 1
+        outer = self._call_time
+        self._call_time = 0.0
+        start = time.perf_counter()
+        try:
+            return call(*args)
+        finally:
+            elapsed = time.perf_counter() - start
+            active[name] = depth
+            self._record_function(name, elapsed, elapsed - self._call_time, depth)
+            frames.pop()
+            self._call_time = outer + elapsed
+
+    def _record_function(self, name: str, elapsed: float, own: float, depth: int):
+        profile = self.profile
+        stats = profile.functions.get(name)
+        if stats is None:
+            stats = profile.functions[name] = [0, 0.0, 0.0]
+        stats[HITS] += 1
+        if depth == 0:
+            stats[TOTAL] += elapsed
+        stats[SELF] += own
+        stack = tuple(self._frames)
+        profile.stacks[stack] = profile.stacks.get(stack, 0.0) + own
+
+    def fork(self, env: Environment) -> 'ProfilingInterpreter':
+        # cada thread do 'par' mede no próprio Profile (sem disputa entre threads); as
+        # pilhas dela continuam a de quem executou o 'par'
+        local_interpreter = super().fork(env)
+        local_interpreter._frames = self._frames + [PAR_FRAME]
+        self.profile.children.append(local_interpreter.profile)
+        return local_interpreter
+
+# estatística de memória de uma linha: [execuções, bytes alocados, bytes retidos, ambientes criados]
+ALLOCATED, RETAINED, FRAMES = 1, 2, 3
+
+class MemoryProfile:
+    # Memória de um MemoryProfilingInterpreter, por linha do fonte minipar:
+    #   alocado    soma dos aumentos da memória rastreada (tracemalloc) durante a instrução,
+    #              sem contar instruções aninhadas
+    #   retido     bytes dos valores (strings, listas, dicts) criados na linha e ainda
+    #              alcançáveis pelas variáveis globais no fim da execução
+    #   ambientes  Environment criados (blocos e chamadas de função)
+    # além do pico, da linha em execução quando ele foi atingido e do máximo de ambientes vivos.
+    def __init__(self):
+        self.lines: Dict[int, List[int]] = {}
+        self.children: List['MemoryProfile'] = []
+        self.peak = 0
+        self.peak_line = 0
+        self.retained = 0          # memória rastreada a mais no fim da execução
+        self.max_frames = 0
+
+    def merged(self) -> 'MemoryProfile':
+        result = MemoryProfile()
+        result.retained = self.retained
+        pending = [self]
+        while pending:
+            profile = pending.pop()
+            pending.extend(profile.children)
+            for line, stats in profile.lines.items():
+                entry = result.lines.get(line)
+                if entry is None:
+                    result.lines[line] = list(stats)
+                else:
+                    for i in range(len(stats)):
+                        entry[i] += stats[i]
+            if profile.peak > result.peak:
+                result.peak, result.peak_line = profile.peak, profile.peak_line
+            result.max_frames = max(result.max_frames, profile.max_frames)
+        return result
+
+    def report(self, source: Optional[str] = None, limit: int = 20) -> str:
+        profile = self.merged()
+        source_lines = source.splitlines() if source is not None else []
+        def text(line: int) -> str:
+            return source_lines[line - 1].strip() if 0 < line <= len(source_lines) else ""
+        out = [f"Perfil de memória: pico de {_format_bytes(profile.peak)} na linha {profile.peak_line}  {text(profile.peak_line)}",
+               f"Retido ao fim: {_format_bytes(profile.retained)}; ambientes vivos ao mesmo tempo: {profile.max_frames}", ""]
+        out.append("Linhas que mais alocam:")
+        out.append(f"{'execuções':>10} {'alocado':>12} {'retido':>12} {'ambientes':>10}  {'linha':>6}")
+        top = sorted(profile.lines.items(), key=lambda item: item[1][ALLOCATED], reverse=True)[:limit]
+        for line, stats in top:
+            out.append(f"{stats[HITS]:>10} {_format_bytes(stats[ALLOCATED]):>12} {_format_bytes(stats[RETAINED]):>12} "
+                       f"{stats[FRAMES]:>10}  {line:>6}  {text(line)}")
+        return "\n".join(out) + "\n"
+
+def _format_bytes(size: int) -> str:
+    for unit in ("B", "KiB", "MiB"):
+        if abs(size) < 1024:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GiB"
+
+class MemoryProfilingInterpreter(Interpreter):
+    # Interpreter que lê a memória rastreada pelo tracemalloc antes e depois de cada
+    # instrução e atribui a diferença à linha dela. Liga o tracemalloc durante interpret()
+    # se ainda não estiver ligado; o tracemalloc deixa a execução várias vezes mais lenta.
+    # Em 'par' as threads dividem a mesma memória rastreada, então a atribuição entre
+    # linhas de threads diferentes é aproximada.
+    def __init__(self, *args, profile: Optional[MemoryProfile] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.profile = profile if profile is not None else MemoryProfile()
+        self._lines: List[int] = []     # linhas das instruções em execução
+        self._nested = 0                # bytes atribuídos às instruções aninhadas na atual
+        self._live_frames = 0
+        self._created: Dict[int, int] = {}   # id do valor -> linha que o criou
+
+    def interpret(self, ast: Program):
+        started = not tracemalloc.is_tracing()
+        if started:
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        before = tracemalloc.get_traced_memory()[0]
+        try:
+            super().interpret(ast)
+        finally:
+            self.profile.retained = tracemalloc.get_traced_memory()[0] - before
+            if started:
+                tracemalloc.stop()
+            self._attribute_retained()
+
+    def _attribute_retained(self):
+        # percorre os valores alcançáveis pelas globais; cada objeto conta uma vez, na
+        # linha que o criou (os ids de objetos vivos não foram reaproveitados)
+        seen = set()
+        pending = list(self.global_env.values.values())
+        for scope in self.imported_modules.values():
+            pending.extend(scope.global_env.values.values())
+        while pending:
+            value = pending.pop()
+            if id(value) in seen or not isinstance(value, (str, list, dict, tuple, MiniList, Instance, StringRope)):
+                continue
+            seen.add(id(value))
+            line = self._created.get(id(value))
+            if line is not None:
+                self._stats(line)[RETAINED] += sys.getsizeof(value)
+            if isinstance(value, dict):
+                pending.extend(value.keys())
+                pending.extend(value.values())
+            elif isinstance(value, Instance):
+                pending.extend(value.values)
+            elif isinstance(value, MiniList):
+                # array('q'/'d') e range guardam números sem objetos próprios
+                if isinstance(value.items, list):
+                    pending.extend(value.items)
+            elif not isinstance(value, (str, StringRope)):
+                pending.extend(value)
+
+    def _created_here(self, value):
+        if self._lines:
+            self._created[id(value)] = self._lines[-1]
+        return value
+
+    def visit_DictLiteral(self, node):
+        return self._created_here(super().visit_DictLiteral(node))
+
+    def visit_ListLiteral(self, node):
+        return self._created_here(super().visit_ListLiteral(node))
+
+    def visit_NewExpr(self, node):
+        return self._created_here(super().visit_NewExpr(node))
+
+    def visit_BinaryOp(self, node):
+        result = super().visit_BinaryOp(node)
+        if isinstance(result, (str, MiniList)):
+            self._created_here(result)
+        return result
+
+    def call_builtin(self, func_name: str, args_values: List[Any]):
+        result = super().call_builtin(func_name, args_values)
+        if isinstance(result, (str, MiniList, dict)):
+            self._created_here(result)
+        return result
+
+    def append_assign(self, name: str, right_node: AST):
+        # s = s + x não passa por visit_BinaryOp: a StringRope (ou o novo valor) é criada
+        # direto no slot; quando só recebe mais um pedaço continua sendo da linha que a criou
+        env = self.env.resolve(name)
+        before = env.values.get(name) if env is not None else None
+        super().append_assign(name, right_node)
+        value = env.values.get(name)
+        if value is not before and isinstance(value, (str, MiniList, StringRope)):
+            self._created_here(value)
+
+    def visit(self, node: AST, *args, **kwargs):
+        if not isinstance(node, Stmt) or isinstance(node, Block):
+            return super().visit(node, *args, **kwargs)
+        line = getattr(node, 'line', 0)
+        self._lines.append(line)
+        outer = self._nested
+        self._nested = 0
+        before = tracemalloc.get_traced_memory()[0]
+        try:
+            return super().visit(node, *args, **kwargs)
+        finally:
+            current, peak = tracemalloc.get_traced_memory()
+            delta = current - before
+            own = delta - self._nested
+            stats = self._stats(line)
+            stats[HITS] += 1
+            if own > 0:
+                stats[ALLOCATED] += own
+            if peak > self.profile.peak:
+                self.profile.peak, self.profile.peak_line = peak, line
+            self._lines.pop()
+            self._nested = outer + delta
+
+    def _stats(self, line: int) -> List[int]:
+        stats = self.profile.lines.get(line)
+        if stats is None:
+            stats = self.profile.lines[line] = [0, 0, 0, 0]
+        return stats
+
+    def _enter_frame(self):
+        self._stats(self._lines[-1] if self._lines else 0)[FRAMES] += 1
+        self._live_frames += 1
+        if self._live_frames > self.profile.max_frames:
+            self.profile.max_frames = self._live_frames
+
+    def visit_Block(self, node: Block):
+        self._enter_frame()
+        try:
+            return super().visit_Block(node)
+        finally:
+            self._live_frames -= 1
+
+    def call_function(self, func_decl: FuncDecl, evaluated_args: List[Any]):
+        self._enter_frame()
+        try:
+            return super().call_function(func_decl, evaluated_args)
+        finally:
+            self._live_frames -= 1
+
+    def fork(self, env: Environment) -> 'MemoryProfilingInterpreter':
+        local_interpreter = super().fork(env)
+        local_interpreter._lines = self._lines[-1:]
+        local_interpreter._live_frames = self._live_frames
+        local_interpreter._created = self._created
+        self.profile.children.append(local_interpreter.profile)
+        return local_interpreter
@@ -0,0 +1,393 @@
+import io
+import multiprocessing
+import os
+import threading
+from collections import deque
+import time
+from dataclasses import dataclass, field
+from typing import Callable, List, Optional, Dict, Any
+
+try:
+    import resource
+except ImportError:  # Windows: sem rlimits, só o timeout de parede
+    resource = None
+
+DEFAULT_TIMEOUT = 5.0
+DEFAULT_CPU_SECONDS = 5
+DEFAULT_MEMORY_BYTES = 512 * 1024 * 1024
+DEFAULT_OUTPUT_LIMIT = 1024 * 1024
+DEFAULT_MAX_TASKS = 500
+STREAM_CHUNK_SIZE = 4096
+STREAM_FLUSH_INTERVAL = 0.05
+POLL_INTERVAL = 0.1
+
+PRELOAD_MODULES = [
+    "minipar.lexer_251018_215612",
+    "minipar.parser_251018_215706",
+    "minipar.semantic_3000",
+    "minipar.interpreter_3000",
+    "minipar.arena_3000",
+    "minipar.cache_3000",
+    "minipar.sandbox_3000",
+]
+
+@dataclass
+class SandboxResult:
+    output: str = ""
+    error: Optional[str] = None
+    phase: Optional[str] = None  # 'lexer', 'parser', 'semantic', 'runtime', 'budget', 'timeout', 'limit' ou 'cancelled'
+    timings: Dict[str, float] = field(default_factory=dict)
+    usage: Dict[str, Any] = field(default_factory=dict)  # passos/memória quando phase == 'budget'
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+class OutputLimitExceeded(Exception): pass
+
+class StreamCancelled(Exception): pass
+
+# levantada por on_chunk quando o prazo da execução acaba esperando o consumidor
+class StreamTimeout(StreamCancelled): pass
+
+class LimitedOutput(io.StringIO):
+    # StringIO que recusa crescer além de 'limit' caracteres
+    def __init__(self, limit: int):
+        super().__init__()
+        self.limit = limit
+        self.size = 0
+
+    def write(self, text: str) -> int:
+        self.size += len(text)
+        if self.size > self.limit:
+            raise OutputLimitExceeded(f"Limite de saída excedido ({self.limit} caracteres).")
+        return super().write(text)
+
+class StreamingOutput:
+    # Saída do worker em modo streaming: agrupa as linhas e envia pelo pipe quando junta
+    # chunk_size caracteres ou a cada flush_interval segundos (por uma thread auxiliar,
+    # para não segurar texto enquanto o programa calcula sem imprimir).
+    def __init__(self, conn, limit: int, chunk_size: int = STREAM_CHUNK_SIZE, flush_interval: float = STREAM_FLUSH_INTERVAL):
+        self.conn = conn
+        self.limit = limit
+        self.size = 0
+        self.chunk_size = chunk_size
+        self.flush_interval = flush_interval
+        self._parts: List[str] = []
+        self._buffered = 0
+        self._lock = threading.Lock()
+        self._closed = False
+        self._flusher = threading.Thread(target=self._flush_periodically, daemon=True)
+        self._flusher.start()
+
+    def write(self, text: str) -> int:
+        self.size += len(text)
+        if self.size > self.limit:
+            raise OutputLimitExceeded(f"Limite de saída excedido ({self.limit} caracteres).")
+        with self._lock:
+            self._parts.append(text)
+            self._buffered += len(text)
+            if self._buffered >= self.chunk_size:
+                self._flush_locked()
+        return len(text)
+
+    def _flush_locked(self):
+        if self._parts:
+            self.conn.send(("chunk", "".join(self._parts)))
+            self._parts.clear()
+            self._buffered = 0
+
+    def _flush_periodically(self):
+        while True:
+            time.sleep(self.flush_interval)
+            with self._lock:
+                if self._closed:
+                    return
+                self._flush_locked()
+
+    def close(self):
+        with self._lock:
+            self._flush_locked()
+            self._closed = True
+
+    def getvalue(self) -> str:
+        return ""
+
+def _decode_arena(arena: bytes):
+    # AST validada enviada pelo servidor (ASTArena.to_bytes); None se não der para ler,
+    # e então o worker compila o fonte
+    from minipar.arena_3000 import ASTArena, ArenaFormatError
+    try:
+        return ASTArena.from_bytes(arena).to_ast()
+    except ArenaFormatError:
+        return None
+
+def execute_source(code: str, check_semantics: bool = False, output_limit: int = DEFAULT_OUTPUT_LIMIT, compiled_cache=None, output=None, stdin: Optional[str] = None,
+                   max_steps: Optional[int] = None, max_memory: Optional[int] = None, arena: Optional[bytes] = None) -> SandboxResult:
+    from minipar.pipeline_3000 import Pipeline, PipelineResult
+    from minipar.interpreter_3000 import BudgetExceeded
+    if output is None:
+        output = LimitedOutput(output_limit)
+    # input() lê só do stdin enviado com o pedido, nunca do stdin do worker
+    pipeline = Pipeline(output=output, input_source=io.StringIO(stdin or ""), max_steps=max_steps, max_memory=max_memory,
+                        check_semantics=check_semantics)
+    # o cache do worker guarda (ast, validada); um programa visto sem checagem semântica
+    # ainda passa pela semântica quando ela é pedida depois
+    cached = compiled_cache.get(code) if compiled_cache is not None else None
+    if cached is None and arena is not None:
+        # com a AST do servidor o worker vai direto para a execução
+        ast = _decode_arena(arena)
+        if ast is not None:
+            cached = (ast, True)
+            if compiled_cache is not None:
+                compiled_cache.put(code, cached, len(code) * 8)
+    if cached is not None:
+        compiled = PipelineResult(code, ast=cached[0], validated=cached[1])
+    else:
+        compiled = PipelineResult(code)
+    pipeline.run(stop_after="semantic", result=compiled)
+    if compiled.ok and compiled_cache is not None and (cached is None or cached[1] != compiled.validated):
+        compiled_cache.put(code, (compiled.ast, compiled.validated), len(code) * 8)
+    if compiled.ok:
+        pipeline.run(stop_after="runtime", result=compiled)
+    result = SandboxResult(error=compiled.error, phase=compiled.phase, timings=compiled.timings)
+    error = compiled.exception
+    if isinstance(error, BudgetExceeded):
+        result.phase, result.usage = "budget", error.usage
+    elif isinstance(error, OutputLimitExceeded):
+        result.phase = "limit"
+    elif isinstance(error, MemoryError):
+        result.error, result.phase = "Limite de memória excedido.", "limit"
+    result.output = output.getvalue()
+    return result
+
+def _worker_main(conn, memory_bytes: Optional[int], cpu_seconds: Optional[int], output_limit: int):
+    from minipar.cache_3000 import MemoryProgramCache
+    if resource is not None and memory_bytes:
+        _, hard = resource.getrlimit(resource.RLIMIT_AS)
+        resource.setrlimit(resource.RLIMIT_AS, (memory_bytes, hard))
+    compiled_cache = MemoryProgramCache(max_entries=64)
+    while True:
+        try:
+            request = conn.recv()
+        except (EOFError, OSError):
+            return
+        if request is None:
+            return
+        if resource is not None and cpu_seconds:
+            # só o limite 'soft' muda: baixar o 'hard' seria irreversível para o processo
+            usage = resource.getrusage(resource.RUSAGE_SELF)
+            used = int(usage.ru_utime + usage.ru_stime)
+            _, hard = resource.getrlimit(resource.RLIMIT_CPU)
+            soft = used + cpu_seconds
+            if hard != resource.RLIM_INFINITY:
+                soft = min(soft, hard)
+            resource.setrlimit(resource.RLIMIT_CPU, (soft, hard))
+        output = StreamingOutput(conn, output_limit) if request.get("stream") else None
+        result = execute_source(request["code"], request.get("check_semantics", False), output_limit, compiled_cache, output,
+                                stdin=request.get("stdin"), max_steps=request.get("max_steps"), max_memory=request.get("max_memory"),
+                                arena=request.get("arena"))
+        try:
+            if output is not None:
+                output.close()
+            conn.send(result)
+        except (EOFError, OSError):
+            return
+
+def _context():
+    methods = multiprocessing.get_all_start_methods()
+    if "forkserver" in methods:
+        ctx = multiprocessing.get_context("forkserver")
+        ctx.set_forkserver_preload(PRELOAD_MODULES)
+        return ctx
+    return multiprocessing.get_context("spawn")
+
+def _tighter(limit: Optional[int], requested: Optional[int]) -> Optional[int]:
+    if limit is None:
+        return requested
+    if requested is None:
+        return limit
+    return min(limit, requested)
+
+class _Worker:
+    def __init__(self, ctx, pool: 'SandboxPool'):
+        self.conn, child_conn = ctx.Pipe()
+        self.process = ctx.Process(target=_worker_main, args=(child_conn, pool.memory_bytes, pool.cpu_seconds, pool.output_limit), daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.tasks = 0
+
+    def kill(self):
+        try:
+            self.process.kill()
+        except Exception:
+            pass
+        self.process.join(1)
+        self.conn.close()
+
+    def stop(self):
+        try:
+            self.conn.send(None)
+        except (EOFError, OSError):
+            pass
+        self.process.join(1)
+        if self.process.is_alive():
+            self.process.kill()
+        self.conn.close()
+
+class SandboxPool:
+    # Pool de processos pré-criados que executam programas minipar isolados do servidor.
+    # Cada execução tem timeout de parede e, no worker, rlimits de CPU e espaço de
+    # endereçamento. Worker que estoura o tempo, morre por limite ou atinge max_tasks
+    # é substituído; o processo pai nunca roda código do usuário.
+    def __init__(self, size: Optional[int] = None, timeout: float = DEFAULT_TIMEOUT,
+                 cpu_seconds: Optional[int] = DEFAULT_CPU_SECONDS, memory_bytes: Optional[int] = DEFAULT_MEMORY_BYTES,
+                 output_limit: int = DEFAULT_OUTPUT_LIMIT, max_tasks: int = DEFAULT_MAX_TASKS,
+                 max_steps: Optional[int] = None, max_memory: Optional[int] = None):
+        self.size = size or os.cpu_count() or 2
+        self.timeout = timeout
+        self.cpu_seconds = cpu_seconds
+        self.memory_bytes = memory_bytes
+        self.output_limit = output_limit
+        self.max_tasks = max_tasks
+        self.max_steps = max_steps
+        self.max_memory = max_memory
+        self.replaced = 0
+        self._ctx = _context()
+        self._idle: List[_Worker] = []
+        self._waiters: deque = deque()
+        self._workers: List[_Worker] = []
+        self._lock = threading.Lock()
+        self._closed = False
+        for _ in range(self.size):
+            self._idle.append(self._add_worker())
+
+    def _acquire(self) -> _Worker:
+        # fila FIFO de espera: o worker liberado vai direto para o pedido mais antigo,
+        # sem que a thread que o devolveu possa tomá-lo de novo na frente dos outros
+        with self._lock:
+            if self._idle and not self._waiters:
+                return self._idle.pop()
+            waiter = [threading.Event(), None]
+            self._waiters.append(waiter)
+        waiter[0].wait()
+        return waiter[1]
+
+    def _release(self, worker: _Worker):
+        with self._lock:
+            if self._waiters:
+                waiter = self._waiters.popleft()
+                waiter[1] = worker
+                waiter[0].set()
+            else:
+                self._idle.append(worker)
+
+    def _add_worker(self) -> _Worker:
+        worker = _Worker(self._ctx, self)
+        with self._lock:
+            self._workers.append(worker)
+        return worker
+
+    def _replace(self, worker: _Worker) -> _Worker:
+        worker.kill()
+        with self._lock:
+            if worker in self._workers:
+                self._workers.remove(worker)
+            self.replaced += 1
+        return self._add_worker()
+
+    def run(self, code: str, timeout: Optional[float] = None, check_semantics: bool = False, stdin: Optional[str] = None,
+            max_steps: Optional[int] = None, max_memory: Optional[int] = None, arena: Optional[bytes] = None) -> SandboxResult:
+        # arena: AST de 'code' já validada, em ASTArena.to_bytes; o worker não a recompila
+        request = self._request(code, check_semantics, stdin, max_steps, max_memory, arena)
+        return self._execute(request, timeout, None, None)
+
+    def run_streaming(self, code: str, on_chunk: Callable[[str], None], timeout: Optional[float] = None,
+                      check_semantics: bool = False, cancel_event: Optional[threading.Event] = None,
+                      stdin: Optional[str] = None, max_steps: Optional[int] = None, max_memory: Optional[int] = None,
+                      arena: Optional[bytes] = None) -> SandboxResult:
+        # a saída chega em pedaços agrupados pelo worker e é entregue a on_chunk na ordem.
+        # Se on_chunk bloquear, o pipe enche e o interpretador no worker pausa no próximo
+        # print (backpressure). cancel_event ou StreamCancelled em on_chunk matam o worker;
+        # on_chunk que espera pelo cliente deve levantar StreamTimeout depois do prazo,
+        # senão um cliente que nunca lê segura o worker indefinidamente.
+        request = self._request(code, check_semantics, stdin, max_steps, max_memory, arena)
+        request["stream"] = True
+        return self._execute(request, timeout, on_chunk, cancel_event)
+
+    def _request(self, code, check_semantics, stdin, max_steps, max_memory, arena=None) -> Dict[str, Any]:
+        # orçamentos por execução só podem apertar os do pool, nunca afrouxar
+        return {
+            "code": code,
+            "check_semantics": check_semantics,
+            "stdin": stdin,
+            "max_steps": _tighter(self.max_steps, max_steps),
+            "max_memory": _tighter(self.max_memory, max_memory),
+            "arena": arena,
+        }
+
+    def _execute(self, request, timeout, on_chunk, cancel_event) -> SandboxResult:
+        if self._closed:
+            raise RuntimeError("SandboxPool encerrado.")
+        timeout = self.timeout if timeout is None else timeout
+        worker = self._acquire()
+        start = time.perf_counter()
+        deadline = start + timeout
+        try:
+            worker.conn.send(request)
+            while True:
+                if cancel_event is not None and cancel_event.is_set():
+                    raise StreamCancelled()
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    worker = self._replace(worker)
+                    result = SandboxResult(error=f"Tempo limite de execução excedido ({timeout:g}s).", phase="timeout")
+                    break
+                if not worker.conn.poll(min(remaining, POLL_INTERVAL) if cancel_event is not None else remaining):
+                    continue
+                message = worker.conn.recv()
+                if isinstance(message, tuple):
+                    on_chunk(message[1])
+                    continue
+                result = message
+                worker.tasks += 1
+                if result.phase == "limit" or worker.tasks >= self.max_tasks:
+                    worker = self._replace(worker)
+                break
+        except StreamCancelled as e:
+            worker = self._replace(worker)
+            if isinstance(e, StreamTimeout):
+                result = SandboxResult(error=f"Tempo limite de execução excedido ({timeout:g}s).", phase="timeout")
+            else:
+                result = SandboxResult(error="Execução cancelada.", phase="cancelled")
+        except (EOFError, OSError):
+            # o worker morreu no meio da execução (SIGXCPU do RLIMIT_CPU, OOM, ...)
+            worker.process.join(0.1)
+            exitcode = worker.process.exitcode
+            worker = self._replace(worker)
+            result = SandboxResult(error=f"Execução interrompida pelo limite de recursos (código de saída {exitcode}).", phase="limit")
+        except BaseException:
+            worker = self._replace(worker)
+            raise
+        finally:
+            self._release(worker)
+        result.timings["total"] = time.perf_counter() - start
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"workers": self.size, "idle": len(self._idle), "waiting": len(self._waiters), "replaced": self.replaced}
+
+    def close(self):
+        self._closed = True
+        with self._lock:
+            workers = list(self._workers)
+            self._workers.clear()
+        for worker in workers:
+            worker.stop()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
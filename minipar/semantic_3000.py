@@ -1,6 +1,7 @@
 from typing import List, Optional, Dict, Any
-from minipar.ast_251018_215806 import AST, Program, Block, VarRef, BinaryOp, IfStmt, WhileStmt, FuncDecl, VarDecl, Literal, VarAssign, VarDeclStmt, Call, ReturnStmt, DictLiteral, ListLiteral, IndexAccess, NewExpr, ParStmt, SendStmt, SeqStmt, ReceiveExpr, MethodCall
+from minipar.ast_251018_215806 import AST, Program, Block, VarRef, BinaryOp, IfStmt, WhileStmt, ForStmt, FuncDecl, VarDecl, Literal, VarAssign, VarDeclStmt, Call, ReturnStmt, DictLiteral, ListLiteral, IndexAccess, NewExpr, ParStmt, SendStmt, SeqStmt, ReceiveExpr, MethodCall, FieldAccess, ClassDecl, ImportStmt
 from minipar.symbol_3000 import SymbolEntry, SymbolTable, SemanticError, FunctionSymbolEntry
+from minipar.class_3000 import CONSTRUCTOR, ClassLayout, build_layouts
 
 class ASTVisitor:
     def visit(self, node: AST, *args, **kwargs):
@@ -38,8 +39,18 @@ class SemanticAnalyzer(ASTVisitor):
         ('bool', '||', 'bool'): 'bool',
         ('bool', '&&', 'bool'): 'bool',
         ('string', '==', 'string'): 'bool',
+        ('string', '+', 'string'): 'string',
         ('string', '!=', 'string'): 'bool',
         ('number', '==', 'number'): 'bool'}
+
+    # array (array_3000): operadores elemento a elemento entre arrays ou com number;
+    # comparações também resultam em array
+    ARRAY_OPERATORS = ('+', '-', '*', '/', '==', '!=', '<', '>', '<=', '>=')
+    COMPATIBLE_TYPES.update({(left, op, right): 'array' for op in ARRAY_OPERATORS
+                             for left, right in (('array', 'array'), ('array', 'number'), ('number', 'array'))})
+
+    # operadores cujo resultado é 'bool' mesmo com um operando 'unknown'
+    UNKNOWN_BOOL_OPERATORS = ('==', '!=', '<', '>', '<=', '>=', '&&', '||')
     
     BUILTIN_FUNCTIONS = {
         "print": (['any'], 'void'), 
@@ -51,15 +62,31 @@ class SemanticAnalyzer(ASTVisitor):
         "range": (['number'], 'list'),
         "sleep": (['number'], 'void'),
         "input": (['string'], 'string'),
-        "close": ([], 'void')
+        "close": ([], 'void'),
+        "zeros": (['number'], 'array'),
+        "dot": (['array', 'array'], 'number'),
+        "array": (['list'], 'array')
+    }
+
+    # assinaturas alternativas de builtins, escolhidas pelos tipos dos argumentos
+    BUILTIN_OVERLOADS = {
+        "len": [(['array'], 'number')],
+        "sum": [(['array'], 'number')],
+        "exp": [(['array'], 'array')],
+        "random": [(['number'], 'array')],
     }
     
-    def __init__(self):
+    def __init__(self, module_loader=None, base_dir: Optional[str] = None):
         super().__init__()
         self.global_scope = SymbolTable()
         self.current_scope: SymbolTable = SymbolTable()
         self.current_return_type: Optional[str] = None
         self.errors: List[str] = []
+        self.module_loader = module_loader
+        self.base_dir = base_dir
+        self.imported_modules: set = set()
+        self.dependencies: List[tuple] = []
+        self.layouts: Dict[str, ClassLayout] = {}
         self._initialize_builtins()
 
     def _initialize_builtins(self):
@@ -77,7 +104,46 @@ class SemanticAnalyzer(ASTVisitor):
         return program
 
     def visit_Program(self, node: Program): 
-        self.generic_visit(node)
+        # os layouts vêm antes (o nome de uma classe é um tipo em qualquer ponto do
+        # programa) e os corpos dos métodos depois das instruções, quando as funções e
+        # globais que eles podem usar já estão no escopo, como na execução
+        self.layouts = build_layouts(node.classes, on_error=self.report_error)
+        for stmt in node.stmts:
+            self.visit(stmt)
+        for decl in node.classes:
+            self.visit(decl)
+
+    def visit_ClassDecl(self, node: ClassDecl):
+        layout = self.layouts.get(node.name)
+        if layout is None:
+            return
+        # inicializações de campo rodam no 'new', antes de existir 'this'
+        for field in node.fields:
+            if field.init is not None:
+                self.visit(field.init)
+                init_type = getattr(field.init, 'ast_type', 'error')
+                if not self.is_assignable(field.type_name, init_type):
+                    self.report_error(f"Incompatibilidade na inicialização do campo '{node.name}.{field.name}': esperado {field.type_name}, recebido {init_type}.")
+        self.current_scope = self.current_scope.enter_scope()
+        self.current_scope.define(SymbolEntry('this', node.name, 'VAR'))
+        for method in node.methods:
+            inherited = layout.base.methods.get(method.name) if layout.base else None
+            if inherited is not None and self.signature(inherited) != self.signature(method):
+                self.report_error(f"Método '{node.name}.{method.name}' sobrescreve o da classe base com outra assinatura.")
+            self.visit_function_body(method)
+        self.current_scope = self.current_scope.exit_scope()
+
+    @staticmethod
+    def signature(node: FuncDecl) -> tuple:
+        return tuple(p.type_name for p in node.params), node.ret_type
+
+    def is_assignable(self, expected: str, actual: str) -> bool:
+        # mesmo tipo, ou objeto de uma subclasse onde se espera a classe base;
+        # 'unknown' (elemento de list/dict sem tipo conhecido) fica para o runtime
+        if expected == actual or actual == 'unknown':
+            return True
+        layout = self.layouts.get(actual)
+        return layout is not None and layout.is_subclass_of(expected)
     
     def visit_Block(self, node: Block):
         self.current_scope = self.current_scope.enter_scope()
@@ -87,6 +153,9 @@ class SemanticAnalyzer(ASTVisitor):
     def visit_FuncDecl(self, node: FuncDecl):
         func_entry = FunctionSymbolEntry(name=node.name, param_types=[p.type_name for p in node.params], return_type=node.ret_type, kind='function')
         self.current_scope.define(func_entry) 
+        self.visit_function_body(node)
+
+    def visit_function_body(self, node: FuncDecl):
         self.current_scope = self.current_scope.enter_scope()
         self.current_return_type = node.ret_type
         for param in node.params:
@@ -96,11 +165,13 @@ class SemanticAnalyzer(ASTVisitor):
         self.current_return_type = None
 
     def visit_VarDeclStmt(self, node: VarDeclStmt):
-        self.current_scope.define(SymbolEntry(node.decl.name, node.decl.type_name, 'VAR'))
+        entry = SymbolEntry(node.decl.name, node.decl.type_name, 'VAR')
+        self.current_scope.define(entry)
         if node.decl.init:
             self.visit(node.decl.init)
+            entry.element_type = self.element_type(node.decl.init)
             init_type = getattr(node.decl.init, 'ast_type', 'error')
-            if init_type != node.decl.type_name: 
+            if not self.is_assignable(node.decl.type_name, init_type): 
                 self.report_error(f"Incompatibilidade na declaração de '{node.decl.name}': esperado {node.decl.type_name}, recebido {init_type}.")
 
     def visit_VarRef(self, node: VarRef):
@@ -120,6 +191,9 @@ class SemanticAnalyzer(ASTVisitor):
         key = (left_type, op, right_type)
         if key in self.COMPATIBLE_TYPES:
             setattr(node, 'ast_type', self.COMPATIBLE_TYPES[key])
+        elif 'unknown' in (left_type, right_type) and 'error' not in (left_type, right_type):
+            # operando sem tipo conhecido: só o resultado das comparações é certo
+            setattr(node, 'ast_type', 'bool' if op in self.UNKNOWN_BOOL_OPERATORS else 'unknown')
         else:
             self.report_error(f"Incompatibilidade de tipos na operação '{op}': {left_type} {op} {right_type}.")
             setattr(node, 'ast_type', 'error')
@@ -128,8 +202,13 @@ class SemanticAnalyzer(ASTVisitor):
         self.visit(node.target); self.visit(node.value)
         target_type = getattr(node.target, 'ast_type', 'error')
         value_type = getattr(node.value, 'ast_type', 'error')
-        if target_type != value_type: 
+        if not self.is_assignable(target_type, value_type): 
             self.report_error(f"Incompatibilidade de tipos na atribuição: esperado {target_type}, recebido {value_type}.")
+        if isinstance(node.target, VarRef):
+            # a lista/dict atribuída substitui a da declaração, e com ela o tipo dos elementos
+            entry = self.current_scope.resolve(node.target.name)
+            if entry:
+                entry.element_type = self.element_type(node.value)
 
     def visit_IfStmt(self, node: IfStmt):
         self.visit(node.cond)
@@ -147,11 +226,34 @@ class SemanticAnalyzer(ASTVisitor):
             self.report_error(f"Condição 'while' deve ser 'bool', recebido '{cond_type}'.")
         self.visit(node.body)
 
+    # tipo da variável do for quando não anotado, pelo tipo do iterável
+    FOR_ELEMENT_TYPES = {'list': 'unknown', 'array': 'number', 'dict': 'string'}
+
+    def visit_ForStmt(self, node: ForStmt):
+        self.visit(node.iterable)
+        iterable_type = getattr(node.iterable, 'ast_type', 'error')
+        if iterable_type not in self.FOR_ELEMENT_TYPES:
+            if iterable_type != 'error':
+                self.report_error(f"O 'for' percorre list, array ou dict, mas recebeu '{iterable_type}'.")
+            element_type = 'error'
+        else:
+            # array e dict (chaves) têm tipo fixo; de uma list só se sabe às vezes
+            known = self.element_type(node.iterable) if iterable_type == 'list' else self.FOR_ELEMENT_TYPES[iterable_type]
+            declared = node.decl.type_name
+            if declared and known and known != 'error' and not self.is_assignable(declared, known):
+                self.report_error(f"Incompatibilidade no 'for' de '{node.decl.name}': declarado {declared}, mas os elementos são {known}.")
+            element_type = declared or known or self.FOR_ELEMENT_TYPES[iterable_type]
+        setattr(node.decl, 'ast_type', element_type)
+        self.current_scope = self.current_scope.enter_scope()
+        self.current_scope.define(SymbolEntry(node.decl.name, element_type, 'VAR'))
+        self.visit(node.body)
+        self.current_scope = self.current_scope.exit_scope()
+
     def visit_ReturnStmt(self, node: ReturnStmt):
         if node.expr:
             self.visit(node.expr)
             return_expr_type = getattr(node.expr, 'ast_type', 'error')
-            if return_expr_type != self.current_return_type: 
+            if not self.is_assignable(self.current_return_type, return_expr_type): 
                 self.report_error(f"Retorno inválido: esperado {self.current_return_type}, recebido {return_expr_type}.")
     
     def visit_Literal(self, node: Literal):
@@ -189,12 +291,28 @@ class SemanticAnalyzer(ASTVisitor):
     def visit_ListLiteral(self, node: ListLiteral):
         setattr(node, 'ast_type', 'list')
         if node.elements:
-            first_type = self.visit(node.elements[0])
             for element in node.elements:
                 self.visit(element)
+            first_type = getattr(node.elements[0], 'ast_type', 'error')
+            for element in node.elements:
                 element_type = getattr(element, 'ast_type', 'error')
                 if element_type != first_type: 
-                    self.report_error("Lista deve ser homogênea...")
+                    self.report_error(f"Lista deve ser homogênea: elementos '{first_type}' e '{element_type}'.")
+                    break
+
+    def element_type(self, node: AST) -> Optional[str]:
+        # tipo dos elementos de uma expressão list/dict (valores, no caso do dict), se
+        # dá para saber: literal, variável inicializada com um deles ou range()
+        if isinstance(node, ListLiteral):
+            return getattr(node.elements[0], 'ast_type', None) if node.elements else None
+        if isinstance(node, DictLiteral):
+            return getattr(node.pairs[0][1], 'ast_type', None) if node.pairs else None
+        if isinstance(node, VarRef):
+            entry = self.current_scope.resolve(node.name)
+            return entry.element_type if entry else None
+        if isinstance(node, Call) and isinstance(node.callee, VarRef) and node.callee.name == 'range':
+            return 'number'
+        return None
 
     def visit_IndexAccess(self, node: IndexAccess):
         self.visit(node.target)
@@ -204,11 +322,12 @@ class SemanticAnalyzer(ASTVisitor):
         if target_type == 'list':
             if index_type != 'number':
                 self.report_error(f"Índice de lista deve ser 'number', recebido '{index_type}'.")
-            setattr(node, 'ast_type', 'unknown')
+            # sem inicialização conhecida (parâmetro, lista vazia) o elemento fica 'unknown'
+            setattr(node, 'ast_type', self.element_type(node.target) or self.FOR_ELEMENT_TYPES['list'])
         elif target_type == 'dict':
             if index_type not in ('string', 'number'):
                 self.report_error(f"Chave de dicionário inválida: esperado 'string' ou 'number', recebido '{index_type}'.")
-            setattr(node, 'ast_type', 'unknown') 
+            setattr(node, 'ast_type', self.element_type(node.target) or 'unknown') 
         else:
             self.report_error(f"Acesso por índice/chave ('[]') não é suportado para o tipo '{target_type}'.")
 
@@ -232,19 +351,51 @@ class SemanticAnalyzer(ASTVisitor):
         for arg in node.args:
             self.visit(arg)
             actual_types.append(getattr(arg, 'ast_type', 'error'))
+        if func_entry.kind == "builtin_func":
+            for param_types, overload_type in self.BUILTIN_OVERLOADS.get(func_name, ()):
+                if param_types == actual_types:
+                    setattr(node, 'ast_type', overload_type)
+                    return overload_type
+        self.check_arguments(func_name, expected_types, actual_types)
+        if func_entry.kind == "builtin_func" and func_name == 'range':
+            self.check_range_arguments(node.args)
+        return_type = func_entry.return_type
+        setattr(node, 'ast_type', return_type)
+        return return_type
+
+    def check_arguments(self, func_name: str, expected_types: List[str], actual_types: List[str]):
         if len(expected_types) != len(actual_types):
             self.report_error(f"Chamada para '{func_name}' tem {len(actual_types)} argumentos, mas esperava {len(expected_types)}.")
         else:
             for exp_t, act_t in zip(expected_types, actual_types):
-                if exp_t != 'any' and exp_t != act_t:
+                if exp_t != 'any' and not self.is_assignable(exp_t, act_t):
                     self.report_error(f"Incompatibilidade no argumento da chamada para '{func_name}': esperado {exp_t}, recebido {act_t}.")
-        return_type = func_entry.return_type
-        setattr(node, 'ast_type', return_type)
-        return return_type
+
+    def check_range_arguments(self, args: List[AST]):
+        # limites fracionários só são pegos aqui quando literais; os demais, no runtime
+        for arg in args:
+            if isinstance(arg, Literal) and type(arg.value) is float and not arg.value.is_integer():
+                self.report_error(f"Argumento de range() deve ser inteiro, recebido {arg.value}.")
+
+    def visit_arguments(self, args: List[AST]) -> List[str]:
+        actual_types = []
+        for arg in args:
+            self.visit(arg)
+            actual_types.append(getattr(arg, 'ast_type', 'error'))
+        return actual_types
 
     def visit_NewExpr(self, node: NewExpr):
         if node.target_type == 'c_channel':
             setattr(node, 'ast_type', 'c_channel')
+        elif node.target_type in self.layouts:
+            layout = self.layouts[node.target_type]
+            actual_types = self.visit_arguments(node.args)
+            constructor = layout.methods.get(CONSTRUCTOR)
+            if constructor is not None:
+                self.check_arguments(f"{layout.name}.{CONSTRUCTOR}", self.signature(constructor)[0], actual_types)
+            elif node.args:
+                self.report_error(f"A classe '{layout.name}' não tem método '{CONSTRUCTOR}' para receber argumentos.")
+            setattr(node, 'ast_type', layout.name)
         else:
             self.report_error(f"Criação 'new' de tipo '{node.target_type}' não suportada ou desconhecida.")
             setattr(node, 'ast_type', 'error')
@@ -277,6 +428,38 @@ class SemanticAnalyzer(ASTVisitor):
         else:
             setattr(node, 'ast_type', 'number')
     
+    def visit_ImportStmt(self, node: ImportStmt):
+        if self.module_loader is None:
+            self.report_error(f"Import de '{node.module}' não suportado neste contexto (sem carregador de módulos).")
+            return
+        from minipar.modules_3000 import ModuleError
+        try:
+            module = self.module_loader.load(node.module, self.base_dir)
+        except ModuleError as e:
+            self.report_error(str(e))
+            return
+        if module.path in self.imported_modules:
+            return
+        self.imported_modules.add(module.path)
+        for dep in module.dependencies:
+            if dep not in self.dependencies:
+                self.dependencies.append(dep)
+        for name, (param_types, return_type) in module.functions.items():
+            self.current_scope.define(FunctionSymbolEntry(name, list(param_types), return_type, kind='function'))
+        for name, type_name in module.globals.items():
+            self.current_scope.define(SymbolEntry(name, type_name, 'VAR'))
+        # as classes do módulo (já validadas na compilação dele) viram tipos aqui também
+        try:
+            classes = module.init_program().classes
+        except ModuleError as e:
+            self.report_error(str(e))
+            return
+        for name, layout in build_layouts(classes, on_error=self.report_error).items():
+            if name in self.layouts:
+                self.report_error(f"Classe '{name}' do módulo '{node.module}' já declarada.")
+            else:
+                self.layouts[name] = layout
+
     def visit_CChannelClientStmt(self, node):
         self.current_scope.define(SymbolEntry(node.name, 'c_channel', 'VAR'))
         self.visit(node.address)
@@ -288,9 +471,34 @@ class SemanticAnalyzer(ASTVisitor):
         self.visit(node.init) 
         setattr(node, 'ast_type', 's_channel')
 
+    def visit_FieldAccess(self, node: FieldAccess):
+        self.visit(node.target)
+        target_type = getattr(node.target, 'ast_type', 'error')
+        layout = self.layouts.get(target_type)
+        if layout is None:
+            if target_type != 'error':
+                self.report_error(f"Acesso ao campo '{node.member_name}' em valor de tipo '{target_type}', que não é uma classe.")
+            setattr(node, 'ast_type', 'error')
+        elif node.member_name not in layout.field_types:
+            self.report_error(f"A classe '{layout.name}' não tem o campo '{node.member_name}'.")
+            setattr(node, 'ast_type', 'error')
+        else:
+            setattr(node, 'ast_type', layout.field_types[node.member_name])
+
     def visit_MethodCall(self, node: MethodCall):
         self.visit(node.target)
         target_type = getattr(node.target, 'ast_type', 'error')
+        if target_type in self.layouts:
+            layout = self.layouts[target_type]
+            actual_types = self.visit_arguments(node.args)
+            method = layout.methods.get(node.method_name)
+            if method is None:
+                self.report_error(f"A classe '{layout.name}' não tem o método '{node.method_name}'.")
+                setattr(node, 'ast_type', 'error')
+                return 'error'
+            self.check_arguments(f"{layout.name}.{node.method_name}", self.signature(method)[0], actual_types)
+            setattr(node, 'ast_type', method.ret_type)
+            return method.ret_type
         if target_type == 'c_channel':
             if node.method_name == 'send':
                 if len(node.args) != 1:
@@ -0,0 +1,28 @@
+import sys
+
+# Texto montado por concatenações na mesma variável (s = s + x). Em vez de copiar a
+# string inteira a cada volta, os pedaços são acumulados e só viram uma str quando a
+# variável é lida; montar n bytes custa O(n) em vez de O(n²). A corda vive apenas no
+# slot da variável: qualquer leitura devolve uma str, então ela nunca é compartilhada.
+class StringRope:
+    __slots__ = ('parts', 'length')
+
+    def __init__(self, text: str):
+        self.parts = [text]
+        self.length = len(text)
+
+    def append(self, text: str):
+        self.parts.append(text)
+        self.length += len(text)
+
+    def __str__(self) -> str:
+        # junta uma vez e guarda o resultado como pedaço único para as próximas leituras
+        parts = self.parts
+        if len(parts) != 1:
+            parts[:] = [''.join(parts)]
+        return parts[0]
+
+    def __sizeof__(self) -> int:
+        # o mesmo literal anexado várias vezes é um único objeto: conta uma vez
+        parts = {id(p): p for p in self.parts}
+        return object.__sizeof__(self) + sys.getsizeof(self.parts) + sum(sys.getsizeof(p) for p in parts.values())
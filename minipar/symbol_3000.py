@@ -4,10 +4,12 @@ class SemanticError(Exception):
     pass
 
 class SymbolEntry:
-    def __init__(self, name: str, type_name: str, kind: str):
+    def __init__(self, name: str, type_name: str, kind: str, element_type: Optional[str] = None):
         self.name = name
         self.type_name = type_name
         self.kind = kind
+        # tipo dos elementos de uma list/dict, quando conhecido pela inicialização
+        self.element_type = element_type
 
 class FunctionSymbolEntry(SymbolEntry):
     def __init__(self, name: str, param_types: List[str], return_type: str, kind: str = "function"):
@@ -0,0 +1,24 @@
+from minipar.arena_3000 import ASTArena
+from minipar.cache_3000 import ProgramCache
+from minipar.pipeline_3000 import Pipeline
+
+def many_classes(count):
+    classes = "".join(f"class C{i} {{\n  var v: number = {i}\n}}\n" for i in range(count))
+    uses = "".join(f"o{i}: C{i} = new C{i}()\n" for i in range(count))
+    return classes + uses + f"print(o{count - 1}.v)\n"
+
+def test_more_than_256_type_names_round_trip():
+    source = many_classes(300)
+    result = Pipeline().run(source, stop_after="semantic")
+    assert result.ok
+    arena = ASTArena.from_ast(result.ast)
+    assert len(arena.type_names) > 256
+    assert ASTArena.from_bytes(arena.to_bytes()).to_ast() == result.ast
+
+def test_more_than_256_type_names_with_cache(tmp_path):
+    source = many_classes(300)
+    for cached in (False, True):
+        result = Pipeline(cache=ProgramCache(str(tmp_path)), capture_output=True).run(source)
+        assert result.ok, result.error
+        assert result.cached == cached
+        assert result.output == "299\n"
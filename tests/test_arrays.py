@@ -0,0 +1,28 @@
+import pytest
+
+from minipar.pipeline_3000 import Pipeline
+
+pytest.importorskip("numpy")
+
+def run(source):
+    return Pipeline(capture_output=True).run(source)
+
+def test_elementwise_operation_on_arrays_of_different_sizes_is_a_runtime_error():
+    result = run("a: array = zeros(3)\nb: array = zeros(4)\nc: array = a + b\nprint(c)\n")
+    assert result.phase == "runtime"
+    assert result.error == "Operação '+' entre arrays de tamanhos diferentes: 3 e 4. (linha 3)"
+
+def test_dot_of_arrays_of_different_sizes_reports_the_line_inside_the_function():
+    result = run("a: array = zeros(3)\nb: array = zeros(4)\nfunc f() -> number {\n  return dot(a, b)\n}\nprint(f())\n")
+    assert result.phase == "runtime"
+    assert result.error == "dot() entre arrays de tamanhos diferentes: 3 e 4. (linha 4)"
+
+def test_accumulating_into_array_of_different_size_is_a_runtime_error():
+    result = run("w: array = zeros(3)\nx: array = zeros(4)\nw = w + x\nprint(w)\n")
+    assert result.phase == "runtime"
+    assert result.error == "Operação '+' entre arrays de tamanhos diferentes: 3 e 4. (linha 3)"
+
+def test_accumulating_into_array_of_same_size_still_works():
+    result = run("w: array = array([1, 2])\nx: array = array([3, 4])\nw = w + x\nprint(dot(w, w))\n")
+    assert result.ok, result.error
+    assert result.output == "52.0\n"
@@ -0,0 +1,97 @@
+import pytest
+
+from minipar.batch_3000 import run_batch, run_individually
+from minipar.pipeline_3000 import Pipeline
+
+pytest.importorskip("numpy")
+
+def compile_program(source):
+    result = Pipeline().run(source, stop_after="semantic")
+    assert result.ok, result.error
+    return result.ast
+
+def check(source, inputs, mode):
+    program = compile_program(source)
+    batch = run_batch(program, inputs)
+    individual = run_individually(program, inputs)
+    assert batch.mode == mode, batch.reason
+    assert batch.outputs == individual.outputs
+    assert batch.errors == individual.errors
+    return batch
+
+DIVISION = """x: number = 0
+print(x / 2, x / 3, x * 3 - 10)
+"""
+
+def test_negative_division_matches_the_interpreter():
+    check(DIVISION, [{"x": -7}, {"x": 7}, {"x": -8}, {"x": 0}], "batch")
+
+def test_true_division_with_float_inputs_matches_the_interpreter():
+    check(DIVISION, [{"x": -7.5}, {"x": 0.25}], "batch")
+
+BREAK_IN_IF = """limit: number = 0
+i: number = 0
+total: number = 0
+while (i < 10) {
+  if (i == limit) {
+    break
+  }
+  total = total + i
+  i = i + 1
+}
+print(i, total)
+"""
+
+def test_break_inside_if_stops_only_its_lanes():
+    check(BREAK_IN_IF, [{"limit": 0}, {"limit": 3}, {"limit": 20}], "batch")
+
+EARLY_RETURN = """n: number = 0
+func f(v: number) -> number {
+  if (v < 0) {
+    return 0
+  }
+  w: number = v
+  while (w > 10) {
+    w = w - 10
+  }
+  return w * 2
+}
+print(f(n), f(n + 5))
+"""
+
+def test_early_return_stops_only_its_lanes():
+    check(EARLY_RETURN, [{"n": -3}, {"n": 7}, {"n": 42}], "batch")
+
+OVERFLOW = """x: number = 0
+i: number = 0
+while (i < 70) {
+  x = x * 2
+  i = i + 1
+}
+print(x)
+"""
+
+def test_int64_overflow_falls_back_to_individual_runs():
+    result = check(OVERFLOW, [{"x": 1}, {"x": 0}], "fallback")
+    assert result.reason == "estouro de int64"
+    assert result.outputs[0] == f"{2 ** 70}\n"
+
+TYPE_DIVERGES = """x: number = 0
+y: number = 1
+if (x > 0) {
+  y = 0.5
+}
+print(y)
+"""
+
+def test_type_diverging_between_lanes_falls_back():
+    result = check(TYPE_DIVERGES, [{"x": 1}, {"x": 0}], "fallback")
+    assert result.reason == "o tipo de uma variável diverge entre as execuções"
+
+def test_division_by_zero_falls_back_with_the_same_error():
+    result = check(DIVISION.replace("x / 2", "2 / x"), [{"x": 1}, {"x": 0}], "fallback")
+    assert result.errors[0] is None and result.errors[1] is not None
+
+def test_unsupported_program_and_mixed_inputs_fall_back():
+    check('x: number = 0\nprint("valor", x)\ns: string = "a"\nprint(s)\n', [{"x": 1}, {"x": 2}], "fallback")
+    check(DIVISION, [{"x": 1}, {"x": 2.5}], "fallback")
@@ -0,0 +1,56 @@
+import os
+
+from minipar.cache_3000 import ProgramCache
+from minipar.modules_3000 import ModuleLoader
+from minipar.pipeline_3000 import Pipeline
+
+MAIN = "import lib\nprint(f(1))\n"
+
+def write(path, text):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+
+def check(directory, cache_dir):
+    loader = ModuleLoader(search_path=[], cache_dir=cache_dir)
+    pipeline = Pipeline(module_loader=loader, base_dir=str(directory), cache=ProgramCache(cache_dir), capture_output=True)
+    return pipeline.run(MAIN)
+
+def test_same_source_in_two_directories_uses_each_directory_imports(tmp_path):
+    cache_dir = str(tmp_path / "cache")
+    first, second = tmp_path / "a", tmp_path / "b"
+    first.mkdir()
+    second.mkdir()
+    write(first / "lib.minipar", "func f(x: number) -> number { return x + 1 }\n")
+    write(second / "lib.minipar", "func g(x: number) -> number { return x }\n")
+
+    result = check(first, cache_dir)
+    assert result.ok and result.output == "2\n"
+
+    result = check(second, cache_dir)
+    assert not result.cached
+    assert result.phase == "semantic"
+
+    result = check(first, cache_dir)
+    assert result.cached and result.output == "2\n"
+    assert result.dependencies and result.dependencies[0][0] == os.path.abspath(first / "lib.minipar")
+
+class BrokenCache(ProgramCache):
+    def put(self, source, program, dependencies=(), context=""):
+        raise ValueError("arena grande demais")
+
+def test_failure_storing_in_cache_does_not_fail_the_program(tmp_path):
+    pipeline = Pipeline(cache=BrokenCache(str(tmp_path)), capture_output=True)
+    result = pipeline.run("print(1 + 1)\n")
+    assert result.ok, result.error
+    assert result.output == "2\n"
+
+def test_directory_stays_bounded_with_several_writers(tmp_path):
+    # cada ProgramCache faz o papel de um processo do bulk_3000 gravando no mesmo diretório
+    directory = str(tmp_path / "cache")
+    max_bytes = 64 * 1024
+    writers = [ProgramCache(directory, max_bytes=max_bytes) for _ in range(4)]
+    largest = 0
+    for i in range(400):
+        writers[i % len(writers)].store_bytes(f"k{i}", b"x" * 1000)
+        largest = max(largest, writers[0].size())
+    assert largest <= max_bytes + len(writers) * (max_bytes // 16 + 2000)
@@ -0,0 +1,43 @@
+import os
+
+from minipar.daemon_3000 import Toolchain
+
+class Output:
+    def __init__(self):
+        self.parts = []
+
+    def write(self, text):
+        self.parts.append(text)
+        return len(text)
+
+    def text(self):
+        return "".join(self.parts)
+
+def run(toolchain, path):
+    output = Output()
+    code = toolchain.run({"path": str(path)}, output)
+    return code, output.text()
+
+def write(path, text, mtime_ns=None):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+    if mtime_ns is not None:
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+
+def test_edited_import_invalidates_compiled_program(tmp_path, monkeypatch):
+    monkeypatch.setenv("MINIPAR_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.delenv("MINIPAR_PATH", raising=False)
+    monkeypatch.delenv("MINIPAR_NO_CACHE", raising=False)
+    lib, main = tmp_path / "lib.minipar", tmp_path / "main.minipar"
+    write(lib, "func f(x: number) -> number { return x + 1 }\n", mtime_ns=1_000_000_000)
+    write(main, "import lib\nprint(f(1))\n")
+
+    # o segundo Toolchain simula um daemon reiniciado: o programa vem do cache em disco
+    assert run(Toolchain(), main) == (0, "2\n")
+    toolchain = Toolchain()
+    assert run(toolchain, main) == (0, "2\n")
+
+    write(lib, "func f(x: number, y: number) -> number { return x + y }\n", mtime_ns=2_000_000_000)
+    code, output = run(toolchain, main)
+    assert code == 1
+    assert output.startswith("Erro de Análise Semântica")
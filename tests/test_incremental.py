@@ -0,0 +1,24 @@
+from minipar.incremental_3000 import IncrementalSemanticAnalyzer
+from minipar.pipeline_3000 import Pipeline
+
+def parse(source):
+    return Pipeline().run(source, stop_after="parser").ast
+
+def functions(count, offset=0):
+    return "".join(f"func f{i}(x: number) -> number {{\n  return x + {i + offset}\n}}\n" for i in range(count))
+
+def test_function_cache_is_bounded():
+    analyzer = IncrementalSemanticAnalyzer(max_entries=3)
+    for version in range(4):
+        assert analyzer.diagnose(parse(functions(5, offset=version * 10))) == []
+        assert len(analyzer.cache) <= 3
+
+def test_unchanged_functions_are_reused_and_compared_with_full_analysis():
+    analyzer = IncrementalSemanticAnalyzer()
+    old = parse(functions(20))
+    new = parse(functions(20) + "func g() -> number {\n  return f0(1)\n}\n")
+    result = analyzer.analyze_incremental(old, new)
+    assert result.ok
+    assert result.analyzed == ["g"]
+    assert len(result.reused) == 20
+    assert result.full_time > 0 and result.incremental_time > 0
@@ -0,0 +1,52 @@
+import os
+
+from minipar.modules_3000 import ModuleLoader
+from minipar.pipeline_3000 import Pipeline
+
+GEO = """class Ponto {
+  var x: number = 0
+  var y: number = 0
+  func soma() -> number {
+    return this.x + this.y
+  }
+}
+func origem() -> Ponto {
+  p: Ponto = new Ponto()
+  p.x = 3
+  return p
+}
+"""
+
+def run(tmp_path, source):
+    (tmp_path / "geo.minipar").write_text(GEO, encoding="utf-8")
+    loader = ModuleLoader(search_path=[], cache_dir=str(tmp_path / "cache"))
+    return Pipeline(module_loader=loader, base_dir=str(tmp_path), capture_output=True).run(source)
+
+def test_imported_classes_are_built_at_runtime(tmp_path):
+    result = run(tmp_path, "import geo\no: Ponto = origem()\nq: Ponto = new Ponto()\nq.y = 4\nprint(o.soma(), q.soma())\n")
+    assert result.ok, result.error
+    assert result.output == "3 4\n"
+
+def test_class_with_the_name_of_an_imported_class_is_rejected(tmp_path):
+    result = run(tmp_path, "import geo\nclass Ponto {\n  var z: number = 0\n}\nprint(1)\n")
+    assert not result.ok
+    assert result.phase == "semantic"
+    assert "Classe 'Ponto' do módulo 'geo' já declarada." in result.error
+
+def test_module_loaded_from_artifact_keeps_no_file_open(tmp_path):
+    (tmp_path / "geo.minipar").write_text(GEO, encoding="utf-8")
+    cache_dir = str(tmp_path / "cache")
+    ModuleLoader(search_path=[], cache_dir=cache_dir).load("geo", str(tmp_path))
+    open_files = len(os.listdir("/proc/self/fd"))
+    modules = [ModuleLoader(search_path=[], cache_dir=cache_dir).load("geo", str(tmp_path)) for _ in range(20)]
+    assert len(os.listdir("/proc/self/fd")) == open_files
+    assert modules[0].function("origem").name == "origem"
+
+def test_modules_keep_their_own_globals_and_functions(tmp_path):
+    (tmp_path / "a.minipar").write_text('import b\nfunc g() -> string {\n  return h()\n}\n', encoding="utf-8")
+    (tmp_path / "b.minipar").write_text('x: string = "b"\nfunc h() -> string {\n  return "b.h " + x\n}\n', encoding="utf-8")
+    source = 'x: number = 1\nfunc h() -> string {\n  return "main.h"\n}\nimport a\nprint(g())\nprint(h())\nprint(x + 1)\n'
+    loader = ModuleLoader(search_path=[], cache_dir=str(tmp_path / "cache"))
+    result = Pipeline(module_loader=loader, base_dir=str(tmp_path), capture_output=True).run(source)
+    assert result.ok, result.error
+    assert result.output == "b.h b\nmain.h\n2\n"
@@ -0,0 +1,25 @@
+import io
+import time
+
+from minipar.output_3000 import BufferedOutput
+
+def test_interval_policy_flushes_pending_text_without_another_write():
+    stream = io.StringIO()
+    with BufferedOutput(stream, policy="interval", flush_interval=0.05) as out:
+        out.write("a\n")
+        out.write("b\n")
+        deadline = time.monotonic() + 2
+        while stream.getvalue() != "a\nb\n" and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert stream.getvalue() == "a\nb\n"
+        out.write("c\n")
+    assert stream.getvalue() == "a\nb\nc\n"
+
+def test_block_policy_keeps_text_until_close():
+    stream = io.StringIO()
+    out = BufferedOutput(stream, policy="block")
+    out.write("a\n")
+    time.sleep(0.05)
+    assert stream.getvalue() == ""
+    out.close()
+    assert stream.getvalue() == "a\n"
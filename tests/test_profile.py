@@ -0,0 +1,27 @@
+import io
+import sys
+
+from minipar.pipeline_3000 import Pipeline
+from minipar.profile_3000 import RETAINED, MemoryProfilingInterpreter
+
+LOOP = """s: string = ""
+i: number = 0
+while (i < 1000) {
+  s = s + "0123456789"
+  i = i + 1
+}
+print(i)
+"""
+
+def test_memory_profile_attributes_string_built_in_loop_to_its_line():
+    result = Pipeline().run(LOOP, stop_after="semantic")
+    assert result.ok
+    program = result.ast
+    output = io.StringIO()
+    interpreter = MemoryProfilingInterpreter(output=output)
+    interpreter.interpret(program)
+    assert output.getvalue() == "1000\n"
+    lines = interpreter.profile.merged().lines
+    retained = sys.getsizeof(interpreter.global_env.values["s"])
+    assert retained > 0
+    assert lines[4][RETAINED] == retained
@@ -0,0 +1,36 @@
+import time
+
+from minipar.arena_3000 import ASTArena
+from minipar.pipeline_3000 import Pipeline
+from minipar.sandbox_3000 import SandboxPool, StreamTimeout, execute_source
+
+def compiled_arena(code):
+    return ASTArena.from_ast(Pipeline().run(code, stop_after="semantic").ast).to_bytes()
+
+def test_stream_consumer_that_never_reads_times_out_and_frees_the_worker():
+    def on_chunk(text, deadline=time.perf_counter() + 0.5):
+        # cliente que nunca lê: espera até o prazo, como o /run/stream
+        while time.perf_counter() < deadline:
+            time.sleep(0.01)
+        raise StreamTimeout()
+
+    with SandboxPool(size=1) as pool:
+        result = pool.run_streaming("print(1)\n", on_chunk, timeout=0.5)
+        assert result.phase == "timeout"
+        assert pool.replaced == 1
+        result = pool.run("print(2)\n")
+        assert result.ok and result.output == "2\n"
+
+def test_worker_runs_the_sent_ast_without_the_front_end():
+    arena = compiled_arena("x: number = 2\nprint(x * 21)\n")
+    result = execute_source("x: number = 2\nprint(x * 21)\n", arena=arena)
+    assert result.ok and result.output == "42\n"
+    assert "lexer" not in result.timings and "parser" not in result.timings
+
+def test_pool_run_with_arena_executes_the_cached_ast():
+    code = "for (i in range(3)) {\n  print(i)\n}\n"
+    with SandboxPool(size=1) as pool:
+        result = pool.run(code, arena=compiled_arena(code))
+        assert result.ok and result.output == "0\n1\n2\n"
+        result = pool.run(code, arena=b"corrompida")
+        assert result.ok and result.output == "0\n1\n2\n"
@@ -0,0 +1,38 @@
+from minipar.pipeline_3000 import Pipeline
+
+def check(source):
+    return Pipeline().run(source, stop_after="semantic")
+
+def test_for_annotation_matching_elements_is_accepted():
+    result = check('nomes: list = ["a", "b"]\nfor (x: string in nomes) {\n  print(x)\n}\n')
+    assert result.ok, result.error
+
+def test_for_annotation_conflicting_with_elements_is_rejected():
+    result = check("lista_de_numeros: list = [1, 2, 3]\nfor (x: string in lista_de_numeros) {\n  print(x)\n}\n")
+    assert not result.ok
+    assert result.phase == "semantic"
+    assert "declarado string, mas os elementos são number" in result.error
+
+def test_for_annotation_over_dict_keys_is_checked():
+    result = check('d: dict = {"a": 1}\nfor (k: number in d) {\n  print(k)\n}\n')
+    assert not result.ok
+    assert "declarado number, mas os elementos são string" in result.error
+
+def test_element_type_follows_reassignment():
+    result = check('l: list = [1, 2]\nl = ["a", "b"]\nx: number = l[0]\nprint(x)\n')
+    assert not result.ok
+    assert "esperado number, recebido string" in result.error
+
+def test_index_of_list_with_unknown_elements_is_not_assumed_number():
+    result = check("func primeiro(l: list) -> string {\n  return l[0]\n}\nprint(primeiro([\"a\"]))\n")
+    assert result.ok, result.error
+
+def test_fractional_range_literal_is_rejected():
+    result = check("for (i in range(2.5)) {\n  print(i)\n}\n")
+    assert result.phase == "semantic"
+    assert "range() deve ser inteiro" in result.error
+
+def test_fractional_range_value_is_a_runtime_error():
+    result = Pipeline(capture_output=True).run("n: number = 2.5\nfor (i in range(n)) {\n  print(i)\n}\n")
+    assert result.phase == "runtime"
+    assert result.error == "Argumento de range() deve ser inteiro, recebido 2.5. (linha 2)"